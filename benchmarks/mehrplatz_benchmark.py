@@ -0,0 +1,130 @@
+"""
+Mehrplatz-Benchmark: mehrere Terminals (Prozesse) buchen gleichzeitig
+Entnahmen und Rückgaben auf dieselbe ruestwerkzeuge.csv.
+
+Jedes Terminal hat einen eigenen DataManager (eigener Terminal-Name) auf
+einer gemeinsamen Kopie des Datenordners. Bestandsbuchungen landen in den
+PN-Zählern des jeweiligen Terminals und brauchen keine gemeinsame Sperre.
+Am Ende wird geprüft, dass keine Buchung verloren ging.
+
+    python benchmarks/mehrplatz_benchmark.py --terminals 2 4 8 --seconds 5
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.daten_manager import DataManager  # noqa: E402
+
+
+def _data_manager(data_dir, terminal="bench"):
+    return DataManager(os.path.join(data_dir, "werkzeuge.csv"), os.path.join(data_dir, "users.csv"), terminal)
+
+
+def terminal(data_dir, tool_ids, seconds, seed, start, results):
+    """Ein Terminal: abwechselnd 1 Stück entnehmen und zurückgeben."""
+    dm = _data_manager(data_dir, f"bench-{seed}")
+    dm.load_ruestwerkzeuge()
+    rng = random.Random(seed)
+    net = {tool_id: 0 for tool_id in tool_ids}
+    latencies = []
+    rejected = 0
+
+    start.wait()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        tool_id = rng.choice(tool_ids)
+        delta = -1 if rng.random() < 0.5 else 1
+        t0 = time.perf_counter()
+        try:
+            dm.change_stock(tool_id, delta)
+            net[tool_id] += delta
+        except ValueError:
+            # Bestand reicht nicht - wie am Terminal abgelehnt
+            rejected += 1
+        latencies.append(time.perf_counter() - t0)
+
+    results.put((net, latencies, rejected))
+
+
+def run(data_dir, terminals, seconds, hot_tools):
+    work_dir = tempfile.mkdtemp(prefix="toolbuddy_bench_")
+    try:
+        shared = os.path.join(work_dir, "data")
+        shutil.copytree(data_dir, shared)
+
+        dm = _data_manager(shared)
+        tools = dm.load_ruestwerkzeuge()[:hot_tools]
+        # Genug Bestand, damit Entnahmen selten am Bestand scheitern
+        dm.change_stocks({t.id: 100 for t in tools})
+        before = {t.id: t.bestand for t in tools}
+        tool_ids = list(before)
+
+        ctx = multiprocessing.get_context("spawn")
+        start = ctx.Event()
+        results = ctx.Queue()
+        procs = [ctx.Process(target=terminal, args=(shared, tool_ids, seconds, n, start, results))
+                 for n in range(terminals)]
+        for p in procs:
+            p.start()
+        time.sleep(0.5)  # Prozesse laden ihre Daten
+        start.set()
+
+        collected = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+        net = {tool_id: 0 for tool_id in tool_ids}
+        latencies = []
+        rejected = 0
+        for proc_net, proc_latencies, proc_rejected in collected:
+            for tool_id, delta in proc_net.items():
+                net[tool_id] += delta
+            latencies.extend(proc_latencies)
+            rejected += proc_rejected
+
+        after = {t.id: t.bestand for t in _data_manager(shared).load_ruestwerkzeuge() if t.id in before}
+        consistent = all(after[tool_id] == before[tool_id] + net[tool_id] for tool_id in tool_ids)
+
+        latencies.sort()
+        ops = len(latencies)
+        return {
+            'terminals': terminals,
+            'ops': ops,
+            'ops_per_s': ops / seconds,
+            'rejected': rejected,
+            'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+            'p95_ms': latencies[int(ops * 0.95) - 1] * 1000 if ops else 0.0,
+            'consistent': consistent,
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--terminals", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--hot-tools", type=int, default=5,
+                        help="Anzahl Rüstwerkzeuge, auf die alle Terminals buchen")
+    parser.add_argument("--data", default=os.path.join(ROOT, "data"))
+    args = parser.parse_args()
+
+    print(f"{'Terminals':>9} {'Buchungen':>10} {'/s':>8} {'abgelehnt':>10} {'p50 ms':>8} {'p95 ms':>8}  konsistent")
+    for terminals in args.terminals:
+        r = run(args.data, terminals, args.seconds, args.hot_tools)
+        print(f"{r['terminals']:>9} {r['ops']:>10} {r['ops_per_s']:>8.0f} {r['rejected']:>10} "
+              f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f}  {'ja' if r['consistent'] else 'NEIN'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Absturzsichere Schreibzugriffe auf die Datendateien.
+
+Eine Datei wird nie direkt überschrieben: der neue Inhalt landet in
+`<datei>.new`, wird mit fsync auf die Platte gebracht und dann per
+os.replace() atomar eingetauscht. Ein Absturz (oder eine abreißende
+Netzwerkfreigabe) hinterlässt so entweder die alte oder die neue Datei,
+nie eine halbe.
+
+Gehören mehrere Dateien zusammen (werkzeuge.csv + WKZKästen.csv), schreibt
+commit_files() zuerst alle `.new`-Dateien und dann eine Commit-Markierung
+mit der Dateiliste. Erst danach werden die Dateien eingetauscht und die
+Markierung gelöscht. recover() entscheidet beim Start anhand der
+Markierung: vorhanden -> Commit vorwärts zu Ende führen, fehlt -> übrig
+gebliebene `.new`-Dateien verwerfen.
+"""
+
+import contextlib
+import json
+import logging
+import os
+from typing import Callable, Dict, Iterable, List, TextIO
+
+logger = logging.getLogger(__name__)
+
+NEW_SUFFIX = ".new"
+
+
+def _fsync_dir(path: str):
+    """Macht Umbenennungen im Verzeichnis dauerhaft (unter Windows nicht möglich)."""
+    if os.name != 'posix':
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_new(path: str, write: Callable[[TextIO], None], encoding: str, newline: str) -> str:
+    """Schreibt `<path>.new` vollständig auf die Platte und liefert dessen Pfad."""
+    new_path = path + NEW_SUFFIX
+    try:
+        with open(new_path, mode='w', encoding=encoding, newline=newline) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(new_path)
+        raise
+    return new_path
+
+
+def atomic_write(path: str, write: Callable[[TextIO], None],
+                 encoding: str = 'utf-8', newline: str = ''):
+    """
+    Ersetzt `path` atomar durch den Inhalt, den `write(f)` schreibt.
+    Schlägt `write` fehl, bleibt die alte Datei unverändert.
+    """
+    new_path = _write_new(path, write, encoding, newline)
+    os.replace(new_path, path)
+    _fsync_dir(path)
+
+
+def commit_files(marker_path: str, files: Dict[str, Callable[[TextIO], None]],
+                 encoding: str = 'utf-8', newline: str = ''):
+    """
+    Ersetzt mehrere Dateien als Einheit. `files` bildet Pfad -> write(f) ab.
+    Nach einem Absturz stellt recover() den alten oder den neuen Stand
+    aller Dateien her.
+    """
+    written: List[str] = []
+    try:
+        for path, write in files.items():
+            _write_new(path, write, encoding, newline)
+            written.append(path)
+    except BaseException:
+        # Noch keine Markierung: der alte Stand ist gültig
+        for path in written:
+            with contextlib.suppress(OSError):
+                os.remove(path + NEW_SUFFIX)
+        raise
+
+    # Commit-Punkt: ab hier gilt der neue Stand
+    atomic_write(marker_path, lambda f: json.dump([os.path.basename(p) for p in files], f))
+
+    _roll_forward(marker_path, list(files))
+
+
+def _roll_forward(marker_path: str, paths: Iterable[str]):
+    for path in paths:
+        new_path = path + NEW_SUFFIX
+        if os.path.exists(new_path):
+            os.replace(new_path, path)
+    _fsync_dir(marker_path)
+    os.remove(marker_path)
+    _fsync_dir(marker_path)
+
+
+def recover(marker_path: str, paths: Iterable[str]) -> str:
+    """
+    Räumt einen unterbrochenen Commit auf. Liefert 'forward' (Commit zu Ende
+    geführt), 'rollback' (halbe `.new`-Dateien verworfen) oder '' (nichts zu tun).
+    """
+    directory = os.path.dirname(os.path.abspath(marker_path))
+    if os.path.exists(marker_path):
+        try:
+            with open(marker_path, 'r', encoding='utf-8') as f:
+                names = json.load(f)
+            committed = [os.path.join(directory, name) for name in names]
+        except (OSError, ValueError) as e:
+            # Die Markierung selbst wird atomar geschrieben; unlesbar heißt beschädigt
+            logger.error(f"Commit marker {marker_path} unreadable, rolling back: {e}")
+            os.remove(marker_path)
+        else:
+            _roll_forward(marker_path, committed)
+            logger.warning(f"Completed interrupted save of {', '.join(names)}")
+            return 'forward'
+
+    stale = [p + NEW_SUFFIX for p in paths if os.path.exists(p + NEW_SUFFIX)]
+    for new_path in stale:
+        os.remove(new_path)
+    if stale:
+        logger.warning(f"Discarded unfinished save: {', '.join(os.path.basename(p) for p in stale)}")
+        return 'rollback'
+    return ''
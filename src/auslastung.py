@@ -0,0 +1,296 @@
+"""
+Auslastung von Maschinen und Werkzeugen aus dem Belegungsverlauf.
+
+UtilisationStats liest die Verlaufsdateien (`belegungen/*.csv`) genau
+einmal, Zeile für Zeile, und addiert je Tag und Maschine bzw. Werkzeug die
+Zeit in der Maschine und die Anzahl der Ladevorgänge. Aufenthalte über
+Mitternacht werden auf die Tage verteilt. Die Tageswerte, die noch offenen
+Aufenthalte und die Leseposition jeder Datei stehen in
+`belegungen/<terminal>.auslastung.json`; ein Bericht summiert nur die
+Tageswerte des Zeitraums und liest nie die ganze Historie neu.
+
+Zeilen anderer Terminals können verspätet oder mit abweichender Uhr
+ankommen. Deshalb bleiben die Zeilen der letzten REORDER_DAYS Tage samt
+den offenen Aufenthalten davor erhalten: Ist eine neue Zeile älter als die
+zuletzt eingerechnete, werden nur die Tage ab dort neu berechnet.
+"""
+
+import bisect
+import dataclasses
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .atomares_schreiben import atomic_write
+from .belegungen import ASSIGNMENT_DIR, AssignmentRecord, parse_records
+
+logger = logging.getLogger(__name__)
+
+ToolKey = Tuple[str, str]  # (ID, Name) - IDs sind in werkzeuge.csv nicht eindeutig
+
+
+@dataclass
+class Usage:
+    seconds: float = 0.0  # Zeit in Maschinen
+    loads: int = 0  # Ladevorgänge
+    last_load: str = ''
+
+    @property
+    def hours(self) -> float:
+        return self.seconds / 3600
+
+    def add(self, seconds: float = 0.0, loads: int = 0, last_load: str = ''):
+        self.seconds += seconds
+        self.loads += loads
+        self.last_load = max(self.last_load, last_load)
+
+
+@dataclass
+class UtilisationReport:
+    start: date
+    end: date
+    machines: Dict[str, Usage]
+    tools: Dict[ToolKey, Usage]
+
+
+def _split_by_day(since: datetime, until: datetime) -> Iterable[Tuple[str, float]]:
+    """(Tag, Sekunden) eines Zeitraums, an Mitternacht geteilt."""
+    while since < until:
+        midnight = datetime.combine(since.date() + timedelta(days=1), datetime.min.time())
+        part_end = min(until, midnight)
+        yield since.date().isoformat(), (part_end - since).total_seconds()
+        since = part_end
+
+
+class UtilisationStats:
+    """Tageswerte je Maschine und Werkzeug, fortgeschrieben aus dem Belegungsverlauf."""
+
+    CHECKPOINT_INTERVAL = 60.0  # Sekunden zwischen zwei Sicherungen
+    REORDER_DAYS = 1  # so viele Tage vor der neuesten Zeile können noch neu berechnet werden
+
+    def __init__(self, data_dir: str, terminal: str):
+        self.directory = os.path.join(data_dir, ASSIGNMENT_DIR)
+        self.checkpoint_path = os.path.join(self.directory, f"{terminal}.auslastung.json")
+
+        self._machines: Dict[str, Dict[str, Usage]] = {}  # Tag -> Maschine -> Werte
+        self._tools: Dict[str, Dict[ToolKey, Usage]] = {}  # Tag -> Werkzeug -> Werte
+        self._days: List[str] = []  # Tage mit Werten, sortiert
+        self._open: Dict[Tuple[str, str, int], Tuple[str, str]] = {}  # (ID, Name, Kasten) -> (Maschine, seit)
+        self._last_load: Dict[ToolKey, str] = {}  # über die ganze Historie
+        self._offsets: Dict[str, int] = {}  # Dateiname -> eingerechnete Bytes
+        # Days before _final_day are final; _recent holds the lines since then in order
+        self._final_day = ''
+        self._final_open: Dict[Tuple[str, str, int], Tuple[str, str]] = {}  # _open zu Beginn von _final_day
+        self._recent: List[AssignmentRecord] = []
+        self._last_checkpoint = 0.0
+        self._loaded = False
+
+    # --- Berichte ---
+
+    def report(self, days: int = 30, now: Optional[datetime] = None) -> UtilisationReport:
+        """Summe der letzten `days` Tage (inkl. heute), noch offene Aufenthalte bis `now`."""
+        self.refresh()
+        now = now or datetime.now()
+        start = now.date() - timedelta(days=days - 1)
+        first_day = start.isoformat()
+
+        machines: Dict[str, Usage] = {}
+        tools: Dict[ToolKey, Usage] = {}
+        for day in self._days[bisect.bisect_left(self._days, first_day):]:
+            for machine, u in self._machines[day].items():
+                machines.setdefault(machine, Usage()).add(u.seconds, u.loads, u.last_load)
+            for key, u in self._tools[day].items():
+                tools.setdefault(key, Usage()).add(u.seconds, u.loads, u.last_load)
+
+        # Stays that are still open count up to now
+        period_start = datetime.combine(start, datetime.min.time())
+        for (tool_id, name, _), (machine, since) in self._open.items():
+            seconds = (now - max(datetime.fromisoformat(since), period_start)).total_seconds()
+            if seconds > 0:
+                machines.setdefault(machine, Usage()).add(seconds)
+                tools.setdefault((tool_id, name), Usage()).add(seconds)
+        return UtilisationReport(start, now.date(), machines, tools)
+
+    def never_used(self, catalog: Iterable[ToolKey], report: UtilisationReport) -> List[ToolKey]:
+        """Werkzeuge aus `catalog`, die im Zeitraum des Berichts in keiner Maschine waren."""
+        return [key for key in catalog
+                if key not in report.tools or not (report.tools[key].loads or report.tools[key].seconds)]
+
+    def last_load(self, key: ToolKey) -> str:
+        self.refresh()
+        return self._last_load.get(key, '')
+
+    # --- Einlesen ---
+
+    def refresh(self) -> bool:
+        """Rechnet neu angehängte Zeilen aller Terminals ein. True, wenn es welche gab."""
+        self._ensure_loaded()
+        records = []
+        for name in self._log_files():
+            path = os.path.join(self.directory, name)
+            offset = self._offsets.get(name, 0)
+            try:
+                size = os.path.getsize(path)
+            except FileNotFoundError:
+                continue
+            if size < offset:
+                logger.warning(f"Assignment log {name} shrank, rebuilding utilisation")
+                self._reset()
+                return self.refresh()
+            if size == offset:
+                continue
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                data = f.read(size - offset)
+            # Only complete lines; another terminal may be writing right now
+            end = data.rfind(b'\n') + 1
+            if not end:
+                continue
+            records.extend(parse_records(data[:end]))
+            self._offsets[name] = offset + end
+
+        if not records:
+            return False
+        records.sort(key=lambda r: r.zeitpunkt)
+        if records[0].zeitpunkt < self._final_day:
+            logger.warning(f"Assignment line from {records[0].zeitpunkt} arrived too late, rebuilding utilisation")
+            self._reset()
+            return self.refresh()
+        if self._recent and records[0].zeitpunkt < self._recent[-1].zeitpunkt:
+            # Late lines from another terminal: recalculate the days since _final_day in order
+            records = sorted(self._rewind() + records, key=lambda r: r.zeitpunkt)
+        for r in records:
+            self._apply(r)
+            self._recent.append(r)
+        self._settle()
+        self._maybe_checkpoint()
+        return True
+
+    @staticmethod
+    def _step(open_stays, r: AssignmentRecord) -> Optional[Tuple[str, str]]:
+        """Schreibt `open_stays` um `r` fort; gibt den beendeten Aufenthalt (Maschine, seit) zurück."""
+        key = (r.tool_id, r.name, r.box)
+        closed = None
+        if r.old_machine:
+            opened = open_stays.get(key)
+            # Without the matching load (before recording started) the duration is unknown
+            if opened and opened[0] == r.old_machine:
+                closed = open_stays.pop(key)
+        if r.new_machine:
+            open_stays[key] = (r.new_machine, r.zeitpunkt)
+        return closed
+
+    def _apply(self, r: AssignmentRecord):
+        tool = (r.tool_id, r.name)
+        closed = self._step(self._open, r)
+        if closed:
+            for day, seconds in _split_by_day(datetime.fromisoformat(closed[1]), datetime.fromisoformat(r.zeitpunkt)):
+                self._add(day, closed[0], tool, seconds)
+        if r.new_machine:
+            self._add(r.zeitpunkt[:10], r.new_machine, tool, 0, 1, r.zeitpunkt)
+            self._last_load[tool] = max(self._last_load.get(tool, ''), r.zeitpunkt)
+
+    def _add(self, day: str, machine: str, tool: ToolKey, seconds: float, loads: int = 0, last_load: str = ''):
+        if day not in self._machines:
+            bisect.insort(self._days, day)
+        self._machines.setdefault(day, {}).setdefault(machine, Usage()).add(seconds, loads, last_load)
+        self._tools.setdefault(day, {}).setdefault(tool, Usage()).add(seconds, loads, last_load)
+
+    def _rewind(self) -> List[AssignmentRecord]:
+        """Nimmt die Zeilen seit _final_day zurück und gibt sie zurück."""
+        # Stays open at _final_day that ended since then also added time to earlier days
+        open_stays = dict(self._final_open)
+        for r in self._recent:
+            closed = self._step(open_stays, r)
+            if closed:
+                for day, seconds in _split_by_day(datetime.fromisoformat(closed[1]), datetime.fromisoformat(r.zeitpunkt)):
+                    if day < self._final_day:
+                        self._add(day, closed[0], (r.tool_id, r.name), -seconds)
+        cut = bisect.bisect_left(self._days, self._final_day)
+        for day in self._days[cut:]:
+            del self._machines[day], self._tools[day]
+        del self._days[cut:]
+        self._open = dict(self._final_open)
+        recent, self._recent = self._recent, []
+        return recent
+
+    def _settle(self):
+        """Schließt die Tage ab, die älter als REORDER_DAYS vor der neuesten Zeile sind."""
+        newest = date.fromisoformat(self._recent[-1].zeitpunkt[:10])
+        final_day = (newest - timedelta(days=self.REORDER_DAYS)).isoformat()
+        if final_day <= self._final_day:
+            return
+        keep = bisect.bisect_left([r.zeitpunkt for r in self._recent], final_day)
+        for r in self._recent[:keep]:
+            self._step(self._final_open, r)
+        del self._recent[:keep]
+        self._final_day = final_day
+
+    def _log_files(self) -> List[str]:
+        try:
+            return sorted(n for n in os.listdir(self.directory) if n.endswith('.csv'))
+        except FileNotFoundError:
+            return []
+
+    def _reset(self):
+        self._machines, self._tools, self._open, self._last_load, self._offsets = {}, {}, {}, {}, {}
+        self._days, self._final_day, self._final_open, self._recent = [], '', {}, []
+
+    # --- Zwischenstand ---
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._offsets = {name: int(o) for name, o in data.get('offsets', {}).items()}
+            self._machines = {day: {m: Usage(*u) for m, u in per.items()}
+                              for day, per in data.get('machines', {}).items()}
+            self._tools = {day: {(tool_id, name): Usage(s, n, last) for tool_id, name, s, n, last in rows}
+                           for day, rows in data.get('tools', {}).items()}
+            self._open = {(tool_id, name, box): (machine, since)
+                          for tool_id, name, box, machine, since in data.get('open', [])}
+            self._last_load = {(tool_id, name): last for tool_id, name, last in data.get('last_load', [])}
+            self._final_day = data['final_day']
+            self._final_open = {(tool_id, name, box): (machine, since)
+                                for tool_id, name, box, machine, since in data['final_open']}
+            self._recent = [AssignmentRecord(*row) for row in data['recent']]
+            self._days = sorted(self._machines)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.error(f"Error loading utilisation statistics, rebuilding: {e}")
+            self._reset()
+
+    def _maybe_checkpoint(self):
+        if time.monotonic() - self._last_checkpoint >= self.CHECKPOINT_INTERVAL:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Sichert Tageswerte, offene Aufenthalte und Lesepositionen."""
+        data = {
+            'offsets': self._offsets,
+            'machines': {day: {m: [u.seconds, u.loads, u.last_load] for m, u in per.items()}
+                         for day, per in self._machines.items()},
+            'tools': {day: [[tool_id, name, u.seconds, u.loads, u.last_load] for (tool_id, name), u in per.items()]
+                      for day, per in self._tools.items()},
+            'open': [[tool_id, name, box, machine, since]
+                     for (tool_id, name, box), (machine, since) in self._open.items()],
+            'last_load': [[tool_id, name, last] for (tool_id, name), last in self._last_load.items()],
+            'final_day': self._final_day,
+            'final_open': [[tool_id, name, box, machine, since]
+                           for (tool_id, name, box), (machine, since) in self._final_open.items()],
+            'recent': [dataclasses.astuple(r) for r in self._recent],
+        }
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            atomic_write(self.checkpoint_path, lambda f: json.dump(data, f, separators=(',', ':')))
+            self._last_checkpoint = time.monotonic()
+        except OSError as e:
+            logger.error(f"Error saving utilisation statistics: {e}")
@@ -6,6 +6,9 @@ class AuthManager:
     def __init__(self, data_manager: DataManager):
         self.data_manager = data_manager
         self.current_user: Optional[User] = None
+        # Stock movements and machine assignments are logged with the logged-in user
+        data_manager.movements.user_provider = self.current_username
+        data_manager.assignments.user_provider = self.current_username
 
     def login(self, username, password) -> bool:
         users = self.data_manager.load_users()
@@ -51,6 +54,9 @@ class AuthManager:
                 return True
         return False
 
+    def current_username(self) -> str:
+        return self.current_user.username if self.current_user else ''
+
     def logout(self):
         self.current_user = None
 
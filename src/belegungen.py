@@ -0,0 +1,299 @@
+"""
+Verlauf der Maschinenbelegungen.
+
+Die Felder `Maschine_Box_i` eines Werkzeugs zeigen nur den aktuellen
+Stand. Jede gespeicherte Änderung daran (Laden, Entladen, Zurücksetzen,
+Rückgängig) wird zusätzlich als Zeile an `belegungen/<terminal>.csv`
+angehängt: Zeitpunkt, ID, Name, Kasten, von Maschine, nach Maschine,
+Benutzer, Terminal. Wie beim Bewegungsprotokoll schreibt jedes Terminal
+nur seine eigene Datei.
+
+Für Abfragen ("welche Werkzeuge waren am Dienstag in der Hermle400?",
+"wo war Werkzeug 42 diesen Monat?") hält AssignmentLog je Maschine und je
+Werkzeug eine Zeitleiste. Eine Zeitleiste speichert die Ereignisse
+zeitlich sortiert und alle SNAPSHOT_EVERY Ereignisse den vollständigen
+Stand; eine Abfrage sucht den Zeitpunkt binär, startet beim Stand davor
+und spielt höchstens SNAPSHOT_EVERY Ereignisse nach.
+"""
+
+import bisect
+import csv
+import io
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+ASSIGNMENT_DIR = "belegungen"
+ASSIGNMENT_FIELDS = ['Zeitpunkt', 'ID', 'Name', 'Kasten', 'Von', 'Nach', 'Benutzer', 'Terminal']
+
+When = Union[str, datetime]
+
+
+def _iso(when: When) -> str:
+    return when.isoformat(timespec='seconds') if isinstance(when, datetime) else when
+
+
+@dataclass
+class AssignmentRecord:
+    zeitpunkt: str  # ISO, lokale Zeit
+    tool_id: str
+    name: str
+    box: int
+    old_machine: str  # '' = im Werkzeugkasten
+    new_machine: str
+    user: str = ''
+    terminal: str = ''
+
+
+def parse_records(data: bytes) -> List[AssignmentRecord]:
+    """Zeilen einer Verlaufsdatei (vollständige Zeilen, Kopfzeile wird übersprungen)."""
+    records = []
+    for row in csv.reader(io.StringIO(data.decode('utf-8', errors='replace')), delimiter=';'):
+        if len(row) < 8 or row[0] == ASSIGNMENT_FIELDS[0]:
+            continue
+        try:
+            records.append(AssignmentRecord(row[0], row[1], row[2], int(row[3]), row[4], row[5],
+                                            row[6], row[7]))
+        except ValueError:
+            logger.error(f"Invalid assignment line: {row}")
+    return records
+
+
+@dataclass
+class Stay:
+    """Ein Werkzeug (aus Kasten `box`) war von `start` bis `end` in `machine`."""
+    tool_id: str
+    name: str
+    box: int
+    machine: str
+    start: Optional[str]  # None = schon vor Beginn der Aufzeichnung
+    end: Optional[str]  # None = noch dort
+
+
+class Timeline:
+    """
+    Offene Einträge über die Zeit. Ereignisse öffnen oder schließen einen
+    Eintrag; `at` und `between` kosten O(log n + SNAPSHOT_EVERY + Ausgabe).
+    Ereignisse müssen in zeitlicher Reihenfolge angehängt werden.
+    """
+
+    SNAPSHOT_EVERY = 64
+
+    def __init__(self):
+        self.times: List[str] = []
+        self.events: List[Tuple[Hashable, bool]] = []  # (Eintrag, geöffnet)
+        # Stand vor Ereignis k * SNAPSHOT_EVERY: Eintrag -> seit
+        self._snapshots: List[Dict[Hashable, Optional[str]]] = [{}]
+        self._open: Dict[Hashable, Optional[str]] = {}
+
+    def append(self, when: str, item: Hashable, opened: bool):
+        n = len(self.times)
+        if n and n % self.SNAPSHOT_EVERY == 0:
+            self._snapshots.append(dict(self._open))
+        self.times.append(when)
+        self.events.append((item, opened))
+        self._apply(self._open, when, item, opened)
+
+    @staticmethod
+    def _apply(state, when, item, opened, closed=None):
+        if opened:
+            state[item] = when
+            return
+        # Closing an item opened before recording started: its start is unknown
+        since = state.pop(item, None)
+        if closed is not None:
+            closed.append((item, since, when))
+
+    def _state_at(self, index: int) -> Dict[Hashable, Optional[str]]:
+        """Stand nach den ersten `index` Ereignissen."""
+        if index == len(self.times):
+            return dict(self._open)
+        block = index // self.SNAPSHOT_EVERY
+        state = dict(self._snapshots[block])
+        for j in range(block * self.SNAPSHOT_EVERY, index):
+            self._apply(state, self.times[j], *self.events[j])
+        return state
+
+    def at(self, when: str) -> Dict[Hashable, Optional[str]]:
+        """Offene Einträge zum Zeitpunkt `when` mit ihrem Beginn."""
+        return self._state_at(bisect.bisect_right(self.times, when))
+
+    def between(self, start: str, end: str) -> List[Tuple[Hashable, Optional[str], Optional[str]]]:
+        """(Eintrag, von, bis) aller Einträge, die in [start, end] offen waren; bis=None = danach noch offen."""
+        lo = bisect.bisect_right(self.times, start)
+        hi = bisect.bisect_right(self.times, end)
+        state = self._state_at(lo)
+        closed = []
+        for j in range(lo, hi):
+            self._apply(state, self.times[j], *self.events[j], closed=closed)
+        return closed + [(item, since, None) for item, since in state.items()]
+
+
+class AssignmentLog:
+    """Append-only Belegungsverlauf aller Terminals mit Zeitleisten je Maschine und je Werkzeug."""
+
+    def __init__(self, data_dir: str, terminal: str,
+                 user_provider: Optional[Callable[[], str]] = None):
+        self.directory = os.path.join(data_dir, ASSIGNMENT_DIR)
+        self.terminal = terminal
+        self.own_path = os.path.join(self.directory, f"{terminal}.csv")
+        self.user_provider = user_provider
+
+        self._records: List[AssignmentRecord] = []  # zeitlich sortiert
+        self._offsets: Dict[str, int] = {}  # Dateiname -> gelesene Bytes
+        # Tool IDs are not unique in werkzeuge.csv, so entries carry the name too
+        self._by_machine: Dict[str, Timeline] = {}  # Einträge (ID, Name, Kasten)
+        self._by_tool: Dict[str, Timeline] = {}  # ID -> Einträge (Name, Kasten, Maschine)
+
+    def _current_user(self) -> str:
+        try:
+            return (self.user_provider() if self.user_provider else '') or ''
+        except Exception as e:
+            logger.error(f"Error getting current user: {e}")
+            return ''
+
+    # --- Schreiben ---
+
+    def record(self, changes: List[Tuple[str, str, int, str, str]]) -> List[AssignmentRecord]:
+        """Hängt Belegungsänderungen (ID, Name, Kasten, von, nach) dieses Terminals an."""
+        zeitpunkt = datetime.now().isoformat(timespec='seconds')
+        user = self._current_user()
+        records = [AssignmentRecord(zeitpunkt, tool_id, name, box, old or '', new or '', user, self.terminal)
+                   for tool_id, name, box, old, new in changes if (old or '') != (new or '')]
+        if not records:
+            return []
+
+        os.makedirs(self.directory, exist_ok=True)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=';')
+        if not os.path.exists(self.own_path):
+            writer.writerow(ASSIGNMENT_FIELDS)
+        for r in records:
+            writer.writerow([r.zeitpunkt, r.tool_id, r.name, r.box, r.old_machine, r.new_machine,
+                             r.user, r.terminal])
+        with open(self.own_path, 'ab') as f:
+            f.write(buffer.getvalue().encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+        # Indexes pick the lines up with the next query (catch-up by offset)
+        return records
+
+    # --- Abfragen ---
+
+    def in_machine(self, machine: str, when: When) -> List[Stay]:
+        """Werkzeuge, die zum Zeitpunkt `when` in `machine` waren (ohne `end`)."""
+        self.refresh()
+        timeline = self._by_machine.get(machine)
+        if timeline is None:
+            return []
+        return sorted((Stay(tool_id, name, box, machine, since, None)
+                       for (tool_id, name, box), since in timeline.at(_iso(when)).items()),
+                      key=lambda s: (s.tool_id, s.name, s.box))
+
+    def machine_history(self, machine: str, start: When, end: When) -> List[Stay]:
+        """Alle Aufenthalte in `machine`, die sich mit [start, end] überschneiden."""
+        self.refresh()
+        timeline = self._by_machine.get(machine)
+        if timeline is None:
+            return []
+        return self._sorted(Stay(tool_id, name, box, machine, since, until)
+                            for (tool_id, name, box), since, until in timeline.between(_iso(start), _iso(end)))
+
+    def where(self, tool_id: str, when: When) -> List[Stay]:
+        """In welchen Maschinen war Werkzeug `tool_id` zum Zeitpunkt `when`? (ohne `end`)"""
+        self.refresh()
+        timeline = self._by_tool.get(tool_id)
+        if timeline is None:
+            return []
+        return sorted((Stay(tool_id, name, box, machine, since, None)
+                       for (name, box, machine), since in timeline.at(_iso(when)).items()),
+                      key=lambda s: (s.name, s.box))
+
+    def tool_history(self, tool_id: str, start: When, end: When) -> List[Stay]:
+        """Alle Aufenthalte von `tool_id` in Maschinen, die sich mit [start, end] überschneiden."""
+        self.refresh()
+        timeline = self._by_tool.get(tool_id)
+        if timeline is None:
+            return []
+        return self._sorted(Stay(tool_id, name, box, machine, since, until)
+                            for (name, box, machine), since, until in timeline.between(_iso(start), _iso(end)))
+
+    @staticmethod
+    def _sorted(stays) -> List[Stay]:
+        return sorted(stays, key=lambda s: (s.start or '', s.tool_id, s.name, s.box))
+
+    def machines(self) -> List[str]:
+        self.refresh()
+        return sorted(self._by_machine)
+
+    def refresh(self) -> bool:
+        """Liest neu angehängte Zeilen aller Terminals ein. True, wenn es welche gab."""
+        new = self._read_new()
+        if new is None:
+            # A log was replaced - start over from the files
+            logger.warning("Assignment log shrank, rebuilding history")
+            self._records, self._offsets = [], {}
+            new = self._read_new() or []
+        if not new:
+            return False
+        new.sort(key=lambda r: r.zeitpunkt)
+        if not self._records or new[0].zeitpunkt < self._records[-1].zeitpunkt:
+            # Late lines from another terminal: timelines must be rebuilt in order
+            self._records = sorted(self._records + new, key=lambda r: r.zeitpunkt)
+            self._by_machine, self._by_tool = {}, {}
+            for r in self._records:
+                self._index(r)
+        else:
+            for r in new:
+                self._records.append(r)
+                self._index(r)
+        return True
+
+    # --- Intern ---
+
+    def _index(self, r: AssignmentRecord):
+        tool = self._by_tool.setdefault(r.tool_id, Timeline())
+        if r.old_machine:
+            self._by_machine.setdefault(r.old_machine, Timeline()).append(
+                r.zeitpunkt, (r.tool_id, r.name, r.box), False)
+            tool.append(r.zeitpunkt, (r.name, r.box, r.old_machine), False)
+        if r.new_machine:
+            self._by_machine.setdefault(r.new_machine, Timeline()).append(
+                r.zeitpunkt, (r.tool_id, r.name, r.box), True)
+            tool.append(r.zeitpunkt, (r.name, r.box, r.new_machine), True)
+
+    def _log_files(self) -> List[str]:
+        try:
+            return sorted(n for n in os.listdir(self.directory) if n.endswith('.csv'))
+        except FileNotFoundError:
+            return []
+
+    def _read_new(self) -> Optional[List[AssignmentRecord]]:
+        """Neue vollständige Zeilen aller Dateien; None, wenn eine Datei kürzer wurde."""
+        records = []
+        for name in self._log_files():
+            path = os.path.join(self.directory, name)
+            offset = self._offsets.get(name, 0)
+            try:
+                size = os.path.getsize(path)
+            except FileNotFoundError:
+                continue
+            if size < offset:
+                return None
+            if size == offset:
+                continue
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                data = f.read(size - offset)
+            # Only complete lines; another terminal may be writing right now
+            end = data.rfind(b'\n') + 1
+            if not end:
+                continue
+            records.extend(parse_records(data[:end]))
+            self._offsets[name] = offset + end
+        return records
+
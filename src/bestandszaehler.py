@@ -0,0 +1,121 @@
+"""
+Konfliktfreie Bestandszähler (PN-Counter) für mehrere Terminals.
+
+Jedes Terminal schreibt nur seine eigene Datei `bestand/<terminal>.json`
+mit zwei monoton wachsenden Zählern je Rüstwerkzeug: P (zurückgegeben /
+zugebucht) und N (entnommen). Der Bestand ergibt sich aus dem Grundbestand
+in ruestwerkzeuge.csv plus der Summe P - N über alle Terminals. Da kein
+Terminal die Datei eines anderen ändert, können gleichzeitige Entnahmen
+und Rückgaben weder kollidieren noch verloren gehen, und es braucht keine
+gemeinsame Sperre.
+
+Die Prüfung "genug Bestand" kann nur den zuletzt gelesenen Stand der
+anderen Terminals kennen; entnehmen zwei Terminals gleichzeitig das
+letzte Stück, zeigt der Bestand danach -1.
+"""
+
+import json
+import logging
+import os
+import re
+import socket
+from typing import Dict, List, Optional, Tuple
+
+from .atomares_schreiben import atomic_write
+from .dateisperre import FileLock
+
+logger = logging.getLogger(__name__)
+
+COUNTER_DIR = "bestand"
+
+
+def default_terminal() -> str:
+    """Terminal-Name aus TOOLBUDDY_TERMINAL, sonst der Rechnername."""
+    return os.environ.get("TOOLBUDDY_TERMINAL") or socket.gethostname() or "terminal"
+
+
+class StockCounters:
+    """PN-Counter je Rüstwerkzeug über alle Terminal-Dateien eines Datenordners."""
+
+    def __init__(self, data_dir: str, terminal: Optional[str] = None):
+        self.directory = os.path.join(data_dir, COUNTER_DIR)
+        self.terminal = re.sub(r'[^\w.-]', '_', terminal or default_terminal())
+        self.own_path = os.path.join(self.directory, f"{self.terminal}.json")
+        # Gleicher Terminal-Name in zwei Prozessen (z.B. doppelt gestartet)
+        self._own_lock = FileLock(self.own_path)
+
+        self._counters: Dict[str, Dict[str, List[int]]] = {}  # terminal -> ID -> [P, N]
+        self._stamps: Dict[str, Tuple[int, int]] = {}  # terminal -> (mtime_ns, size)
+        self._totals: Dict[str, int] = {}  # ID -> sum(P - N)
+
+    def total(self, tool_id: str) -> int:
+        return self._totals.get(tool_id, 0)
+
+    def _read(self, path: str) -> Dict[str, List[int]]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {tool_id: [int(p), int(n)] for tool_id, (p, n) in data.get('counters', {}).items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError) as e:
+            logger.error(f"Error reading stock counters {path}: {e}")
+            return {}
+
+    def _set(self, terminal: str, counters: Dict[str, List[int]]) -> Dict[str, int]:
+        """Übernimmt die Zähler eines Terminals; liefert die Änderung je ID."""
+        old = self._counters.get(terminal, {})
+        changed = {}
+        for tool_id in set(old) | set(counters):
+            op, on = old.get(tool_id, (0, 0))
+            np_, nn = counters.get(tool_id, (0, 0))
+            diff = (np_ - nn) - (op - on)
+            if diff:
+                changed[tool_id] = diff
+                self._totals[tool_id] = self._totals.get(tool_id, 0) + diff
+        self._counters[terminal] = counters
+        return changed
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        Liest Terminal-Dateien, die sich seit dem letzten Lesen geändert haben.
+        Liefert die Bestandsänderung je ID (Merge = Zähler übernehmen, da sie
+        nur wachsen).
+        """
+        changed: Dict[str, int] = {}
+        try:
+            names = [n for n in os.listdir(self.directory) if n.endswith('.json')]
+        except FileNotFoundError:
+            return changed
+
+        for name in names:
+            terminal = name[:-len('.json')]
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stamp = (st.st_mtime_ns, st.st_size)
+            if self._stamps.get(terminal) == stamp:
+                continue
+            self._stamps[terminal] = stamp
+            for tool_id, diff in self._set(terminal, self._read(path)).items():
+                changed[tool_id] = changed.get(tool_id, 0) + diff
+        return {tool_id: diff for tool_id, diff in changed.items() if diff}
+
+    def add(self, deltas: Dict[str, int]):
+        """Bucht {ID: delta} auf die Zähler dieses Terminals und speichert sie."""
+        deltas = {tool_id: delta for tool_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with self._own_lock:
+            counters = self._read(self.own_path)
+            for tool_id, delta in deltas.items():
+                pn = counters.setdefault(tool_id, [0, 0])
+                pn[0 if delta > 0 else 1] += abs(delta)
+            atomic_write(self.own_path, lambda f: json.dump(
+                {'terminal': self.terminal, 'counters': counters}, f, separators=(',', ':')))
+            st = os.stat(self.own_path)
+            self._stamps[self.terminal] = (st.st_mtime_ns, st.st_size)
+            self._set(self.terminal, counters)
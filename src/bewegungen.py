@@ -0,0 +1,261 @@
+"""
+Bewegungsprotokoll für Rüstwerkzeuge.
+
+Jede Bestandsbuchung (Entnahme, Rückgabe, Korrektur) wird als Zeile an
+`bewegungen/<terminal>.csv` angehängt: Zeitpunkt, ID, Menge, Benutzer,
+Terminal. Die Dateien werden nie umgeschrieben; jedes Terminal hängt nur an
+seine eigene an.
+
+Aus den Bewegungen werden Kennzahlen je Werkzeug (Verbrauch pro Tag,
+durchschnittlicher Abstand zwischen Entnahmen, ...) fortlaufend
+mitgerechnet. Welche Bytes jeder Datei schon eingerechnet sind, steht mit den
+Kennzahlen in `<terminal>.stats.json`; beim Start werden nur die danach
+angehängten Zeilen gelesen, nie die ganze Historie.
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from .atomares_schreiben import atomic_write
+
+logger = logging.getLogger(__name__)
+
+MOVEMENT_DIR = "bewegungen"
+MOVEMENT_FIELDS = ['Zeitpunkt', 'ID', 'Menge', 'Benutzer', 'Terminal']
+
+# Tageswerte älter als das werden beim Speichern der Kennzahlen verworfen
+DAILY_RETENTION_DAYS = 400
+
+
+@dataclass
+class Movement:
+    zeitpunkt: str  # ISO, lokale Zeit
+    tool_id: str
+    delta: int  # negativ = Entnahme
+    user: str
+    terminal: str
+
+
+@dataclass
+class ToolStats:
+    """Laufende Kennzahlen eines Rüstwerkzeugs."""
+    taken: int = 0  # Stück entnommen
+    returned: int = 0  # Stück zurückgegeben / zugebucht
+    takes: int = 0  # Anzahl Entnahmen
+    first_take: str = ''
+    last_take: str = ''
+    last_user: str = ''
+    daily: Dict[str, int] = field(default_factory=dict)  # 'JJJJ-MM-TT' -> Stück entnommen
+
+    def apply(self, m: Movement):
+        if m.delta >= 0:
+            self.returned += m.delta
+            return
+        qty = -m.delta
+        self.taken += qty
+        self.takes += 1
+        day = m.zeitpunkt[:10]
+        self.daily[day] = self.daily.get(day, 0) + qty
+        # ISO timestamps compare as strings; lines from other terminals may arrive late
+        if not self.first_take or m.zeitpunkt < self.first_take:
+            self.first_take = m.zeitpunkt
+        if m.zeitpunkt >= self.last_take:
+            self.last_take = m.zeitpunkt
+            self.last_user = m.user
+
+    def consumption(self, days: int = 30, today: Optional[date] = None) -> int:
+        """Stück entnommen in den letzten `days` Tagen (inkl. heute)."""
+        since = ((today or date.today()) - timedelta(days=days - 1)).isoformat()
+        return sum(qty for day, qty in self.daily.items() if day >= since)
+
+    def per_day(self, days: int = 30, today: Optional[date] = None) -> float:
+        return self.consumption(days, today) / days
+
+    @property
+    def avg_interval_hours(self) -> Optional[float]:
+        """Durchschnittlicher Abstand zwischen zwei Entnahmen in Stunden."""
+        if self.takes < 2:
+            return None
+        span = datetime.fromisoformat(self.last_take) - datetime.fromisoformat(self.first_take)
+        return span.total_seconds() / 3600 / (self.takes - 1)
+
+
+class MovementLog:
+    """Append-only Protokoll aller Terminals plus fortlaufende Kennzahlen."""
+
+    CHECKPOINT_INTERVAL = 60.0  # Sekunden zwischen zwei Sicherungen der Kennzahlen
+
+    def __init__(self, data_dir: str, terminal: str,
+                 user_provider: Optional[Callable[[], str]] = None):
+        self.directory = os.path.join(data_dir, MOVEMENT_DIR)
+        self.terminal = terminal
+        self.own_path = os.path.join(self.directory, f"{terminal}.csv")
+        self.checkpoint_path = os.path.join(self.directory, f"{terminal}.stats.json")
+        self.user_provider = user_provider
+
+        self._stats: Dict[str, ToolStats] = {}
+        self._offsets: Dict[str, int] = {}  # Dateiname -> eingerechnete Bytes
+        self._last_checkpoint = 0.0
+        self._loaded = False
+
+    def _current_user(self) -> str:
+        try:
+            return (self.user_provider() if self.user_provider else '') or ''
+        except Exception as e:
+            logger.error(f"Error getting current user: {e}")
+            return ''
+
+    # --- Schreiben ---
+
+    def record(self, deltas: Dict[str, int]) -> List[Movement]:
+        """Hängt die Buchungen {ID: delta} dieses Terminals an das Protokoll an."""
+        self._ensure_loaded()
+        zeitpunkt = datetime.now().isoformat(timespec='seconds')
+        user = self._current_user()
+        movements = [Movement(zeitpunkt, tool_id, delta, user, self.terminal)
+                     for tool_id, delta in deltas.items() if delta]
+        if not movements:
+            return []
+
+        # Catch up first so our offset covers exactly what is in the aggregates
+        self.refresh()
+
+        os.makedirs(self.directory, exist_ok=True)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=';')
+        new_file = not os.path.exists(self.own_path)
+        if new_file:
+            writer.writerow(MOVEMENT_FIELDS)
+        for m in movements:
+            writer.writerow([m.zeitpunkt, m.tool_id, m.delta, m.user, m.terminal])
+        data = buffer.getvalue().encode('utf-8')
+
+        with open(self.own_path, 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            end = f.tell()
+
+        for m in movements:
+            self._stats.setdefault(m.tool_id, ToolStats()).apply(m)
+        self._offsets[os.path.basename(self.own_path)] = end
+        self._maybe_checkpoint()
+        return movements
+
+    # --- Lesen ---
+
+    def stats(self, tool_id: str) -> ToolStats:
+        self._ensure_loaded()
+        return self._stats.get(tool_id) or ToolStats()
+
+    def all_stats(self) -> Dict[str, ToolStats]:
+        self._ensure_loaded()
+        return self._stats
+
+    def history(self, tool_id: Optional[str] = None) -> List[Movement]:
+        """Alle Bewegungen (optional eines Werkzeugs), chronologisch. Liest die ganze Historie."""
+        movements = []
+        for name in self._log_files():
+            with open(os.path.join(self.directory, name), 'rb') as f:
+                movements.extend(m for m in self._parse(f.read())
+                                 if tool_id is None or m.tool_id == tool_id)
+        return sorted(movements, key=lambda m: m.zeitpunkt)
+
+    def refresh(self) -> bool:
+        """Rechnet neu angehängte Zeilen aller Terminals ein. True, wenn es welche gab."""
+        self._ensure_loaded()
+        return self._catch_up()
+
+    # --- Intern ---
+
+    def _log_files(self) -> List[str]:
+        try:
+            return sorted(n for n in os.listdir(self.directory) if n.endswith('.csv'))
+        except FileNotFoundError:
+            return []
+
+    def _parse(self, data: bytes) -> List[Movement]:
+        movements = []
+        for row in csv.reader(io.StringIO(data.decode('utf-8', errors='replace')), delimiter=';'):
+            if len(row) < 5 or row[0] == MOVEMENT_FIELDS[0]:
+                continue
+            try:
+                movements.append(Movement(row[0], row[1], int(row[2]), row[3], row[4]))
+            except ValueError:
+                logger.error(f"Invalid movement line: {row}")
+        return movements
+
+    def _catch_up(self) -> bool:
+        changed = False
+        for name in self._log_files():
+            path = os.path.join(self.directory, name)
+            offset = self._offsets.get(name, 0)
+            try:
+                size = os.path.getsize(path)
+            except FileNotFoundError:
+                continue
+            if size == offset:
+                continue
+            if size < offset:
+                # Log was replaced - the aggregates no longer match it
+                logger.warning(f"Movement log {name} shrank, rebuilding statistics")
+                self._stats, self._offsets = {}, {}
+                return self._catch_up() or True
+
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                data = f.read(size - offset)
+            # Only complete lines; another terminal may be writing right now
+            end = data.rfind(b'\n') + 1
+            if not end:
+                continue
+            for m in self._parse(data[:end]):
+                self._stats.setdefault(m.tool_id, ToolStats()).apply(m)
+            self._offsets[name] = offset + end
+            changed = True
+
+        if changed:
+            self._maybe_checkpoint()
+        return changed
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._offsets = {name: int(o) for name, o in data.get('offsets', {}).items()}
+            self._stats = {tool_id: ToolStats(**s) for tool_id, s in data.get('tools', {}).items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            logger.error(f"Error loading movement statistics, rebuilding: {e}")
+            self._stats, self._offsets = {}, {}
+        self._catch_up()
+
+    def _maybe_checkpoint(self):
+        if time.monotonic() - self._last_checkpoint >= self.CHECKPOINT_INTERVAL:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Sichert Kennzahlen und Lesepositionen, damit der nächste Start nur den Rest liest."""
+        since = (date.today() - timedelta(days=DAILY_RETENTION_DAYS)).isoformat()
+        for s in self._stats.values():
+            for day in [d for d in s.daily if d < since]:
+                del s.daily[day]
+        data = {'offsets': self._offsets,
+                'tools': {tool_id: asdict(s) for tool_id, s in self._stats.items()}}
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            atomic_write(self.checkpoint_path, lambda f: json.dump(data, f, separators=(',', ':')))
+            self._last_checkpoint = time.monotonic()
+        except OSError as e:
+            logger.error(f"Error saving movement statistics: {e}")
@@ -0,0 +1,113 @@
+"""
+Prozessübergreifende Dateisperren für gemeinsam genutzte Datendateien.
+
+Mehrere Terminals können denselben Datenordner (z.B. auf einer Freigabe)
+verwenden. FileLock sperrt dazu `<datei>.lock` beratend (fcntl unter
+POSIX, msvcrt unter Windows). Innerhalb eines Prozesses ist die Sperre
+reentrant und schützt zusätzlich zwischen Threads.
+"""
+
+import logging
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+LOCK_SUFFIX = ".lock"
+
+
+class LockTimeout(TimeoutError):
+    """Als TimeoutError auch ein OSError: die Oberfläche meldet ihn wie Schreibfehler."""
+
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """
+    Exklusive Sperre auf `path + '.lock'`:
+
+        with FileLock(path):
+            ... lesen, ändern, schreiben ...
+
+    Wartet höchstens `timeout` Sekunden und wirft dann LockTimeout.
+    """
+
+    def __init__(self, path: str, timeout: float = 10.0, poll_interval: float = 0.005):
+        self.lock_path = path + LOCK_SUFFIX
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            raise LockTimeout(f"Datei {self.lock_path} ist gesperrt")
+        self._depth += 1
+        if self._depth > 1:
+            return
+
+        try:
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+        except OSError:
+            self._depth -= 1
+            self._thread_lock.release()
+            raise
+
+        # Kurz anfangen, dann bis 50 ms zurückhalten, damit wartende
+        # Terminals die Freigabe nicht mit Dauerabfragen belasten
+        delay = self.poll_interval
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                os.close(fd)
+                self._depth -= 1
+                self._thread_lock.release()
+                raise LockTimeout(f"Datei {self.lock_path} ist seit {self.timeout:g} s gesperrt")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+        self._fd = fd
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            fd, self._fd = self._fd, None
+            try:
+                _unlock(fd)
+            except OSError as e:
+                logger.error(f"Error unlocking {self.lock_path}: {e}")
+            finally:
+                os.close(fd)
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
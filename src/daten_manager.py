@@ -1,22 +1,500 @@
 import csv
 import os
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Any, Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from .modelle import Tool, User, Ruestwerkzeug
+from .atomares_schreiben import atomic_write, commit_files, recover
+from .bestandszaehler import StockCounters
+from .bewegungen import MovementLog
+from .belegungen import AssignmentLog
+from .auslastung import UtilisationStats
+from .mindestbestand import LowStockMonitor
+from .kennzahlen import DashboardCounters
+from .werkzeugsaetze import ToolSet, ToolSetDiff, ToolSetStore, diff_tool_set
+from .rueckgaengig import UndoStack, UndoEntry, RowChange, UndoConflict
+from .dateisperre import FileLock
+from .ereignisse import (EventBus, ChangeEvent, ToolAdded, ToolUpdated, ToolRemoved, AssignmentChanged,
+                         RuestToolAdded, RuestToolUpdated, RuestToolRemoved, StockChanged,
+                         DatasetReloaded, DATASET_TOOLS, DATASET_RUEST)
 import hashlib
 import logging
+import re
+import threading
+import functools
+import contextlib
+import dataclasses
 
 # Configure logging
 logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Keys reported by DataManager.preload(), one per data file
+STARTUP_FILES = ('werkzeuge', 'wkzkaesten', 'ruestwerkzeuge', 'users', 'drawer_config')
+
+TOOL_CORE_FIELDS = ('id', 'name', 'status', 'lagerplatz')
+# werkzeuge.csv column -> Tool attribute (all other columns live in extra_data)
+TOOL_COLUMNS = {'WZ.Nr.': 'id', 'ID': 'id', 'Name': 'name', 'Status': 'status', 'Pos.': 'lagerplatz',
+                'Lagerplatz': 'lagerplatz'}
+TOOL_STATUSES = ('gerüstet', 'maschine', 'Rüstwerkzeuge')
+# Geometry columns: a number (decimal comma or point), '-' or empty
+GEOMETRY_COLUMNS = ('Durchmesser', 'Schaft-D', 'Werkzeug-L', 'Schneiden-L', 'Oberer-D', 'Untere-L',
+                    'Halter-D', 'Gesamt-L')
+_NUMBER = re.compile(r'\d+([.,]\d+)?')
+
+
+def check_tool_value(column: str, value: str) -> str:
+    """Prüft einen Zellwert für werkzeuge.csv; liefert ihn bereinigt oder wirft ValueError."""
+    value = (value or '').strip()
+    if column in GEOMETRY_COLUMNS and value not in ('', '-') and not _NUMBER.fullmatch(value):
+        raise ValueError(f"{column}: '{value}' ist keine Zahl (z.B. 12 oder 6,5; '-' für keinen Wert).")
+    if TOOL_COLUMNS.get(column) == 'name' and not value:
+        raise ValueError("Der Name darf nicht leer sein.")
+    return value
+
+
+RUEST_FIELDS = ('name', 'kasten', 'lade', 'fach', 'bestand', 'min_bestand')
+
+
+def _tool_snapshot(tool: Tool) -> Tool:
+    """Flache Kopie eines Werkzeugs inkl. eigener extra_data."""
+    return Tool(id=tool.id, name=tool.name, status=tool.status,
+                lagerplatz=tool.lagerplatz, extra_data=dict(tool.extra_data))
+
+
+def _tool_changes(before: Tool, after: Tool) -> Dict[str, Tuple[Any, Any]]:
+    """Feldweise Differenz zweier Werkzeuge. Fehlende extra_data-Felder sind None."""
+    changes = {}
+    for attr in TOOL_CORE_FIELDS:
+        old, new = getattr(before, attr), getattr(after, attr)
+        if old != new:
+            changes[attr] = (old, new)
+    for key in set(before.extra_data) | set(after.extra_data):
+        old, new = before.extra_data.get(key), after.extra_data.get(key)
+        if old != new:
+            changes[key] = (old, new)
+    return changes
+
+
+def _ruest_changes(before: Ruestwerkzeug, after: Ruestwerkzeug) -> Dict[str, Tuple[Any, Any]]:
+    """Feldweise Differenz zweier Rüstwerkzeuge."""
+    changes = {}
+    for attr in RUEST_FIELDS:
+        old, new = getattr(before, attr), getattr(after, attr)
+        if old != new:
+            changes[attr] = (old, new)
+    return changes
+
+
+def _snapshot(entity):
+    if isinstance(entity, Ruestwerkzeug):
+        return dataclasses.replace(entity)
+    return _tool_snapshot(entity)
+
+
+def _changes(before, after) -> Dict[str, Tuple[Any, Any]]:
+    if isinstance(after, Ruestwerkzeug):
+        return _ruest_changes(before, after)
+    return _tool_changes(before, after)
+
+
+def _restore(entity, snapshot):
+    """Setzt `entity` in-place auf den Stand von `snapshot` zurück (Seiten halten Referenzen)."""
+    if isinstance(entity, Ruestwerkzeug):
+        for attr in ('id',) + RUEST_FIELDS:
+            setattr(entity, attr, getattr(snapshot, attr))
+        return
+    for attr in TOOL_CORE_FIELDS:
+        setattr(entity, attr, getattr(snapshot, attr))
+    entity.extra_data.clear()
+    entity.extra_data.update(snapshot.extra_data)
+
+
+def _fields(entity) -> List[str]:
+    if isinstance(entity, Ruestwerkzeug):
+        return ['id', *RUEST_FIELDS]
+    return [*TOOL_CORE_FIELDS, *entity.extra_data]
+
+
+def _get_field(entity, field: str):
+    if isinstance(entity, Ruestwerkzeug) or field in TOOL_CORE_FIELDS:
+        return getattr(entity, field)
+    return entity.extra_data.get(field)
+
+
+def _set_field(entity, field: str, value):
+    if isinstance(entity, Ruestwerkzeug) or field in TOOL_CORE_FIELDS:
+        setattr(entity, field, value)
+    elif value is None:
+        entity.extra_data.pop(field, None)
+    else:
+        entity.extra_data[field] = value
+
+
+def _row_keys(entities) -> List[Tuple[str, int]]:
+    """(ID, n-tes Vorkommen) - die Werkzeugliste enthält doppelte Nummern."""
+    seen: Dict[str, int] = {}
+    keys = []
+    for entity in entities:
+        n = seen.get(entity.id, 0)
+        seen[entity.id] = n + 1
+        keys.append((entity.id, n))
+    return keys
+
+
+class SaveConflict(ValueError):
+    """Ein anderes Terminal hat dieselben Daten inzwischen anders geändert."""
+
+
+class Transaction:
+    """
+    Unit of Work über die Werkzeug-Caches (Werkzeuge und Rüstwerkzeuge).
+
+    Entitäten werden vor der Änderung mit track() registriert, neue mit add(),
+    gelöschte mit remove(). Beim Commit wird je betroffener Datei einmal
+    gespeichert (mit der Liste der geänderten Zeilen) und die Änderungen als
+    ein Event-Batch gemeldet. Schlägt etwas fehl, werden Cache und Objekte
+    auf den Stand vor der Transaktion zurückgesetzt.
+    """
+
+    def __init__(self, data_manager: 'DataManager', label: str = '', record: bool = True):
+        self._dm = data_manager
+        self.label = label  # Text für Rückgängig/Wiederholen
+        self.record = record  # False beim Abspielen von Rückgängig/Wiederholen
+        self._lists: Dict[str, Tuple[list, list]] = {}  # dataset -> (cache list, copy at begin)
+        self._snapshots: Dict[int, Tuple[Any, Any]] = {}  # id(entity) -> (entity, snapshot)
+        self._added: List[Any] = []
+        self._removed: List[Any] = []
+        self._events: List[ChangeEvent] = []
+        self._explicit: set = set()  # id(entity) with an explicit event
+        self._saved: List[str] = []  # datasets already written by commit()
+        self._merged: List[str] = []  # datasets merged with a newer version on disk
+        self._booked: Dict[str, int] = {}  # stock deltas already added to the counters
+
+    def _cache_for(self, entity) -> Tuple[str, list]:
+        if isinstance(entity, Ruestwerkzeug):
+            dataset, tools = DATASET_RUEST, self._dm.load_ruestwerkzeuge()
+        else:
+            dataset, tools = DATASET_TOOLS, self._dm.load_tools()
+        if dataset not in self._lists:
+            self._lists[dataset] = (tools, list(tools))
+        return dataset, self._lists[dataset][0]
+
+    def track(self, entity):
+        """Merkt den Zustand von `entity` vor der ersten Änderung."""
+        self._cache_for(entity)
+        if id(entity) not in self._snapshots:
+            self._snapshots[id(entity)] = (entity, _snapshot(entity))
+        return entity
+
+    def add(self, entity, index: Optional[int] = None):
+        _, tools = self._cache_for(entity)
+        if index is None:
+            tools.append(entity)
+        else:
+            tools.insert(index, entity)
+        self._added.append(entity)
+        return entity
+
+    def remove(self, entity):
+        _, tools = self._cache_for(entity)
+        tools[:] = [t for t in tools if t is not entity]
+        if any(e is entity for e in self._added):
+            self._added = [e for e in self._added if e is not entity]
+        else:
+            self._removed.append(entity)
+
+    def publish(self, *events: ChangeEvent):
+        """Meldet fachliche Events (z.B. AssignmentChanged) statt der abgeleiteten Updates."""
+        for event in events:
+            self._events.append(event)
+            self._explicit.add(id(event.tool))
+
+    def changes(self, entity) -> Dict[str, Tuple[Any, Any]]:
+        tracked = self._snapshots.get(id(entity))
+        return _changes(tracked[1], entity) if tracked else {}
+
+    def dirty(self, dataset: str) -> List[Any]:
+        """Neue und geänderte Entitäten eines Datensatzes."""
+        is_ruest = dataset == DATASET_RUEST
+        dirty = [e for e in self._added if isinstance(e, Ruestwerkzeug) == is_ruest]
+        added = {id(e) for e in dirty}
+        for entity, _ in self._snapshots.values():
+            if (isinstance(entity, Ruestwerkzeug) == is_ruest and id(entity) not in added
+                    and self.changes(entity)):
+                dirty.append(entity)
+        return dirty
+
+    def _row_dirty(self, dataset: str) -> List[Any]:
+        """Wie dirty(), aber ohne reine Bestandsänderungen (die gehen in die Zähler)."""
+        return [e for e in self.dirty(dataset)
+                if not isinstance(e, Ruestwerkzeug) or any(e is a for a in self._added)
+                or set(self.changes(e)) != {'bestand'}]
+
+    def _stock_deltas(self) -> Dict[str, int]:
+        removed = {id(e) for e in self._removed}
+        deltas: Dict[str, int] = {}
+        for entity, snapshot in self._snapshots.values():
+            if (isinstance(entity, Ruestwerkzeug) and id(entity) not in removed
+                    and entity.bestand != snapshot.bestand):
+                deltas[entity.id] = deltas.get(entity.id, 0) + entity.bestand - snapshot.bestand
+        return deltas
+
+    def _assignment_changes(self) -> List[Tuple[str, str, int, str, str]]:
+        """(ID, Name, Kasten, von, nach) für jede geänderte Maschinenbelegung."""
+        removed = {id(e) for e in self._removed}
+        rows = [(snapshot, None if id(entity) in removed else entity)
+                for entity, snapshot in self._snapshots.values() if isinstance(entity, Tool)]
+        rows += [(None, e) for e in self._added if isinstance(e, Tool) and id(e) not in self._snapshots]
+        rows += [(e, None) for e in self._removed if isinstance(e, Tool) and id(e) not in self._snapshots]
+        changes = []
+        for before, after in rows:
+            tool = after or before
+            for box in range(1, 5):
+                key = f'Maschine_Box_{box}'
+                old = before.extra_data.get(key, '') if before else ''
+                new = after.extra_data.get(key, '') if after else ''
+                if (old or '') != (new or ''):
+                    changes.append((tool.id, tool.name, box, old or '', new or ''))
+        return changes
+
+    def commit(self) -> List[ChangeEvent]:
+        """
+        Speichert jede geänderte Datei einmal und liefert die zu meldenden Events.
+        Die Dateien bleiben dabei für andere Terminals gesperrt; wurde eine
+        inzwischen von einem anderen Terminal gespeichert, werden die eigenen
+        Änderungen auf deren Stand übertragen (siehe _merge). Bestandsänderungen
+        werden als Zähler dieses Terminals gebucht und brauchen keine Sperre.
+        """
+        touched = []
+        for dataset in (DATASET_TOOLS, DATASET_RUEST):  # fixed order, no deadlock
+            if dataset not in self._lists:
+                continue
+            is_ruest = dataset == DATASET_RUEST
+            removed = [e for e in self._removed if isinstance(e, Ruestwerkzeug) == is_ruest]
+            if self._row_dirty(dataset) or removed:
+                touched.append(dataset)
+
+        with contextlib.ExitStack() as stack:
+            for dataset in touched:
+                stack.enter_context(self._dm._file_locks[dataset])
+            try:
+                for dataset in touched:
+                    if self._dm._is_stale(dataset):
+                        self._merge(dataset, self._dm._read_dataset(dataset))
+                        self._merged.append(dataset)
+                # Counters first: the CSV stores Bestand minus the counter totals
+                self._booked = self._stock_deltas()
+                self._dm._stock.add(self._booked)
+                for dataset in touched:
+                    self._save(dataset, self._lists[dataset][0], self._row_dirty(dataset))
+                    self._saved.append(dataset)
+            except BaseException:
+                # Compensating writes must happen while the files are still locked
+                self.rollback()
+                raise
+
+        if self._booked:
+            try:
+                self._dm.movements.record(self._booked)
+            except Exception as e:
+                # The booking itself is saved; only the history misses it
+                logger.error(f"Error recording stock movement: {e}")
+        if DATASET_TOOLS in self._saved:
+            try:
+                self._dm.assignments.record(self._assignment_changes())
+            except Exception as e:
+                logger.error(f"Error recording machine assignment: {e}")
+        return self._build_events()
+
+    def _merge(self, dataset: str, fresh: list):
+        """
+        Überträgt die Änderungen dieser Transaktion auf den neueren Stand
+        `fresh` eines anderen Terminals (Drei-Wege-Merge je Feld, Basis ist
+        der Snapshot). Felder, die nur dort geändert wurden, werden übernommen;
+        Bestände werden als Differenz gebucht. Ändern beide dasselbe Feld
+        unterschiedlich, wird mit SaveConflict abgebrochen, ohne etwas zu ändern.
+        """
+        tools, before = self._lists[dataset]
+        added = {id(e) for e in self._added}
+        removed = {id(e) for e in self._removed}
+
+        # Rows are matched by their ID at the start of the transaction
+        base_rows = [e for e in before if id(e) not in removed] + list(self._removed)
+        ours_by_key = dict(zip(_row_keys(self._snapshots.get(id(e), (e, e))[1] for e in base_rows), base_rows))
+        fresh_keys = _row_keys(fresh)
+        fresh_by_key = dict(zip(fresh_keys, fresh))
+
+        conflicts = []
+        updates = []  # (entity, field, value, rebase_only)
+        for key, ours in ours_by_key.items():
+            theirs = fresh_by_key.get(key)
+            snapshot = self._snapshots.get(id(ours), (None, None))[1]
+            changes = _changes(snapshot, ours) if snapshot is not None else {}
+            name = (snapshot or ours).name
+            if theirs is None:
+                if changes and id(ours) not in removed:
+                    conflicts.append(f"{name} ({key[0]}) wurde an einem anderen Terminal gelöscht.")
+                continue
+            for field in dict.fromkeys(_fields(ours) + _fields(theirs)):
+                their_value = _get_field(theirs, field)
+                if field not in changes:
+                    updates.append((ours, field, their_value, False))
+                    continue
+                base_value, our_value = changes[field]
+                if their_value == base_value:
+                    continue
+                if field == 'bestand':
+                    # Stock is booked as a difference, two equal takes are two takes
+                    merged_value = their_value + our_value - base_value
+                    if merged_value >= 0:
+                        updates.append((ours, field, their_value, True))
+                        updates.append((ours, field, merged_value, False))
+                        continue
+                    conflicts.append(f"Nicht genug Bestand für {name} (Bestand: {their_value})!")
+                elif their_value == our_value:
+                    updates.append((ours, field, their_value, True))
+                else:
+                    conflicts.append(f"{name} ({key[0]}): '{field}' wurde an einem anderen "
+                                     f"Terminal geändert ({base_value} -> {their_value}).")
+        for entity in self._added:
+            if any(k[0] == entity.id for k in fresh_by_key if k not in ours_by_key):
+                conflicts.append(f"ID {entity.id} wurde an einem anderen Terminal angelegt.")
+        if conflicts:
+            raise SaveConflict("Speichern nicht möglich:\n" + "\n".join(conflicts))
+
+        for entity, field, value, rebase_only in updates:
+            tracked = self._snapshots.get(id(entity))
+            if tracked:
+                _set_field(tracked[1], field, value)
+            if not rebase_only:
+                _set_field(entity, field, value)
+
+        # New list: disk order, our objects where they exist, then our additions.
+        # `before` becomes the merged state without our changes (for rollback).
+        merged = [ours_by_key.get(key, theirs) for key, theirs in zip(fresh_keys, fresh)]
+        new_before = list(merged)
+        merged = [e for e in merged if id(e) not in removed]
+        merged.extend(e for e in tools if id(e) in added)
+        tools[:] = merged
+        self._lists[dataset] = (tools, new_before)
+
+    def _save(self, dataset: str, tools: list, dirty: list):
+        if dataset == DATASET_RUEST:
+            self._dm.save_ruestwerkzeuge(tools, dirty=dirty)
+        else:
+            self._dm.save_tools(tools, dirty=dirty)
+
+    def _build_events(self) -> List[ChangeEvent]:
+        added = {id(e) for e in self._added}
+        removed = {id(e) for e in self._removed}
+
+        events: List[ChangeEvent] = []
+        for entity in self._added:
+            events.append(RuestToolAdded(entity) if isinstance(entity, Ruestwerkzeug) else ToolAdded(entity))
+
+        events.extend(e for e in self._events if id(e.tool) not in added | removed)
+        for entity, _ in self._snapshots.values():
+            key = id(entity)
+            if key in added or key in removed or key in self._explicit:
+                continue
+            changes = self.changes(entity)
+            if not changes:
+                continue
+            if isinstance(entity, Ruestwerkzeug):
+                events.append(RuestToolUpdated(entity, changes))
+                if 'bestand' in changes:
+                    events.append(StockChanged(entity, *changes['bestand']))
+            else:
+                events.append(ToolUpdated(entity, changes))
+
+        for entity in self._removed:
+            events.append(RuestToolRemoved(entity) if isinstance(entity, Ruestwerkzeug) else ToolRemoved(entity))
+
+        # Rows changed by other terminals: pages refresh the whole dataset
+        events.extend(DatasetReloaded(dataset) for dataset in self._merged)
+        return events
+
+    def undo_entry(self) -> UndoEntry:
+        """
+        Nach dem Commit: nur die Differenz (Feld, alt, neu) je geänderter
+        Zeile, angelegte und gelöschte Zeilen als Kopie mit Position.
+        """
+        added = {id(e) for e in self._added}
+        removed = {id(e) for e in self._removed}
+        changes = []
+        for dataset, (tools, before) in self._lists.items():
+            # Keys at the start (by the snapshot ID) and after the commit
+            before_rows = [self._snapshots.get(id(e), (e, e))[1] for e in before]
+            before_at = {id(e): (key, i) for i, (e, key) in enumerate(zip(before, _row_keys(before_rows)))}
+            after_at = {id(e): (key, i) for i, (e, key) in enumerate(zip(tools, _row_keys(tools)))}
+
+            for entity in before:
+                if id(entity) in removed:
+                    snapshot = self._snapshots.get(id(entity), (entity, entity))[1]
+                    key, index = before_at[id(entity)]
+                    changes.append(RowChange(dataset, snapshot.name, key, None,
+                                             row=_snapshot(snapshot), index_before=index))
+                elif id(entity) in self._snapshots and id(entity) in after_at:
+                    fields = self.changes(entity)
+                    if fields:
+                        snapshot = self._snapshots[id(entity)][1]
+                        changes.append(RowChange(dataset, snapshot.name, before_at[id(entity)][0],
+                                                 after_at[id(entity)][0], fields))
+            for entity in tools:
+                if id(entity) in added:
+                    key, index = after_at[id(entity)]
+                    changes.append(RowChange(dataset, entity.name, None, key,
+                                             row=_snapshot(entity), index_after=index))
+        return UndoEntry(self.label, changes)
+
+    def rollback(self):
+        """Setzt Caches und alle registrierten Objekte auf den Stand vor der Transaktion."""
+        reverted = {dataset: self._row_dirty(dataset) for dataset in self._saved}
+        saved, self._saved = self._saved, []
+        booked, self._booked = self._booked, {}
+        for tools, before in self._lists.values():
+            tools[:] = before
+        for entity, snapshot in self._snapshots.values():
+            _restore(entity, snapshot)
+
+        # PN counters only grow: book the opposite delta
+        if booked:
+            try:
+                self._dm._stock.add({tool_id: -delta for tool_id, delta in booked.items()})
+            except Exception as e:
+                logger.error(f"Rollback of stock counters could not be saved: {e}")
+
+        # Files written before the failure get their old content back
+        for dataset in saved:
+            tools = self._lists[dataset][0]
+            try:
+                self._save(dataset, tools, reverted[dataset])
+            except Exception as e:
+                logger.error(f"Rollback of {dataset} could not be saved: {e}")
+
+
+def _synchronized(method):
+    """
+    Serialisiert eine Lade-Methode (ein Lock pro Methode), damit Hintergrund-Threads
+    und GUI dieselbe Datei nicht doppelt parsen, verschiedene Dateien aber parallel.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._locks[method.__name__]:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class DataManager:
-    def __init__(self, tools_csv_path: str, users_csv_path: str):
+    def __init__(self, tools_csv_path: str, users_csv_path: str, terminal: Optional[str] = None):
         self.tools_csv_path = tools_csv_path
         self.users_csv_path = users_csv_path
         self.toolbox_csv_path = os.path.join(os.path.dirname(tools_csv_path), "WKZKästen.csv")
         self.ruest_csv_path = os.path.join(os.path.dirname(tools_csv_path), "ruestwerkzeuge.csv")
         self.drawer_config_path = os.path.join(os.path.dirname(tools_csv_path), "drawer_config.json")
+        # Commit-Markierung für das gemeinsame Speichern von werkzeuge.csv + WKZKästen.csv
+        self.commit_marker_path = os.path.join(os.path.dirname(tools_csv_path), ".werkzeuge.commit")
         
         self.fieldnames = [] # Store CSV headers for main file
         self.toolbox_fieldnames = [] # Store CSV headers for toolbox file
@@ -28,10 +506,296 @@ class DataManager:
         self._users_cache: Optional[List[dict]] = None
         self._drawer_config_cache: Optional[Dict] = None
 
-    # ... (existing methods)
+        # Change events - pages subscribe instead of reloading everything
+        self.events = EventBus()
+
+        # Tools at or below MinBestand, kept current from the events
+        # (subscribed first, so pages see the updated state)
+        self.low_stock = LowStockMonitor(self.load_ruestwerkzeuge)
+        self.events.subscribe(self.low_stock.on_events, *LowStockMonitor.EVENT_TYPES)
+        # Live numbers for the dashboard tiles, same principle
+        self.counters = DashboardCounters(self.load_tools, self.load_ruestwerkzeuge)
+        self.events.subscribe(self.counters.on_events, *DashboardCounters.EVENT_TYPES)
+
+        # Loads may run on worker threads (startup loader)
+        self._locks = {name: threading.RLock()
+                       for name in ('load_tools', 'load_ruestwerkzeuge', 'load_users', 'load_drawer_config')}
+
+        # Active unit of work (see transaction())
+        self._tx: Optional[Transaction] = None
+        self._tx_lock = threading.RLock()
+        # Undo/redo: inverse deltas of the committed transactions
+        self.history = UndoStack()
+        # Entry pushed by the last top-level transaction (None = nothing recorded),
+        # e.g. for the undo button of a toast
+        self.last_undo_entry: Optional[UndoEntry] = None
+
+        # Other terminals may share the data folder: one lock per dataset
+        # (werkzeuge.csv also guards WKZKästen.csv) and the version each
+        # cache was loaded from (<datei>.version, +1 per save)
+        self._dataset_paths = {DATASET_TOOLS: self.tools_csv_path, DATASET_RUEST: self.ruest_csv_path}
+        self._file_locks = {dataset: FileLock(path) for dataset, path in self._dataset_paths.items()}
+        self._versions = {dataset: 0 for dataset in self._dataset_paths}
+
+        # Bestand = Grundbestand aus ruestwerkzeuge.csv + PN-Zähler aller Terminals
+        self._stock = StockCounters(os.path.dirname(tools_csv_path), terminal)
+        # Who booked what and when; AuthManager sets movements.user_provider
+        self.movements = MovementLog(os.path.dirname(tools_csv_path), self._stock.terminal)
+        # Which tool was in which machine when (Maschine_Box_i only holds the present)
+        self.assignments = AssignmentLog(os.path.dirname(tools_csv_path), self._stock.terminal)
+        # Per-day utilisation aggregates over that history
+        self.utilisation = UtilisationStats(os.path.dirname(tools_csv_path), self._stock.terminal)
+        # Saved tool sets (job presets) per machine and Werkzeugkasten
+        self.tool_sets = ToolSetStore(os.path.dirname(tools_csv_path))
+
+        self.recover()
+
+    def recover(self) -> str:
+        """
+        Beendet oder verwirft einen beim letzten Lauf unterbrochenen Speichervorgang,
+        bevor etwas geladen wird (siehe atomares_schreiben.recover).
+        """
+        try:
+            with self._file_locks[DATASET_TOOLS], self._file_locks[DATASET_RUEST]:
+                return recover(self.commit_marker_path,
+                               [self.tools_csv_path, self.toolbox_csv_path, self.ruest_csv_path])
+        except OSError as e:
+            logger.error(f"Error recovering interrupted save: {e}")
+            return ''
+
+    def _version_path(self, dataset: str) -> str:
+        return self._dataset_paths[dataset] + ".version"
+
+    def _read_version(self, dataset: str) -> int:
+        try:
+            with open(self._version_path(dataset), 'r', encoding='utf-8') as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading version of {dataset}: {e}")
+            return 0
+
+    def _bump_version(self, dataset: str):
+        """Nach dem Speichern (unter der Dateisperre): neue Version schreiben und merken."""
+        version = self._read_version(dataset) + 1
+        atomic_write(self._version_path(dataset), lambda f: f.write(str(version)))
+        self._versions[dataset] = version
+
+    def _is_stale(self, dataset: str) -> bool:
+        """True, wenn ein anderes Terminal seit dem Laden gespeichert hat."""
+        return self._read_version(dataset) != self._versions[dataset]
+
+    def _read_dataset(self, dataset: str) -> list:
+        """Liest den aktuellen Stand von der Platte, ohne die Caches zu ändern."""
+        if dataset == DATASET_RUEST:
+            return self._with_stock(self._read_ruest_csv())
+        if not os.path.exists(self.tools_csv_path):
+            return []
+        return self._build_tools(self._read_tools_csv(), self._read_toolbox_csv())
+
+    def preload(self, on_loaded: Optional[Callable[[str], None]] = None, max_workers: int = len(STARTUP_FILES)):
+        """
+        Parses all data files concurrently on a thread pool and fills the caches.
+        Blocks until done - call it from a worker thread. `on_loaded(key)` is
+        called (from a worker thread) for every finished file key in
+        STARTUP_FILES. When both tool files are reported, load_tools() is cached.
+        """
+        # Hold the tools lock so a concurrent load_tools() waits for our result,
+        # and the file lock so both tool files belong to the same version
+        with self._locks['load_tools'], self._file_locks[DATASET_TOOLS]:
+            self._versions[DATASET_TOOLS] = self._read_version(DATASET_TOOLS)
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ToolBuddyLoader") as pool:
+                tools_exist = os.path.exists(self.tools_csv_path)
+                futures = {
+                    pool.submit(self._read_tools_csv if tools_exist else list): 'werkzeuge',
+                    pool.submit(self._read_toolbox_csv): 'wkzkaesten',
+                    pool.submit(self.load_ruestwerkzeuge): 'ruestwerkzeuge',
+                    pool.submit(self.load_users): 'users',
+                    pool.submit(self.load_drawer_config): 'drawer_config',
+                }
+                results = {}
+                for future in as_completed(futures):
+                    key = futures[future]
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        logger.error(f"Error preloading {key}: {e}")
+                        results[key] = None
+
+                    if key in ('werkzeuge', 'wkzkaesten') and 'werkzeuge' in results and 'wkzkaesten' in results:
+                        if tools_exist and results['werkzeuge'] is not None and self._tools_cache is None:
+                            self._tools_cache = self._build_tools(results['werkzeuge'], results['wkzkaesten'] or {})
+
+                    if on_loaded:
+                        on_loaded(key)
+
+    def generation(self, dataset: str) -> int:
+        """Current generation of a dataset (DATASET_TOOLS / DATASET_RUEST)."""
+        return self.events.generation(dataset)
+
+    @contextlib.contextmanager
+    def transaction(self, label: str = '', record: bool = True):
+        """
+        Unit of Work für Änderungen an Werkzeugen und Rüstwerkzeugen:
+
+            with data_manager.transaction() as tx:
+                tx.track(tool)
+                tool.status = 'frei'
+
+        Beim Verlassen wird jede betroffene Datei einmal gespeichert und die
+        Änderungen als ein Event-Batch gemeldet; bei einer Exception werden
+        Cache und Objekte zurückgesetzt. Verschachtelte Aufrufe schließen
+        sich der äußeren Transaktion an. Gespeicherte Transaktionen landen
+        mit `label` in `history` (siehe undo/redo).
+        """
+        with self._tx_lock:
+            if self._tx is not None:
+                self._tx.label = self._tx.label or label
+                yield self._tx
+                return
+
+            tx = Transaction(self, label, record)
+            self._tx = tx
+            self.last_undo_entry = None
+            try:
+                try:
+                    yield tx
+                except BaseException:
+                    tx.rollback()
+                    raise
+                events = tx.commit()  # rolls back itself on failure
+                if tx.record:
+                    entry = tx.undo_entry()
+                    if entry.changes:
+                        self.history.push(entry)
+                        self.last_undo_entry = entry
+            except SaveConflict:
+                # Continue from the other terminal's state so the user can retry
+                self._tx = None
+                for dataset in tx._lists:
+                    self._reload_dataset(dataset)
+                raise
+            finally:
+                self._tx = None
+
+        # Outside the unit of work, so handlers may start their own transactions
+        self.events.publish(*events)
+
+    def _reload_dataset(self, dataset: str):
+        if dataset == DATASET_RUEST:
+            self.load_ruestwerkzeuge(force_reload=True)
+        else:
+            self.load_tools(force_reload=True)
+
+    # --- Undo / Redo ---
+
+    def undo(self, entries: Optional[List[UndoEntry]] = None) -> Optional[str]:
+        """
+        Macht die letzte Änderung rückgängig. Liefert ihre Bezeichnung (None = nichts zu tun).
+        Mit `entries` (älteste zuerst, z.B. die eines Toasts) nur, solange genau
+        diese Einträge oben auf dem Stapel liegen; sie werden gemeinsam in einer
+        Transaktion zurückgenommen, ganz oder gar nicht.
+        """
+        with self._tx_lock:
+            if entries is None:
+                entry = self.history.next_undo()
+                if entry is None:
+                    return None
+                entries = [entry]
+            elif not self.history.is_top(entries):
+                raise UndoConflict("Rückgängig nicht mehr möglich: inzwischen gab es weitere Änderungen.")
+            labels = list(dict.fromkeys(entry.label for entry in entries))
+            label = f"{len(entries)}× {labels[0]}" if len(entries) > 1 and len(labels) == 1 else ", ".join(labels)
+
+            self._refresh_for_replay(entries)
+            with self.transaction(label, record=False):
+                for entry in reversed(entries):
+                    self._replay(entry.inverse(), entry.label, "Rückgängig")
+            for _ in entries:
+                self.history.undone()
+            return label
+
+    def redo(self) -> Optional[str]:
+        """Wiederholt die zuletzt rückgängig gemachte Änderung."""
+        with self._tx_lock:
+            entry = self.history.next_redo()
+            if entry is None:
+                return None
+            self._refresh_for_replay([entry])
+            self._replay(entry.changes, entry.label, "Wiederholen")
+            self.history.redone()
+            return entry.label
+
+    def _refresh_for_replay(self, entries: List[UndoEntry]):
+        """Check against what other terminals saved, not our older cache."""
+        datasets = {change.dataset for entry in entries for change in entry.changes}
+        for dataset in datasets:
+            if self._is_stale(dataset):
+                self._reload_dataset(dataset)
+        if DATASET_RUEST in datasets:
+            self.refresh_stock()
+
+    def _replay(self, changes: List[RowChange], label: str, action: str):
+        """
+        Wendet Zeilenänderungen als eine Transaktion an. Jede Zeile muss noch
+        den Stand `key_before`/alte Werte haben, sonst UndoConflict ohne
+        Änderung. Bestände werden als Differenz gebucht.
+        """
+        datasets = list(dict.fromkeys(c.dataset for c in changes))
+        rows = {}
+        for dataset in datasets:
+            tools = self.load_ruestwerkzeuge() if dataset == DATASET_RUEST else self.load_tools()
+            rows[dataset] = dict(zip(_row_keys(tools), tools))
+
+        conflicts = []
+        resolved = []  # (change, entity)
+        for change in changes:
+            if change.key_before is None:
+                if change.dataset == DATASET_RUEST and any(k[0] == change.key_after[0] for k in rows[DATASET_RUEST]):
+                    conflicts.append(f"ID {change.key_after[0]} ist inzwischen vergeben.")
+                resolved.append((change, None))
+                continue
+            entity = rows[change.dataset].get(change.key_before)
+            if entity is None:
+                conflicts.append(f"{change.name} ({change.key_before[0]}) existiert nicht mehr.")
+                continue
+            if change.key_after is None:
+                # Deleting a row only if it is still the one we created
+                if set(_changes(change.row, entity)) - {'bestand'}:
+                    conflicts.append(f"{change.name} ({change.key_before[0]}) wurde inzwischen geändert.")
+            for field, (old, new) in change.fields.items():
+                current = _get_field(entity, field)
+                if field == 'bestand':
+                    if current + new - old < 0:
+                        conflicts.append(f"Nicht genug Bestand für {change.name} (Bestand: {current})!")
+                elif current != old:
+                    conflicts.append(f"{change.name} ({change.key_before[0]}): '{field}' wurde "
+                                     f"inzwischen geändert ({old} -> {current}).")
+            resolved.append((change, entity))
+        if conflicts:
+            raise UndoConflict(f"{action} nicht möglich ({label}):\n" + "\n".join(conflicts))
+
+        with self.transaction(label, record=False) as tx:
+            for change, entity in resolved:
+                if entity is None:
+                    continue
+                if change.key_after is None:
+                    tx.remove(entity)
+                    continue
+                tx.track(entity)
+                for field, (old, new) in change.fields.items():
+                    if field == 'bestand':
+                        new = entity.bestand + new - old
+                    _set_field(entity, field, new)
+            # Re-created rows back at their position, front to back
+            added = [c for c, entity in resolved if entity is None]
+            for change in sorted(added, key=lambda c: c.index_after):
+                tx.add(_snapshot(change.row), index=change.index_after)
 
     # --- Drawer Configuration Methods ---
 
+    @_synchronized
     def load_drawer_config(self) -> Dict:
         if self._drawer_config_cache is not None:
             return self._drawer_config_cache
@@ -50,8 +814,7 @@ class DataManager:
     def save_drawer_config(self, config: Dict):
         self._drawer_config_cache = config
         try:
-            with open(self.drawer_config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4)
+            atomic_write(self.drawer_config_path, lambda f: json.dump(config, f, indent=4))
         except Exception as e:
             logger.error(f"Error saving drawer config: {e}")
             raise
@@ -74,124 +837,312 @@ class DataManager:
         self._tools_cache = None
         self._ruest_cache = None
         self._users_cache = None
+        self.events.publish(DatasetReloaded(DATASET_TOOLS), DatasetReloaded(DATASET_RUEST))
 
+    @_synchronized
     def load_tools(self, force_reload: bool = False) -> List[Tool]:
         if self._tools_cache is not None and not force_reload:
             return self._tools_cache
+        was_loaded = self._tools_cache is not None
 
-        tools = []
         if not os.path.exists(self.tools_csv_path):
             logger.warning(f"Tools file not found: {self.tools_csv_path}")
             return []
         
         try:
-            # Load Toolbox Data first
-            toolbox_data_map = {}
-            if os.path.exists(self.toolbox_csv_path):
-                try:
-                    with open(self.toolbox_csv_path, mode='r', encoding='utf-8-sig', errors='replace') as f:
-                        line = f.readline()
-                        f.seek(0)
-                        delimiter = ';' if ';' in line else ','
-                        reader = csv.DictReader(f, delimiter=delimiter)
-                        self.toolbox_fieldnames = reader.fieldnames if reader.fieldnames else []
-                        for row in reader:
-                            name = row.get('Name', '').strip()
-                            if name:
-                                toolbox_data_map[name] = row
-                except Exception as e:
-                    logger.error(f"Error reading toolbox CSV: {e}")
-
-            with open(self.tools_csv_path, mode='r', encoding='utf-8-sig', errors='replace') as f:
-                line = f.readline()
-                f.seek(0)
-                delimiter = ';' if ';' in line else ','
-                
-                reader = csv.DictReader(f, delimiter=delimiter)
-                self.fieldnames = reader.fieldnames if reader.fieldnames else []
-                
-                for row in reader:
-                    try:
-                        raw_status = row.get('Status', '').strip()
-                        status = raw_status
-                        if raw_status.upper() == 'MASCHIENE':
-                            status = 'maschine'
-                        elif raw_status.upper() == 'GERÜSTET':
-                            status = 'gerüstet'
-                        elif raw_status.upper() in ['RÜSTWERKZEUG', 'RÜSTWERKZEUGE']:
-                            status = 'Rüstwerkzeuge'
-                        
-                        # Extract known fields
-                        t_id = row.get('WZ.Nr.', row.get('ID', '')).strip()
-                        t_name = row.get('Name', '').strip()
-                        t_lager = row.get('Pos.', row.get('Lagerplatz', '')).strip()
-                        
-                        # Merge with toolbox data
-                        extra = {k: (v or '') for k, v in row.items() if k not in ['WZ.Nr.', 'ID', 'Name', 'Status', 'Pos.', 'Lagerplatz']}
-                        
-                        if t_name in toolbox_data_map:
-                            # Add toolbox data to extra, excluding Name
-                            tb_row = toolbox_data_map[t_name]
-                            for k, v in tb_row.items():
-                                if k != 'Name':
-                                    extra[k] = v or ''
-
-                        # Initialize per-toolbox status if not present
-                        # This ensures we have independent status for each toolbox
-                        herkunft = extra.get('Herkunft_Kasten')
-                        if herkunft is None:
-                            herkunft = ''
-                        
-                        # Normalize herkunft to just the number if possible, or keep string
-                        herkunft_id = '0'
-                        if 'Werkzeugkasten' in herkunft:
-                            try:
-                                herkunft_id = herkunft.split(' ')[-1]
-                            except:
-                                pass
-                        
-                        for i in range(1, 5):
-                            key = f'Status_Box_{i}'
-                            machine_key = f'Maschine_Box_{i}'
-                            
-                            if key not in extra or extra[key] == '':
-                                # Initialize with main status if not present
-                                # Special case: if there's a machine assignment for this box, set to 'maschine'
-                                if machine_key in extra and extra[machine_key]:
-                                    extra[key] = 'maschine'
-                                else:
-                                    # Use the main status as default
-                                    extra[key] = status
-
-                        tools.append(Tool(
-                            id=t_id,
-                            name=t_name,
-                            status=status,
-                            lagerplatz=t_lager,
-                            extra_data=extra
-                        ))
-                    except Exception as e:
-                        logger.error(f"Error parsing tool row: {e}")
-                        continue
-                        
+            with self._file_locks[DATASET_TOOLS]:
+                self._versions[DATASET_TOOLS] = self._read_version(DATASET_TOOLS)
+                tools = self._build_tools(self._read_tools_csv(), self._read_toolbox_csv())
             self._tools_cache = tools
+            if was_loaded:
+                self.events.publish(DatasetReloaded(DATASET_TOOLS))
             return tools
             
         except Exception as e:
             logger.error(f"Critical error loading tools: {e}")
             return []
 
+    def _read_toolbox_csv(self) -> Dict[str, dict]:
+        """Reads WKZKästen.csv into a map Name -> row. Does not touch the caches."""
+        toolbox_data_map = {}
+        if os.path.exists(self.toolbox_csv_path):
+            try:
+                with open(self.toolbox_csv_path, mode='r', encoding='utf-8-sig', errors='replace') as f:
+                    line = f.readline()
+                    f.seek(0)
+                    delimiter = ';' if ';' in line else ','
+                    reader = csv.DictReader(f, delimiter=delimiter)
+                    self.toolbox_fieldnames = reader.fieldnames if reader.fieldnames else []
+                    for row in reader:
+                        name = row.get('Name', '').strip()
+                        if name:
+                            toolbox_data_map[name] = row
+            except Exception as e:
+                logger.error(f"Error reading toolbox CSV: {e}")
+        return toolbox_data_map
+
+    def _read_tools_csv(self) -> List[dict]:
+        """Reads the raw rows of werkzeuge.csv. Does not touch the caches."""
+        with open(self.tools_csv_path, mode='r', encoding='utf-8-sig', errors='replace') as f:
+            line = f.readline()
+            f.seek(0)
+            delimiter = ';' if ';' in line else ','
+            
+            reader = csv.DictReader(f, delimiter=delimiter)
+            self.fieldnames = reader.fieldnames if reader.fieldnames else []
+            return list(reader)
+
+    def _build_tools(self, rows: List[dict], toolbox_data_map: Dict[str, dict]) -> List[Tool]:
+        """Merges werkzeuge.csv rows with the toolbox data into Tool objects."""
+        tools = []
+        for row in rows:
+            try:
+                raw_status = row.get('Status', '').strip()
+                status = raw_status
+                if raw_status.upper() == 'MASCHIENE':
+                    status = 'maschine'
+                elif raw_status.upper() == 'GERÜSTET':
+                    status = 'gerüstet'
+                elif raw_status.upper() in ['RÜSTWERKZEUG', 'RÜSTWERKZEUGE']:
+                    status = 'Rüstwerkzeuge'
+                
+                # Extract known fields
+                t_id = row.get('WZ.Nr.', row.get('ID', '')).strip()
+                t_name = row.get('Name', '').strip()
+                t_lager = row.get('Pos.', row.get('Lagerplatz', '')).strip()
+                
+                # Merge with toolbox data
+                extra = {k: (v or '') for k, v in row.items() if k not in ['WZ.Nr.', 'ID', 'Name', 'Status', 'Pos.', 'Lagerplatz']}
+                
+                if t_name in toolbox_data_map:
+                    # Add toolbox data to extra, excluding Name
+                    tb_row = toolbox_data_map[t_name]
+                    for k, v in tb_row.items():
+                        if k != 'Name':
+                            extra[k] = v or ''
+
+                # Initialize per-toolbox status if not present
+                # This ensures we have independent status for each toolbox
+                herkunft = extra.get('Herkunft_Kasten')
+                if herkunft is None:
+                    herkunft = ''
+                
+                # Normalize herkunft to just the number if possible, or keep string
+                herkunft_id = '0'
+                if 'Werkzeugkasten' in herkunft:
+                    try:
+                        herkunft_id = herkunft.split(' ')[-1]
+                    except:
+                        pass
+                
+                for i in range(1, 5):
+                    key = f'Status_Box_{i}'
+                    machine_key = f'Maschine_Box_{i}'
+                    
+                    if key not in extra or extra[key] == '':
+                        # Initialize with main status if not present
+                        # Special case: if there's a machine assignment for this box, set to 'maschine'
+                        if machine_key in extra and extra[machine_key]:
+                            extra[key] = 'maschine'
+                        else:
+                            # Use the main status as default
+                            extra[key] = status
+
+                tools.append(Tool(
+                    id=t_id,
+                    name=t_name,
+                    status=status,
+                    lagerplatz=t_lager,
+                    extra_data=extra
+                ))
+            except Exception as e:
+                logger.error(f"Error parsing tool row: {e}")
+                continue
+        return tools
+
+    def add_tool(self, tool: Tool):
+        with self.transaction(f"Werkzeug {tool.name} anlegen") as tx:
+            tx.add(tool)
+
+    def update_tool(self, tool: Tool, updated: Tool):
+        """Übernimmt die Werte von `updated` in das gecachte `tool` und speichert."""
+        extra_data = dict(updated.extra_data)
+        with self.transaction(f"Werkzeug {tool.name} bearbeiten") as tx:
+            tx.track(tool)
+            tool.id = updated.id
+            tool.name = updated.name
+            tool.status = updated.status
+            tool.lagerplatz = updated.lagerplatz
+            tool.extra_data.clear()
+            tool.extra_data.update(extra_data)
+
     def delete_tool(self, tool_id: str) -> bool:
-        tools = self.load_tools()
-        initial_len = len(tools)
-        tools = [t for t in tools if t.id != tool_id]
-        
-        if len(tools) < initial_len:
-            self.save_tools(tools)
-            return True
-        return False
+        removed = [t for t in self.load_tools() if t.id == tool_id]
+        if not removed:
+            return False
+        with self.transaction(f"Werkzeug {removed[0].name} löschen") as tx:
+            for tool in removed:
+                tx.remove(tool)
+        return True
+
+    def update_tools(self, tools: List[Tool], values: Dict[str, str]) -> int:
+        """
+        Setzt Spalten (`values`: Spaltenname -> Wert, z.B. {'Spannmittel': 'HSK63'})
+        für alle `tools` in einer Transaktion: ein Speichern, ein Event-Batch.
+        ID und Name identifizieren das Werkzeug und sind ausgenommen. Liefert die
+        Anzahl tatsächlich geänderter Werkzeuge.
+        """
+        if {'id', 'name'} & {TOOL_COLUMNS.get(column) for column in values}:
+            raise ValueError("ID und Name können nicht für mehrere Werkzeuge gleichzeitig gesetzt werden.")
+        return self.edit_tools([(tool, values) for tool in tools], f"{len(tools)} Werkzeug(e) bearbeiten")
 
-    def save_tools(self, tools: List[Tool]):
+    def edit_tools(self, edits: List[Tuple[Tool, Dict[str, str]]], label: str = '') -> int:
+        """
+        Übernimmt je Werkzeug eigene Spaltenwerte (z.B. gesammelte Zellen aus
+        der Admin-Tabelle) in einer Transaktion. Alle Werte werden vorher mit
+        check_tool_value geprüft; ist einer ungültig, wird nichts geändert.
+        Die ID ist nicht änderbar. Liefert die Anzahl geänderter Werkzeuge.
+        """
+        checked = []
+        errors = []
+        for tool, values in edits:
+            fields = {}
+            for column, value in values.items():
+                field = TOOL_COLUMNS.get(column, column)
+                if field == 'id':
+                    raise ValueError("Die ID eines Werkzeugs kann nicht geändert werden.")
+                try:
+                    fields[field] = check_tool_value(column, value)
+                except ValueError as e:
+                    errors.append(f"{tool.name} ({tool.id}): {e}")
+            checked.append((tool, fields))
+        if errors:
+            raise ValueError("\n".join(errors))
+
+        changed = 0
+        with self.transaction(label or f"{len(edits)} Werkzeug(e) bearbeiten") as tx:
+            for tool, fields in checked:
+                if all(_get_field(tool, field) == value for field, value in fields.items()):
+                    continue
+                tx.track(tool)
+                for field, value in fields.items():
+                    _set_field(tool, field, value)
+                changed += 1
+        return changed
+
+    def delete_tools(self, tools: List[Tool]):
+        """Löscht genau diese Werkzeug-Objekte (auch bei doppelten IDs) mit einem Speichern."""
+        with self.transaction(f"{len(tools)} Werkzeug(e) löschen") as tx:
+            for tool in tools:
+                tx.remove(tool)
+
+    # --- Machine Assignment Methods ---
+
+    def load_to_machine(self, tools: List[Tool], box_idx: int, machine: str):
+        """Lädt Werkzeuge aus Werkzeugkasten `box_idx` in die Maschine `machine`."""
+        status_key = f'Status_Box_{box_idx}'
+        machine_key = f'Maschine_Box_{box_idx}'
+        original_status_key = f'OriginalStatus_Box_{box_idx}'
+
+        with self.transaction(f"{len(tools)} Werkzeug(e) aus Kasten {box_idx} in {machine} laden") as tx:
+            for tool in tools:
+                tx.track(tool)
+                old_machine = tool.extra_data.get(machine_key, '')
+
+                # Save the ORIGINAL status before changing to 'maschine'
+                current_status = tool.extra_data.get(status_key, tool.status)
+                tool.extra_data[original_status_key] = current_status
+
+                # Set status for THIS toolbox ONLY
+                tool.extra_data[status_key] = 'maschine'
+                tool.extra_data[machine_key] = machine
+
+                # DO NOT change tool.status (main Status column)!
+                # Only update legacy fields for compatibility
+                tool.extra_data['Maschine'] = machine
+                tool.extra_data['Herkunft_Kasten'] = f"Werkzeugkasten {box_idx}"
+
+                tx.publish(AssignmentChanged(tool, box_idx, old_machine, machine))
+
+    def unload_from_machine(self, assignments: List[Tuple[Tool, int]]):
+        """Entlädt (Werkzeug, Box)-Paare zurück in ihren Werkzeugkasten."""
+        with self.transaction(f"{len(assignments)} Werkzeug(e) entladen") as tx:
+            for tool, box_idx in assignments:
+                tx.track(tool)
+                old_machine = tool.extra_data.get(f'Maschine_Box_{box_idx}', '')
+
+                # Restore the ORIGINAL status (before it was loaded into machine)
+                original_status_key = f'OriginalStatus_Box_{box_idx}'
+                original_status = tool.extra_data.get(original_status_key, tool.status)
+
+                # Reset status for that specific box to its ORIGINAL value
+                tool.extra_data[f'Status_Box_{box_idx}'] = original_status
+
+                # Clear the saved original status
+                if original_status_key in tool.extra_data:
+                    del tool.extra_data[original_status_key]
+
+                # Clear machine assignment for that box
+                if f'Maschine_Box_{box_idx}' in tool.extra_data:
+                    del tool.extra_data[f'Maschine_Box_{box_idx}']
+
+                # DO NOT change tool.status (main Status column)!
+                # Only clear legacy machine field if no box has it in a machine
+                is_in_any_machine = any(tool.extra_data.get(f'Status_Box_{i}') == 'maschine'
+                                        for i in range(1, 5))
+                if not is_in_any_machine and 'Maschine' in tool.extra_data:
+                    del tool.extra_data['Maschine']
+
+                tx.publish(AssignmentChanged(tool, box_idx, old_machine, ''))
+
+    def reset_toolboxes(self):
+        """Löscht alle Maschinenbelegungen und Box-Status."""
+        with self.transaction("Werkzeugkästen zurücksetzen") as tx:
+            for tool in self.load_tools():
+                tx.track(tool)
+
+                # Clear per-box status and machine assignment
+                for k in list(tool.extra_data.keys()):
+                    if k.startswith('Status_Box_') or k.startswith('Maschine_Box_'):
+                        del tool.extra_data[k]
+
+                # Reset global status if it was 'maschine'
+                if tool.status.lower() == 'maschine':
+                    tool.status = 'frei'
+
+                # Clear global machine/origin data
+                tool.extra_data.pop('Maschine', None)
+                tool.extra_data.pop('Herkunft_Kasten', None)
+
+    def tool_set_diff(self, tool_set: ToolSet) -> ToolSetDiff:
+        """Was apply_tool_set(tool_set) am aktuellen (auch fremden) Stand ändern würde."""
+        if self._is_stale(DATASET_TOOLS):
+            self._reload_dataset(DATASET_TOOLS)
+        return diff_tool_set(tool_set, self.load_tools())
+
+    def apply_tool_set(self, tool_set: ToolSet) -> ToolSetDiff:
+        """
+        Lädt einen Werkzeugsatz: entlädt und lädt nur die Differenz zur
+        aktuellen Belegung, in einer Transaktion (ein Speichern, ein Event-Batch,
+        ein Rückgängig-Eintrag). Liefert die angewendete Differenz.
+        """
+        with self._tx_lock:
+            diff = self.tool_set_diff(tool_set)
+            if diff.empty:
+                return diff
+            with self.transaction(f"Werkzeugsatz {tool_set.name} in {tool_set.machine} laden"):
+                if diff.unload:
+                    self.unload_from_machine([(tool, tool_set.box) for tool in diff.unload])
+                if diff.load:
+                    self.load_to_machine(diff.load, tool_set.box, tool_set.machine)
+            return diff
+
+    def save_tools(self, tools: List[Tool], dirty: Optional[List[Tool]] = None):
+        """
+        Schreibt werkzeuge.csv und WKZKästen.csv. `dirty` (aus einer
+        Transaktion) nennt die geänderten Zeilen; das CSV-Format kann keine
+        einzelnen Zeilen ersetzen und schreibt daher immer die ganze Datei.
+        """
         # Update cache
         self._tools_cache = tools
         
@@ -216,7 +1167,7 @@ class DataManager:
                 'WZ-Hersteller', 'Sim.Farbe', 'Status', 'Pos.'
             }
             
-            with open(self.tools_csv_path, mode='w', newline='', encoding='utf-8-sig') as f:
+            def write_tools(f):
                 writer = csv.DictWriter(f, fieldnames=self.fieldnames, delimiter=';')
                 writer.writeheader()
                 
@@ -275,7 +1226,7 @@ class DataManager:
                 final_toolbox_fieldnames.remove('Name')
             final_toolbox_fieldnames.insert(0, 'Name')
 
-            with open(self.toolbox_csv_path, mode='w', newline='', encoding='utf-8-sig') as f:
+            def write_toolbox(f):
                 writer = csv.DictWriter(f, fieldnames=final_toolbox_fieldnames, delimiter=';')
                 writer.writeheader()
                 
@@ -295,10 +1246,19 @@ class DataManager:
                         if f_name not in row:
                             row[f_name] = ''
                     writer.writerow(row)
+
+            # Beide Dateien gemeinsam: nach einem Absturz gilt entweder der alte
+            # oder der neue Stand von beiden
+            with self._file_locks[DATASET_TOOLS]:
+                commit_files(self.commit_marker_path,
+                             {self.tools_csv_path: write_tools, self.toolbox_csv_path: write_toolbox},
+                             encoding='utf-8-sig')
+                self._bump_version(DATASET_TOOLS)
         except Exception as e:
             logger.error(f"Error saving tools: {e}")
             raise
 
+    @_synchronized
     def load_users(self) -> List[dict]:
         if self._users_cache is not None:
             return self._users_cache
@@ -325,12 +1285,13 @@ class DataManager:
     def save_users(self, users: List[dict]):
          self._users_cache = users
          try:
-             with open(self.users_csv_path, mode='w', newline='', encoding='utf-8') as f:
-                fieldnames = ['Username', 'Password', 'Role']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
+             def write(f):
+                writer = csv.DictWriter(f, fieldnames=['Username', 'Password', 'Role'])
                 writer.writeheader()
                 for user in users:
                     writer.writerow(user)
+
+             atomic_write(self.users_csv_path, write)
          except Exception as e:
              logger.error(f"Error saving users: {e}")
              raise
@@ -376,49 +1337,86 @@ class DataManager:
     def save_user_toolbox(self, toolbox_id, tool_ids: List[str]):
         path = self.get_toolbox_path(toolbox_id)
         try:
-            with open(path, 'w', encoding='utf-8', newline='') as f:
-                writer = csv.writer(f)
-                for tid in tool_ids:
-                    writer.writerow([tid])
+            atomic_write(path, lambda f: csv.writer(f).writerows([tid] for tid in tool_ids))
         except Exception as e:
             logger.error(f"Error saving user toolbox {toolbox_id}: {e}")
 
     # --- Rüstwerkzeug Methods ---
 
+    @_synchronized
     def load_ruestwerkzeuge(self, force_reload: bool = False) -> List[Ruestwerkzeug]:
         if self._ruest_cache is not None and not force_reload:
             return self._ruest_cache
+        was_loaded = self._ruest_cache is not None
 
-        tools = []
         if not os.path.exists(self.ruest_csv_path):
             return []
         
         try:
-            with open(self.ruest_csv_path, mode='r', encoding='utf-8-sig', errors='replace') as f:
-                reader = csv.DictReader(f, delimiter=';')
-                for row in reader:
-                    try:
-                        tools.append(Ruestwerkzeug(
-                            id=row['ID'],
-                            name=row['Name'],
-                            kasten=int(row['Kasten']),
-                            lade=int(row['Lade']),
-                            fach=int(row['Fach']),
-                            bestand=int(row['Bestand']),
-                            min_bestand=int(row.get('MinBestand', 0))
-                        ))
-                    except (ValueError, KeyError):
-                        continue
+            with self._file_locks[DATASET_RUEST]:
+                self._versions[DATASET_RUEST] = self._read_version(DATASET_RUEST)
+                tools = self._read_ruest_csv()
+            # The cache is replaced, so the counter changes need no events
+            self._stock.refresh()
+            tools = self._with_stock(tools)
             self._ruest_cache = tools
+            if was_loaded:
+                self.events.publish(DatasetReloaded(DATASET_RUEST))
             return tools
         except Exception as e:
             logger.error(f"Error loading ruestwerkzeuge: {e}")
             return []
 
-    def save_ruestwerkzeuge(self, tools: List[Ruestwerkzeug]):
+    def _read_ruest_csv(self) -> List[Ruestwerkzeug]:
+        """Reads ruestwerkzeuge.csv. Does not touch the caches."""
+        tools = []
+        if not os.path.exists(self.ruest_csv_path):
+            return tools
+        with open(self.ruest_csv_path, mode='r', encoding='utf-8-sig', errors='replace') as f:
+            reader = csv.DictReader(f, delimiter=';')
+            for row in reader:
+                try:
+                    tools.append(Ruestwerkzeug(
+                        id=row['ID'],
+                        name=row['Name'],
+                        kasten=int(row['Kasten']),
+                        lade=int(row['Lade']),
+                        fach=int(row['Fach']),
+                        bestand=int(row['Bestand']),
+                        min_bestand=int(row.get('MinBestand', 0))
+                    ))
+                except (ValueError, KeyError):
+                    continue
+        return tools
+
+    def _with_stock(self, tools: List[Ruestwerkzeug]) -> List[Ruestwerkzeug]:
+        """Rechnet die Zählerstände aller Terminals auf den Grundbestand."""
+        for tool in tools:
+            tool.bestand += self._stock.total(tool.id)
+        return tools
+
+    def refresh_stock(self) -> List[Ruestwerkzeug]:
+        """
+        Übernimmt Entnahmen/Rückgaben anderer Terminals (deren Zählerdateien)
+        in den Cache und meldet sie als StockChanged. Liefert die geänderten Werkzeuge.
+        """
+        changed = self._stock.refresh()
+        if not changed or self._ruest_cache is None:
+            return []
+        events = []
+        for tool in self._ruest_cache:
+            diff = changed.get(tool.id)
+            if diff:
+                events.append(StockChanged(tool, tool.bestand, tool.bestand + diff))
+                tool.bestand += diff
+        self.events.publish(*events)
+        return [e.tool for e in events]
+
+    def save_ruestwerkzeuge(self, tools: List[Ruestwerkzeug], dirty: Optional[List[Ruestwerkzeug]] = None):
+        """Schreibt ruestwerkzeuge.csv (immer komplett, `dirty` siehe save_tools)."""
         self._ruest_cache = tools
         try:
-            with open(self.ruest_csv_path, mode='w', newline='', encoding='utf-8-sig') as f:
+            def write(f):
                 writer = csv.DictWriter(f, fieldnames=self.ruest_fieldnames, delimiter=';')
                 writer.writeheader()
                 for tool in tools:
@@ -428,9 +1426,13 @@ class DataManager:
                         'Kasten': tool.kasten,
                         'Lade': tool.lade,
                         'Fach': tool.fach,
-                        'Bestand': tool.bestand,
+                        'Bestand': tool.bestand - self._stock.total(tool.id),
                         'MinBestand': tool.min_bestand
                     })
+
+            with self._file_locks[DATASET_RUEST]:
+                atomic_write(self.ruest_csv_path, write, encoding='utf-8-sig')
+                self._bump_version(DATASET_RUEST)
         except Exception as e:
             logger.error(f"Error saving ruestwerkzeuge: {e}")
             raise
@@ -456,11 +1458,15 @@ class DataManager:
             if not self.check_location_availability(tool.kasten, tool.lade, tool.fach):
                 raise ValueError(f"Lagerplatz K{tool.kasten}/L{tool.lade}/F{tool.fach} ist bereits belegt!")
             
-        tools.append(tool)
-        self.save_ruestwerkzeuge(tools)
+        with self.transaction(f"Rüstwerkzeug {tool.name} anlegen") as tx:
+            tx.add(tool)
         return True
 
     def update_ruestwerkzeug(self, tool: Ruestwerkzeug) -> bool:
+        """
+        Speichert `tool`. Ist es eine Kopie des gecachten Objekts, werden die
+        Werte in das gecachte Objekt übernommen und die Differenz gemeldet.
+        """
         tools = self.load_ruestwerkzeuge()
         
         # Check location availability (ignoring self) - aber nur wenn ein Lagerplatz zugewiesen wurde
@@ -469,19 +1475,70 @@ class DataManager:
             if not self.check_location_availability(tool.kasten, tool.lade, tool.fach, ignore_id=tool.id):
                 raise ValueError(f"Lagerplatz K{tool.kasten}/L{tool.lade}/F{tool.fach} ist bereits belegt!")
 
-        for i, t in enumerate(tools):
+        for t in tools:
             if t.id == tool.id:
-                tools[i] = tool
-                self.save_ruestwerkzeuge(tools)
+                with self.transaction(f"Rüstwerkzeug {t.name} bearbeiten") as tx:
+                    tx.track(t)
+                    for attr in RUEST_FIELDS:
+                        setattr(t, attr, getattr(tool, attr))
                 return True
         return False
 
-    def delete_ruestwerkzeug(self, tool_id: str) -> bool:
+    def change_stock(self, tool_id: str, delta: int) -> Ruestwerkzeug:
+        """Bucht `delta` Stück auf den Bestand (negativ = Entnahme)."""
+        return self.change_stocks({tool_id: delta})[0]
+
+    def change_stocks(self, deltas: Dict[str, int]) -> List[Ruestwerkzeug]:
+        """
+        Bucht mehrere Bestandsänderungen {ID: delta} als eine Einheit:
+        alle werden vorab geprüft, dann gemeinsam auf die Zähler dieses
+        Terminals gebucht und gemeldet. Schlägt eine Prüfung fehl, wird
+        nichts geändert. Geprüft wird gegen den aktuellen Stand aller
+        Terminals, den refresh_stock() vorher einliest.
+        """
         tools = self.load_ruestwerkzeuge()
-        initial_len = len(tools)
-        tools = [t for t in tools if t.id != tool_id]
-        if len(tools) < initial_len:
-            self.save_ruestwerkzeuge(tools)
-            return True
-        return False
+        self.refresh_stock()
+        by_id = {t.id: t for t in tools}
+
+        errors = []
+        changed = []
+        for tool_id, delta in deltas.items():
+            tool = by_id.get(tool_id)
+            if tool is None:
+                errors.append(f"Rüstwerkzeug '{tool_id}' nicht gefunden!")
+            elif tool.bestand + delta < 0:
+                errors.append(f"Nicht genug Bestand für {tool.name} (Bestand: {tool.bestand})!")
+            elif delta:
+                changed.append((tool, tool.bestand, tool.bestand + delta))
+        if errors:
+            raise ValueError("\n".join(errors))
+        if all(new < old for _, old, new in changed):
+            label = "Entnahme"
+        elif all(new > old for _, old, new in changed):
+            label = "Rückgabe"
+        else:
+            label = "Bestandsänderung"
+        if len(changed) == 1:
+            label += f" {changed[0][0].name}"
+        with self.transaction(label) as tx:
+            for tool, old, new in changed:
+                tx.track(tool)
+                tool.bestand = new
+                tx.publish(StockChanged(tool, old, new))
+        return [by_id[tool_id] for tool_id in deltas]
+
+    def take_ruestwerkzeuge(self, picks: Dict[str, int]) -> List[Ruestwerkzeug]:
+        """Entnimmt eine Pickliste {ID: Menge} in einem Schritt."""
+        if any(qty <= 0 for qty in picks.values()):
+            raise ValueError("Mengen in der Pickliste müssen größer als 0 sein!")
+        return self.change_stocks({tool_id: -qty for tool_id, qty in picks.items()})
+
+    def delete_ruestwerkzeug(self, tool_id: str) -> bool:
+        removed = [t for t in self.load_ruestwerkzeuge() if t.id == tool_id]
+        if not removed:
+            return False
+        with self.transaction(f"Rüstwerkzeug {removed[0].name} löschen") as tx:
+            for tool in removed:
+                tx.remove(tool)
+        return True
 
@@ -0,0 +1,131 @@
+"""
+Änderungs-Ereignisse des DataManagers.
+
+Statt nach jeder Änderung alle Seiten neu zu laden, veröffentlicht der
+DataManager typisierte Ereignisse. Seiten abonnieren die für sie relevanten
+Typen und wenden nur die Differenz an.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
+import logging
+
+from .modelle import Tool, Ruestwerkzeug
+
+logger = logging.getLogger(__name__)
+
+# Datensätze, für die eine eigene Generation gezählt wird
+DATASET_TOOLS = 'tools'
+DATASET_RUEST = 'ruest'
+
+
+class ChangeEvent:
+    """Basisklasse aller Ereignisse. `dataset` bestimmt die betroffene Generation."""
+    dataset: ClassVar[str] = DATASET_TOOLS
+
+
+@dataclass
+class ToolAdded(ChangeEvent):
+    tool: Tool
+
+
+@dataclass
+class ToolUpdated(ChangeEvent):
+    tool: Tool
+    # Feldname -> (alter Wert, neuer Wert)
+    changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+
+
+@dataclass
+class ToolRemoved(ChangeEvent):
+    tool: Tool
+
+
+@dataclass
+class AssignmentChanged(ChangeEvent):
+    """Ein Werkzeug wurde aus einem Werkzeugkasten in eine Maschine geladen oder entladen."""
+    tool: Tool
+    box: int
+    old_machine: str
+    new_machine: str
+
+
+@dataclass
+class RuestToolAdded(ChangeEvent):
+    dataset: ClassVar[str] = DATASET_RUEST
+    tool: Ruestwerkzeug
+
+
+@dataclass
+class RuestToolUpdated(ChangeEvent):
+    dataset: ClassVar[str] = DATASET_RUEST
+    tool: Ruestwerkzeug
+    changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+
+
+@dataclass
+class RuestToolRemoved(ChangeEvent):
+    dataset: ClassVar[str] = DATASET_RUEST
+    tool: Ruestwerkzeug
+
+
+@dataclass
+class StockChanged(ChangeEvent):
+    dataset: ClassVar[str] = DATASET_RUEST
+    tool: Ruestwerkzeug
+    old: int
+    new: int
+
+
+@dataclass
+class DatasetReloaded(ChangeEvent):
+    """Der komplette Datensatz wurde neu von der Platte gelesen - keine Differenz möglich."""
+    name: str
+
+    @property
+    def dataset(self):
+        return self.name
+
+
+Handler = Callable[[List[ChangeEvent]], None]
+
+
+class EventBus:
+    """
+    Einfacher synchroner Ereignis-Bus.
+
+    Ereignisse werden gebündelt veröffentlicht: jeder Abonnent wird pro
+    `publish`-Aufruf höchstens einmal mit allen für ihn passenden Ereignissen
+    aufgerufen. Pro Datensatz wird eine Generation hochgezählt, an der Seiten
+    erkennen, ob ihr Stand noch aktuell ist.
+    """
+
+    def __init__(self):
+        self._subscribers: List[Tuple[Handler, Optional[tuple]]] = []
+        self._generations: Dict[str, int] = {DATASET_TOOLS: 0, DATASET_RUEST: 0}
+
+    def subscribe(self, handler: Handler, *event_types):
+        """Registriert `handler` für die angegebenen Typen (ohne Angabe: alle)."""
+        self._subscribers.append((handler, tuple(event_types) or None))
+
+    def unsubscribe(self, handler: Handler):
+        self._subscribers = [(h, t) for h, t in self._subscribers if h != handler]
+
+    def generation(self, dataset: str) -> int:
+        return self._generations.get(dataset, 0)
+
+    def publish(self, *events: ChangeEvent):
+        if not events:
+            return
+
+        for dataset in {e.dataset for e in events}:
+            self._generations[dataset] = self._generations.get(dataset, 0) + 1
+
+        for handler, types in list(self._subscribers):
+            relevant = [e for e in events if types is None or isinstance(e, types)]
+            if not relevant:
+                continue
+            try:
+                handler(relevant)
+            except Exception as e:
+                logger.error(f"Error in event handler {handler}: {e}")
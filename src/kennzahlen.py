@@ -0,0 +1,175 @@
+"""
+Live-Kennzahlen für das Dashboard.
+
+DashboardCounters zählt Werkzeuge je Status, je Maschine und je
+Werkzeugkasten (in eine Maschine geladen) sowie Rüstwerkzeuge ohne
+Lagerplatz (K0/L0/F0). Die Zähler werden beim ersten Abruf einmal aus dem
+Cache aufgebaut und danach nur noch aus den Change-Events des DataManagers
+fortgeschrieben: für jedes betroffene Werkzeug wird sein bisheriger Beitrag
+abgezogen und der neue addiert.
+"""
+
+from typing import Any, Callable, Dict, List, Tuple
+
+from .modelle import Tool, Ruestwerkzeug
+from .ereignisse import (ChangeEvent, ToolAdded, ToolUpdated, ToolRemoved, AssignmentChanged,
+                         RuestToolAdded, RuestToolUpdated, RuestToolRemoved, DatasetReloaded,
+                         DATASET_TOOLS, DATASET_RUEST)
+
+BOXES = range(1, 5)
+
+# Beitrag eines Werkzeugs: (Status, ((Box, Maschine), ...) der geladenen Boxen)
+ToolKey = Tuple[str, Tuple[Tuple[int, str], ...]]
+
+
+def tool_key(tool: Tool) -> ToolKey:
+    loaded = tuple((box, tool.extra_data.get(f'Maschine_Box_{box}', '') or '')
+                   for box in BOXES if tool.extra_data.get(f'Status_Box_{box}') == 'maschine')
+    return tool.status, loaded
+
+
+def is_unassigned(tool: Ruestwerkzeug) -> bool:
+    """Rüstwerkzeug ohne Lagerplatz (K0/L0/F0)."""
+    return tool.kasten == 0 and tool.lade == 0 and tool.fach == 0
+
+
+def _count(counter: Dict[Any, int], key, n: int):
+    value = counter.get(key, 0) + n
+    if value:
+        counter[key] = value
+    else:
+        counter.pop(key, None)
+
+
+class DashboardCounters:
+    """Zähler für die Dashboard-Kacheln, fortgeschrieben aus den Change-Events."""
+
+    TOOL_EVENT_TYPES = (ToolAdded, ToolUpdated, ToolRemoved, AssignmentChanged)
+    RUEST_EVENT_TYPES = (RuestToolAdded, RuestToolUpdated, RuestToolRemoved)
+    EVENT_TYPES = TOOL_EVENT_TYPES + RUEST_EVENT_TYPES + (DatasetReloaded,)
+
+    def __init__(self, tools_source: Callable[[], List[Tool]],
+                 ruest_source: Callable[[], List[Ruestwerkzeug]]):
+        self._tools_source = tools_source
+        self._ruest_source = ruest_source
+
+        # id(Werkzeug) -> (Werkzeug, gezählter Beitrag); das Objekt wird
+        # mitgehalten, damit seine id nicht neu vergeben werden kann
+        self._tool_keys: Dict[int, Tuple[Tool, ToolKey]] = {}
+        self._per_status: Dict[str, int] = {}
+        self._per_machine: Dict[str, int] = {}
+        self._per_box: Dict[int, int] = {}
+        self._tools_built = False
+
+        self._ruest_unassigned: Dict[int, Ruestwerkzeug] = {}  # id -> Rüstwerkzeug auf K0/L0/F0
+        self._ruest_built = False
+
+    # --- Aufbauen ---
+
+    def rebuild_tools(self):
+        self._tool_keys, self._per_status, self._per_machine, self._per_box = {}, {}, {}, {}
+        for tool in self._tools_source():
+            self.update_tool(tool)
+        self._tools_built = True
+
+    def rebuild_ruest(self):
+        self._ruest_unassigned = {}
+        for tool in self._ruest_source():
+            self.update_ruest(tool)
+        self._ruest_built = True
+
+    # --- Fortschreiben ---
+
+    def _apply(self, key: ToolKey, n: int):
+        status, loaded = key
+        _count(self._per_status, status, n)
+        for box, machine in loaded:
+            _count(self._per_box, box, n)
+            _count(self._per_machine, machine, n)
+
+    def update_tool(self, tool: Tool):
+        """Zählt ein einzelnes Werkzeug neu (auch für neue Werkzeuge)."""
+        key = tool_key(tool)
+        old = self._tool_keys.get(id(tool))
+        if old is not None:
+            if old[1] == key:
+                return
+            self._apply(old[1], -1)
+        self._apply(key, 1)
+        self._tool_keys[id(tool)] = (tool, key)
+
+    def remove_tool(self, tool: Tool):
+        old = self._tool_keys.pop(id(tool), None)
+        if old is not None:
+            self._apply(old[1], -1)
+
+    def update_ruest(self, tool: Ruestwerkzeug):
+        if is_unassigned(tool):
+            self._ruest_unassigned[id(tool)] = tool
+        else:
+            self._ruest_unassigned.pop(id(tool), None)
+
+    def remove_ruest(self, tool: Ruestwerkzeug):
+        self._ruest_unassigned.pop(id(tool), None)
+
+    def on_events(self, events: List[ChangeEvent]):
+        """Handler für den EventBus des DataManagers."""
+        for event in events:
+            if isinstance(event, DatasetReloaded):
+                if event.dataset == DATASET_TOOLS and self._tools_built:
+                    self.rebuild_tools()
+                elif event.dataset == DATASET_RUEST and self._ruest_built:
+                    self.rebuild_ruest()
+            elif isinstance(event, self.TOOL_EVENT_TYPES):
+                if not self._tools_built:
+                    continue  # the first query builds from the current state anyway
+                if isinstance(event, ToolRemoved):
+                    self.remove_tool(event.tool)
+                else:
+                    self.update_tool(event.tool)
+            elif isinstance(event, self.RUEST_EVENT_TYPES) and self._ruest_built:
+                if isinstance(event, RuestToolRemoved):
+                    self.remove_ruest(event.tool)
+                else:
+                    self.update_ruest(event.tool)
+
+    # --- Abfragen ---
+
+    def _ensure_tools(self):
+        if not self._tools_built:
+            self.rebuild_tools()
+
+    def _ensure_ruest(self):
+        if not self._ruest_built:
+            self.rebuild_ruest()
+
+    @property
+    def tool_count(self) -> int:
+        self._ensure_tools()
+        return len(self._tool_keys)
+
+    def per_status(self) -> Dict[str, int]:
+        """Werkzeuge je Status (Hauptstatus), häufigster zuerst."""
+        self._ensure_tools()
+        return dict(sorted(self._per_status.items(), key=lambda item: -item[1]))
+
+    def per_machine(self) -> Dict[str, int]:
+        """In Maschinen geladene Werkzeuge (je Werkzeugkasten gezählt) je Maschine."""
+        self._ensure_tools()
+        return dict(sorted(self._per_machine.items()))
+
+    def per_box(self) -> Dict[int, int]:
+        """In eine Maschine geladene Werkzeuge je Werkzeugkasten 1-4."""
+        self._ensure_tools()
+        return {box: self._per_box.get(box, 0) for box in BOXES}
+
+    @property
+    def loaded_count(self) -> int:
+        self._ensure_tools()
+        return sum(self._per_box.values())
+
+    @property
+    def unassigned_ruest(self) -> int:
+        """Rüstwerkzeuge ohne Lagerplatz (K0/L0/F0)."""
+        self._ensure_ruest()
+        return len(self._ruest_unassigned)
@@ -8,9 +8,14 @@ from PySide6.QtWidgets import QApplication
 from src.daten_manager import DataManager
 from src.authentifizierung import AuthManager
 from src.oberflaeche.haupt_fenster import MainWindow
+from src.oberflaeche.icon_manager import icon_manager
 
 def main():
     app = QApplication(sys.argv)
+    app.setApplicationName("ToolBuddy")
+    
+    # Render icons for dashboard/sidebar into the disk cache in the background
+    icon_manager.prewarm()
     
     # Paths
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
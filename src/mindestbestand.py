@@ -0,0 +1,115 @@
+"""
+Überwachung des Mindestbestands von Rüstwerkzeugen.
+
+LowStockMonitor hält die Menge aller Werkzeuge mit Bestand <= MinBestand
+aktuell, ohne den Katalog zu durchsuchen: jedes Änderungs-Ereignis prüft
+nur das betroffene Werkzeug. Für die Reihenfolge nach Fehlmenge
+(MinBestand - Bestand) gibt es zusätzlich einen Heap mit verzögertem
+Löschen; veraltete Einträge werden beim Lesen übersprungen.
+"""
+
+import heapq
+import itertools
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .modelle import Ruestwerkzeug
+from .ereignisse import (ChangeEvent, RuestToolAdded, RuestToolUpdated, RuestToolRemoved, StockChanged,
+                         DatasetReloaded, DATASET_RUEST)
+
+
+def is_low(tool: Ruestwerkzeug) -> bool:
+    return tool.bestand <= tool.min_bestand
+
+
+def shortfall(tool: Ruestwerkzeug) -> int:
+    """Stück bis zum Mindestbestand (0 = genau auf Minimum)."""
+    return tool.min_bestand - tool.bestand
+
+
+class LowStockMonitor:
+    """Werkzeuge unter Mindestbestand, geordnet nach Fehlmenge."""
+
+    EVENT_TYPES = (RuestToolAdded, RuestToolUpdated, RuestToolRemoved, StockChanged, DatasetReloaded)
+
+    def __init__(self, source: Callable[[], List[Ruestwerkzeug]]):
+        self._source = source
+        self._low: Dict[str, Ruestwerkzeug] = {}  # ID -> Werkzeug
+        self._shortfall: Dict[str, int] = {}  # ID -> Fehlmenge des gültigen Heap-Eintrags
+        self._heap: List[Tuple[int, int, str]] = []  # (-Fehlmenge, Reihenfolge, ID)
+        self._seq = itertools.count()
+        self._built = False
+
+    def rebuild(self):
+        """Einmal über alle Werkzeuge (Start, Neuladen)."""
+        self._low, self._shortfall, self._heap = {}, {}, []
+        for tool in self._source():
+            self.update(tool)
+        self._built = True
+
+    def _ensure_built(self):
+        if not self._built:
+            self.rebuild()
+
+    def update(self, tool: Ruestwerkzeug):
+        """Prüft ein einzelnes Werkzeug neu."""
+        if not is_low(tool):
+            self.remove(tool)
+            return
+        self._low[tool.id] = tool
+        missing = shortfall(tool)
+        if self._shortfall.get(tool.id) != missing:
+            self._shortfall[tool.id] = missing
+            heapq.heappush(self._heap, (-missing, next(self._seq), tool.id))
+            self._compact()
+
+    def remove(self, tool: Ruestwerkzeug):
+        # Heap entry stays until it surfaces or the heap is compacted
+        self._low.pop(tool.id, None)
+        self._shortfall.pop(tool.id, None)
+
+    def on_events(self, events: List[ChangeEvent]):
+        """Handler für den EventBus des DataManagers."""
+        if not self._built:
+            return  # the first query builds from the current state anyway
+        for event in events:
+            if isinstance(event, DatasetReloaded):
+                if event.dataset == DATASET_RUEST:
+                    self.rebuild()
+            elif isinstance(event, RuestToolRemoved):
+                self.remove(event.tool)
+            else:
+                self.update(event.tool)
+
+    def _valid(self, entry) -> bool:
+        neg_missing, _, tool_id = entry
+        return self._shortfall.get(tool_id) == -neg_missing
+
+    def _compact(self):
+        if len(self._heap) > 2 * len(self._low) + 16:
+            self._heap = [e for e in self._heap if self._valid(e)]
+            heapq.heapify(self._heap)
+
+    # --- Abfragen ---
+
+    @property
+    def count(self) -> int:
+        self._ensure_built()
+        return len(self._low)
+
+    def __contains__(self, tool_id: str) -> bool:
+        self._ensure_built()
+        return tool_id in self._low
+
+    def most_urgent(self) -> Optional[Ruestwerkzeug]:
+        """Werkzeug mit der größten Fehlmenge."""
+        self._ensure_built()
+        while self._heap and not self._valid(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._low[self._heap[0][2]] if self._heap else None
+
+    def ordered(self, limit: Optional[int] = None) -> List[Ruestwerkzeug]:
+        """Werkzeuge unter Mindestbestand, größte Fehlmenge zuerst."""
+        self._ensure_built()
+        n = len(self._low) if limit is None else min(limit, len(self._low))
+        valid = (e for e in self._heap if self._valid(e))
+        return [self._low[tool_id] for _, _, tool_id in heapq.nsmallest(n, valid)]
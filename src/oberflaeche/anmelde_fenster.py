@@ -14,7 +14,7 @@ class LoginWindow(QDialog):
         
         title_label = QLabel("Willkommen")
         title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet("font-size: 18px; font-weight: bold; margin-bottom: 10px;")
+        title_label.setProperty("class", "login-title")
         layout.addWidget(title_label)
         
         self.username_input = QLineEdit()
@@ -1,4 +1,7 @@
 # Dialogs package
 from .werkzeug_details_dialog import ToolDetailsDialog
+from .auslastung_dialog import UtilisationDialog
+from .werkzeugsatz_dialog import ToolSetDialog
+from .mehrfach_bearbeiten_dialog import BulkEditDialog
 
-__all__ = ['ToolDetailsDialog']
+__all__ = ['ToolDetailsDialog', 'UtilisationDialog', 'ToolSetDialog', 'BulkEditDialog']
@@ -0,0 +1,117 @@
+from datetime import datetime
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton,
+                               QTabWidget, QTableWidget, QTableWidgetItem, QHeaderView)
+from PySide6.QtCore import Qt
+from ...daten_manager import DataManager
+
+
+class NumericItem(QTableWidgetItem):
+    """Sorts by the value in UserRole instead of the display text."""
+
+    def __lt__(self, other):
+        return self.data(Qt.UserRole) < other.data(Qt.UserRole)
+
+
+class UtilisationDialog(QDialog):
+    """Auslastung je Maschine und Werkzeug aus dem Belegungsverlauf (DataManager.utilisation)."""
+
+    PERIODS = [("7 Tage", 7), ("30 Tage", 30), ("90 Tage", 90), ("1 Jahr", 365)]
+
+    def __init__(self, data_manager: DataManager, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Auslastung")
+        self.resize(900, 650)
+        self.data_manager = data_manager
+
+        layout = QVBoxLayout(self)
+
+        period_layout = QHBoxLayout()
+        period_layout.addWidget(QLabel("Zeitraum:"))
+        self.period_combo = QComboBox()
+        for text, days in self.PERIODS:
+            self.period_combo.addItem(text, days)
+        self.period_combo.setCurrentIndex(1)
+        self.period_combo.currentIndexChanged.connect(self.refresh)
+        period_layout.addWidget(self.period_combo)
+        period_layout.addStretch()
+        layout.addLayout(period_layout)
+
+        self.hint = QLabel("")
+        self.hint.setProperty("class", "hint")
+        layout.addWidget(self.hint)
+
+        self.tabs = QTabWidget()
+        self.machine_table = self._make_table(["Maschine", "Zeit in Maschine (h)", "Ladevorgänge", "Zuletzt geladen"], 1)
+        self.tabs.addTab(self.machine_table, "Maschinen")
+        self.tool_table = self._make_table(["ID", "Name", "Zeit in Maschine (h)", "Ladevorgänge", "Zuletzt geladen"], 2)
+        self.tabs.addTab(self.tool_table, "Werkzeuge")
+        self.unused_table = self._make_table(["ID", "Name", "Zuletzt geladen"], 1, Qt.AscendingOrder)
+        self.tabs.addTab(self.unused_table, "Nie genutzt")
+        layout.addWidget(self.tabs)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        close_btn = QPushButton("Schließen")
+        close_btn.setMinimumWidth(120)
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+        self.refresh()
+
+    def _make_table(self, headers, sort_column, order=Qt.DescendingOrder):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        table.setSelectionBehavior(QTableWidget.SelectRows)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.verticalHeader().hide()
+        table.setAlternatingRowColors(True)
+        table.horizontalHeader().setSortIndicator(sort_column, order)
+        return table
+
+    @staticmethod
+    def _format_time(iso):
+        """Zelle mit Datum als Text und ISO-Zeitpunkt als Sortierschlüssel."""
+        return (datetime.fromisoformat(iso).strftime("%d.%m.%Y %H:%M") if iso else "–", iso)
+
+    def _fill(self, table, rows):
+        """rows: lists of str or (text, sort value) cells; numbers are right-aligned."""
+        table.setSortingEnabled(False)
+        table.setRowCount(len(rows))
+        for r, cells in enumerate(rows):
+            for c, cell in enumerate(cells):
+                if isinstance(cell, tuple):
+                    item = NumericItem(cell[0])
+                    item.setData(Qt.UserRole, cell[1])
+                    if not isinstance(cell[1], str):
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                else:
+                    item = QTableWidgetItem(cell)
+                table.setItem(r, c, item)
+        table.setSortingEnabled(True)
+
+    def refresh(self):
+        days = self.period_combo.currentData()
+        stats = self.data_manager.utilisation
+        report = stats.report(days)
+
+        machines = list(report.machines.items())
+        self._fill(self.machine_table, [
+            [machine, (f"{u.hours:.1f}", u.seconds), (str(u.loads), u.loads), self._format_time(u.last_load)]
+            for machine, u in machines])
+
+        tools = list(report.tools.items())
+        self._fill(self.tool_table, [
+            [tool_id, name, (f"{u.hours:.1f}", u.seconds), (str(u.loads), u.loads), self._format_time(u.last_load)]
+            for (tool_id, name), u in tools])
+
+        catalog = list(dict.fromkeys((t.id, t.name) for t in self.data_manager.load_tools()))
+        unused = stats.never_used(catalog, report)
+        self._fill(self.unused_table, [
+            [tool_id, name, self._format_time(stats.last_load((tool_id, name)))] for tool_id, name in unused])
+
+        self.hint.setText(f"{report.start:%d.%m.%Y} – {report.end:%d.%m.%Y}: "
+                          f"{len(machines)} Maschinen, {len(tools)} Werkzeuge genutzt, "
+                          f"{len(unused)} von {len(catalog)} Werkzeugen nie in einer Maschine")
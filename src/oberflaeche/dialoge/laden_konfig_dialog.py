@@ -48,7 +48,7 @@ class DrawerConfigDialog(QDialog):
         # Info Label
         self.info_label = QLabel("Gesamt Fächer: 24")
         self.info_label.setAlignment(Qt.AlignCenter)
-        self.info_label.setStyleSheet("color: #7F8C8D; font-style: italic;")
+        self.info_label.setProperty("class", "hint")
         layout.addWidget(self.info_label)
         
         # Connect spins to update info
@@ -61,7 +61,7 @@ class DrawerConfigDialog(QDialog):
         btn_layout = QHBoxLayout()
         save_btn = QPushButton("Speichern")
         save_btn.clicked.connect(self.save_settings)
-        save_btn.setStyleSheet("background-color: #27AE60; color: white; font-weight: bold; padding: 8px;")
+        save_btn.setProperty("class", "save-btn")
         
         close_btn = QPushButton("Schließen")
         close_btn.clicked.connect(self.accept)
@@ -0,0 +1,61 @@
+from collections import Counter
+from typing import Dict, List
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QFormLayout, QLabel, QComboBox, QDialogButtonBox)
+from ...daten_manager import DataManager, TOOL_STATUSES
+from ...modelle import Tool
+
+
+class BulkEditDialog(QDialog):
+    """Eine Spalte für mehrere Werkzeuge auf einen Wert setzen (DataManager.update_tools)."""
+
+    BOXES = [f"Werkzeugkasten {i}" for i in range(1, 5)]
+    EXCLUDED = ['WZ.Nr.', 'ID', 'Name', 'Status', 'Pos.', 'Lagerplatz']
+
+    def __init__(self, data_manager: DataManager, tools: List[Tool], parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"{len(tools)} Werkzeuge bearbeiten")
+        self.setMinimumWidth(500)
+        self.tools = tools
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+
+        self.field_combo = QComboBox()
+        fields = ["Status", "Herkunft_Kasten"] + [f for f in data_manager.fieldnames if f not in self.EXCLUDED]
+        self.field_combo.addItems(list(dict.fromkeys(fields)))
+        self.field_combo.currentTextChanged.connect(self.update_values)
+        form.addRow("Spalte:", self.field_combo)
+
+        self.value_combo = QComboBox()
+        self.value_combo.setEditable(True)
+        form.addRow("Neuer Wert:", self.value_combo)
+        layout.addLayout(form)
+
+        self.current_label = QLabel("")
+        self.current_label.setProperty("class", "hint")
+        self.current_label.setWordWrap(True)
+        layout.addWidget(self.current_label)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self.update_values(self.field_combo.currentText())
+
+    def _current(self, field) -> Counter:
+        if field == "Status":
+            return Counter(t.status for t in self.tools)
+        return Counter(t.extra_data.get(field, '') for t in self.tools)
+
+    def update_values(self, field):
+        current = self._current(field)
+        presets = list(TOOL_STATUSES) if field == "Status" else self.BOXES if field == "Herkunft_Kasten" else []
+        self.value_combo.clear()
+        self.value_combo.addItems(list(dict.fromkeys(presets + [v for v, _ in current.most_common() if v])))
+        shown = ", ".join(f"{v or '(leer)'} ({n})" for v, n in current.most_common(5))
+        more = len(current) - 5
+        self.current_label.setText(f"Aktuell: {shown}" + (f" und {more} weitere" if more > 0 else ""))
+
+    def get_values(self) -> Dict[str, str]:
+        return {self.field_combo.currentText(): self.value_combo.currentText().strip()}
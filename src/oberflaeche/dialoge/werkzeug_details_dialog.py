@@ -1,24 +1,34 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                                 QPushButton, QGroupBox, QGridLayout, QScrollArea, QWidget)
 from PySide6.QtCore import Qt
+from datetime import datetime, timedelta
 from ...modelle import Tool
+from ..stile import ModernStyles
+from .wiederverwendung import ReusableDialog
+
+class ToolDetailsDialog(ReusableDialog, QDialog):
+    HISTORY_DAYS = 30
+    BOX_KEYS = ({f'Status_Box_{i}' for i in range(1, 5)}
+                | {f'Maschine_Box_{i}' for i in range(1, 5)})  # shown in the machine group
 
-class ToolDetailsDialog(QDialog):
     def __init__(self, tool: Tool, parent=None):
         super().__init__(parent)
         self.tool = tool
-        self.setWindowTitle(f"Werkzeug Details - {tool.name}")
         self.setMinimumWidth(600)
         self.setMinimumHeight(500)
+        self._extra_rows = {}  # key -> (caption, value label)
+        self._extra_schema = None  # keys the extra rows were built for
         
         self.setup_ui()
+        self.bind(tool)
         
     def setup_ui(self):
+        """Builds the widget tree once; bind() fills it for a tool."""
         layout = QVBoxLayout()
         
         # Scroll Area for all content
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
+        self.scroll = QScrollArea()
+        self.scroll.setWidgetResizable(True)
         scroll_widget = QWidget()
         scroll_layout = QVBoxLayout(scroll_widget)
         
@@ -26,47 +36,21 @@ class ToolDetailsDialog(QDialog):
         basic_group = QGroupBox("Grundinformationen")
         basic_layout = QGridLayout()
         
-        row = 0
-        basic_layout.addWidget(QLabel("<b>WZ.Nr.:</b>"), row, 0)
-        basic_layout.addWidget(QLabel(self.tool.id), row, 1)
-        
-        row += 1
-        basic_layout.addWidget(QLabel("<b>Name:</b>"), row, 0)
-        basic_layout.addWidget(QLabel(self.tool.name), row, 1)
-        
-        row += 1
-        basic_layout.addWidget(QLabel("<b>Lagerplatz:</b>"), row, 0)
-        basic_layout.addWidget(QLabel(self.tool.lagerplatz or "Nicht angegeben"), row, 1)
-        
-        row += 1
-        basic_layout.addWidget(QLabel("<b>Hauptstatus:</b>"), row, 0)
-        status_label = QLabel(self._format_status(self.tool.status))
-        status_label.setStyleSheet(self._get_status_color(self.tool.status))
-        basic_layout.addWidget(status_label, row, 1)
-
-        # Rüstwerkzeug Location Check
-        if self.tool.status in ['Rüstwerkzeuge', 'RÜSTWERKZEUG']:
-            # We need to fetch the Ruestwerkzeug data. 
-            # Since we don't have direct access to DataManager here (passed as parent maybe?), 
-            # we should probably pass it or fetch it.
-            # Looking at DetailedSearchPage, it passes `self` as parent.
-            # DetailedSearchPage has `self.data_manager`.
-            
-            ruest_location = "Nicht gefunden"
-            if hasattr(self.parent(), 'data_manager'):
-                dm = self.parent().data_manager
-                ruest_tools = dm.load_ruestwerkzeuge()
-                # Find by ID
-                for rt in ruest_tools:
-                    if rt.id == self.tool.id:
-                        ruest_location = f"Kasten {rt.kasten} / Lade {rt.lade} / Fach {rt.fach} (Bestand: {rt.bestand})"
-                        break
-            
-            row += 1
-            basic_layout.addWidget(QLabel("<b>Rüst-Lagerort:</b>"), row, 0)
-            loc_label = QLabel(ruest_location)
-            loc_label.setStyleSheet("color: #E50914; font-weight: bold;")
-            basic_layout.addWidget(loc_label, row, 1)
+        self.id_value = QLabel()
+        self.name_value = QLabel()
+        self.lagerplatz_value = QLabel()
+        self.status_value = QLabel()
+        self.status_value.setProperty("class", "status-label")
+        self.ruest_caption = QLabel("<b>Rüst-Lagerort:</b>")
+        self.ruest_value = QLabel()
+        self.ruest_value.setProperty("class", "ruest-location")
+        rows = [("<b>WZ.Nr.:</b>", self.id_value), ("<b>Name:</b>", self.name_value),
+                ("<b>Lagerplatz:</b>", self.lagerplatz_value), ("<b>Hauptstatus:</b>", self.status_value)]
+        for row, (caption, value) in enumerate(rows):
+            basic_layout.addWidget(QLabel(caption), row, 0)
+            basic_layout.addWidget(value, row, 1)
+        basic_layout.addWidget(self.ruest_caption, len(rows), 0)
+        basic_layout.addWidget(self.ruest_value, len(rows), 1)
         
         basic_group.setLayout(basic_layout)
         scroll_layout.addWidget(basic_group)
@@ -75,55 +59,31 @@ class ToolDetailsDialog(QDialog):
         machine_group = QGroupBox("Maschinenzuordnung")
         machine_layout = QVBoxLayout()
         
-        has_machine = False
-        for i in range(1, 5):
-            machine_key = f'Maschine_Box_{i}'
-            status_key = f'Status_Box_{i}'
-            
-            if machine_key in self.tool.extra_data and self.tool.extra_data[machine_key]:
-                has_machine = True
-                machine_name = self.tool.extra_data[machine_key]
-                box_status = self.tool.extra_data.get(status_key, 'unbekannt')
-                
-                machine_info = QHBoxLayout()
-                machine_info.addWidget(QLabel(f"<b>Werkzeugkasten {i}:</b>"))
-                machine_info.addWidget(QLabel(f"🔧 {machine_name}"))
-                machine_info.addWidget(QLabel(f"({self._format_status(box_status)})"))
-                machine_info.addStretch()
-                
-                machine_layout.addLayout(machine_info)
-        
-        if not has_machine:
-            machine_layout.addWidget(QLabel("Keine Maschinenzuordnung vorhanden"))
+        self.box_labels = [QLabel() for _ in range(4)]
+        for label in self.box_labels:
+            machine_layout.addWidget(label)
+        self.no_machine_label = QLabel("Keine Maschinenzuordnung vorhanden")
+        machine_layout.addWidget(self.no_machine_label)
+        
+        # Where the tool has been recently (assignment history)
+        self.history_title = QLabel(f"<b>Verlauf ({self.HISTORY_DAYS} Tage):</b>")
+        self.history_label = QLabel()
+        machine_layout.addWidget(self.history_title)
+        machine_layout.addWidget(self.history_label)
         
         machine_group.setLayout(machine_layout)
         scroll_layout.addWidget(machine_group)
         
         # === Additional Data ===
-        if self.tool.extra_data:
-            extra_group = QGroupBox("Zusätzliche Informationen")
-            extra_layout = QGridLayout()
-            
-            row = 0
-            # Filter out the status and machine keys we already displayed
-            excluded_keys = {f'Status_Box_{i}' for i in range(1, 5)}
-            excluded_keys.update({f'Maschine_Box_{i}' for i in range(1, 5)})
-            
-            for key, value in sorted(self.tool.extra_data.items()):
-                if key not in excluded_keys and value:  # Only show non-empty values
-                    extra_layout.addWidget(QLabel(f"<b>{key}:</b>"), row, 0)
-                    extra_layout.addWidget(QLabel(str(value)), row, 1)
-                    row += 1
-            
-            if row == 0:
-                extra_layout.addWidget(QLabel("Keine zusätzlichen Informationen"), 0, 0)
-            
-            extra_group.setLayout(extra_layout)
-            scroll_layout.addWidget(extra_group)
+        self.extra_group = QGroupBox("Zusätzliche Informationen")
+        self.extra_layout = QGridLayout()
+        self.no_extra_label = QLabel("Keine zusätzlichen Informationen")
+        self.extra_group.setLayout(self.extra_layout)
+        scroll_layout.addWidget(self.extra_group)
         
         scroll_layout.addStretch()
-        scroll.setWidget(scroll_widget)
-        layout.addWidget(scroll)
+        self.scroll.setWidget(scroll_widget)
+        layout.addWidget(self.scroll)
         
         # === Close Button ===
         button_layout = QHBoxLayout()
@@ -137,6 +97,86 @@ class ToolDetailsDialog(QDialog):
         layout.addLayout(button_layout)
         self.setLayout(layout)
     
+    def bind(self, tool: Tool):
+        """Zeigt `tool` in den vorhandenen Widgets an."""
+        self.tool = tool
+        self.setWindowTitle(f"Werkzeug Details - {tool.name}")
+        dm = getattr(self.parent(), 'data_manager', None)
+        
+        self.id_value.setText(tool.id)
+        self.name_value.setText(tool.name)
+        self.lagerplatz_value.setText(tool.lagerplatz or "Nicht angegeben")
+        self.status_value.setText(self._format_status(tool.status))
+        ModernStyles.set_state(self.status_value, tool.status)
+        
+        # Rüstwerkzeug Location Check (the parent page has the DataManager)
+        is_ruest = tool.status in ['Rüstwerkzeuge', 'RÜSTWERKZEUG']
+        if is_ruest:
+            ruest_location = "Nicht gefunden"
+            if dm is not None:
+                rt = next((rt for rt in dm.load_ruestwerkzeuge() if rt.id == tool.id), None)
+                if rt:
+                    ruest_location = f"Kasten {rt.kasten} / Lade {rt.lade} / Fach {rt.fach} (Bestand: {rt.bestand})"
+            self.ruest_value.setText(ruest_location)
+        self.ruest_caption.setVisible(is_ruest)
+        self.ruest_value.setVisible(is_ruest)
+        
+        # Machine assignment per box
+        has_machine = False
+        for i, label in enumerate(self.box_labels, start=1):
+            machine_name = tool.extra_data.get(f'Maschine_Box_{i}')
+            if machine_name:
+                has_machine = True
+                box_status = tool.extra_data.get(f'Status_Box_{i}', 'unbekannt')
+                label.setText(f"<b>Werkzeugkasten {i}:</b>  🔧 {machine_name}  ({self._format_status(box_status)})")
+            label.setVisible(bool(machine_name))
+        self.no_machine_label.setVisible(not has_machine)
+        
+        stays = []
+        if dm is not None:
+            now = datetime.now()
+            stays = dm.assignments.tool_history(tool.id, now - timedelta(days=self.HISTORY_DAYS), now)
+        self.history_label.setText("\n".join(
+            f"Werkzeugkasten {stay.box}: 🔧 {stay.machine}  "
+            f"{self._format_time(stay.start, 'früher')} – {self._format_time(stay.end, 'heute')}"
+            for stay in reversed(stays)))
+        self.history_title.setVisible(bool(stays))
+        self.history_label.setVisible(bool(stays))
+        
+        # Additional data: rows only rebuilt when the set of keys changes
+        self._build_extra_rows(tuple(sorted(k for k in tool.extra_data if k not in self.BOX_KEYS)))
+        shown = 0
+        for key, (caption, value_label) in self._extra_rows.items():
+            value = tool.extra_data.get(key)
+            value_label.setText(str(value) if value else "")
+            caption.setVisible(bool(value))  # Only show non-empty values
+            value_label.setVisible(bool(value))
+            shown += bool(value)
+        self.no_extra_label.setVisible(shown == 0)
+        self.extra_group.setVisible(bool(tool.extra_data))
+        
+        self.scroll.verticalScrollBar().setValue(0)
+    
+    def _build_extra_rows(self, keys):
+        if keys == self._extra_schema:
+            return
+        self._extra_schema = keys
+        for caption, value_label in self._extra_rows.values():
+            for widget in (caption, value_label):
+                self.extra_layout.removeWidget(widget)
+                widget.hide()  # deleteLater only runs once back in the event loop
+                widget.deleteLater()
+        self._extra_rows = {}
+        self.extra_layout.addWidget(self.no_extra_label, 0, 0)
+        for row, key in enumerate(keys, start=1):
+            caption, value_label = QLabel(f"<b>{key}:</b>"), QLabel()
+            self.extra_layout.addWidget(caption, row, 0)
+            self.extra_layout.addWidget(value_label, row, 1)
+            self._extra_rows[key] = (caption, value_label)
+    
+    def _format_time(self, iso, missing="?"):
+        return datetime.fromisoformat(iso).strftime("%d.%m. %H:%M") if iso else missing
+    
     def _format_status(self, status: str) -> str:
         """Format status for display"""
         status_map = {
@@ -146,16 +186,3 @@ class ToolDetailsDialog(QDialog):
             'frei': 'FREI'
         }
         return status_map.get(status, status.upper())
-    
-    def _get_status_color(self, status: str) -> str:
-        """Get color styling for status"""
-        if status in ['maschine', 'MASCHIENE']:
-            return "color: #00C7FC; font-weight: bold;"  # COLOR-3
-        elif status in ['gerüstet', 'GERÜSTET']:
-            return "color: #00CBF6; font-weight: bold;"  # COLOR-2
-        elif status in ['Rüstwerkzeuge', 'RÜSTWERKZEUG']:
-            return "color: #58ACFF; font-weight: bold;"  # COLOR-4
-        elif status == 'frei':
-            return "color: #00BAC4; font-weight: bold;"  # COLOR-1
-        else:
-            return "color: #ffffff;"
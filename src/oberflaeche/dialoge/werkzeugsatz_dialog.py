@@ -0,0 +1,167 @@
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem,
+                               QPushButton, QInputDialog, QMessageBox, QGroupBox)
+from PySide6.QtGui import QColor
+from PySide6.QtCore import Qt
+from ...daten_manager import DataManager
+from ...werkzeugsaetze import ToolSet, loaded_tools
+from ..stile import ModernStyles
+from ..komponenten.benachrichtigung import notify
+
+
+class ToolSetDialog(QDialog):
+    """
+    Werkzeugsätze für eine Maschine und einen Werkzeugkasten: aktuelle
+    Belegung als Satz speichern, Satz auswählen, Differenz ansehen und
+    mit einem Klick übernehmen (DataManager.apply_tool_set).
+    """
+
+    def __init__(self, data_manager: DataManager, machine: str, box: int, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Werkzeugsätze – {machine}, Werkzeugkasten {box}")
+        self.resize(900, 600)
+        self.data_manager = data_manager
+        self.machine = machine
+        self.box = box
+
+        layout = QVBoxLayout(self)
+        content = QHBoxLayout()
+
+        # --- Sets ---
+        sets_group = QGroupBox("Sätze")
+        sets_layout = QVBoxLayout(sets_group)
+        self.set_list = QListWidget()
+        self.set_list.setProperty("class", "touch-list")
+        self.set_list.currentItemChanged.connect(self.update_preview)
+        sets_layout.addWidget(self.set_list)
+
+        save_btn = QPushButton("Belegung als Satz speichern…")
+        save_btn.setProperty("class", "dialog-btn")
+        save_btn.clicked.connect(self.save_current)
+        sets_layout.addWidget(save_btn)
+
+        self.delete_btn = QPushButton("Satz löschen")
+        self.delete_btn.setProperty("class", "danger-btn")
+        self.delete_btn.clicked.connect(self.delete_selected)
+        sets_layout.addWidget(self.delete_btn)
+        content.addWidget(sets_group, 40)
+
+        # --- Preview ---
+        preview_group = QGroupBox("Vorschau")
+        preview_layout = QVBoxLayout(preview_group)
+        self.summary = QLabel("")
+        self.summary.setProperty("class", "hint")
+        self.summary.setWordWrap(True)
+        preview_layout.addWidget(self.summary)
+        self.preview_list = QListWidget()
+        self.preview_list.setSelectionMode(QListWidget.NoSelection)
+        preview_layout.addWidget(self.preview_list)
+        content.addWidget(preview_group, 60)
+
+        layout.addLayout(content)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.apply_btn = QPushButton("Satz laden")
+        self.apply_btn.setProperty("class", "save-btn")
+        self.apply_btn.setMinimumWidth(160)
+        self.apply_btn.clicked.connect(self.apply_selected)
+        button_layout.addWidget(self.apply_btn)
+        close_btn = QPushButton("Schließen")
+        close_btn.setMinimumWidth(120)
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+        self.refresh_sets()
+
+    def selected_set(self):
+        item = self.set_list.currentItem()
+        if item is None:
+            return None
+        return self.data_manager.tool_sets.get(self.machine, self.box, item.data(Qt.UserRole))
+
+    def refresh_sets(self, select: str = None):
+        current = select or (self.set_list.currentItem().data(Qt.UserRole) if self.set_list.currentItem() else None)
+        self.set_list.blockSignals(True)
+        self.set_list.clear()
+        for tool_set in self.data_manager.tool_sets.sets(self.machine, self.box):
+            item = QListWidgetItem(f"{tool_set.name}  ({len(tool_set.tools)})")
+            item.setData(Qt.UserRole, tool_set.name)
+            self.set_list.addItem(item)
+            if tool_set.name == current:
+                self.set_list.setCurrentItem(item)
+        if self.set_list.currentItem() is None and self.set_list.count():
+            self.set_list.setCurrentRow(0)
+        self.set_list.blockSignals(False)
+        self.update_preview()
+
+    def update_preview(self, *_):
+        self.preview_list.clear()
+        tool_set = self.selected_set()
+        self.delete_btn.setEnabled(tool_set is not None)
+        if tool_set is None:
+            self.summary.setText("Noch kein Satz für diese Maschine und diesen Werkzeugkasten gespeichert.")
+            self.apply_btn.setEnabled(False)
+            return
+
+        diff = self.data_manager.tool_set_diff(tool_set)
+        rows = ([("+", f"{t.name} laden", ModernStyles.COLOR_SUCCESS) for t in diff.load]
+                + [("−", f"{t.name} entladen", ModernStyles.COLOR_DANGER) for t in diff.unload]
+                + [("!", f"{name} ({tool_id}): {reason}", "#F39C12") for tool_id, name, reason in diff.missing]
+                + [("=", f"{t.name} bleibt", ModernStyles.COLOR_TEXT) for t in diff.keep])
+        for sign, text, color in rows:
+            item = QListWidgetItem(f"{sign}  {text}")
+            item.setForeground(QColor(color))
+            self.preview_list.addItem(item)
+
+        summary = (f"{len(diff.load)} laden, {len(diff.unload)} entladen, {len(diff.keep)} bleiben"
+                   + (f", {len(diff.missing)} nicht verfügbar" if diff.missing else ""))
+        self.summary.setText(summary if not diff.empty else f"Belegung entspricht bereits dem Satz ({summary}).")
+        self.apply_btn.setEnabled(not diff.empty)
+
+    def save_current(self):
+        current = loaded_tools(self.data_manager.load_tools(), self.machine, self.box)
+        if not current:
+            QMessageBox.warning(self, "Fehler", f"Aus Werkzeugkasten {self.box} ist nichts in {self.machine} geladen.")
+            return
+        name, ok = QInputDialog.getText(self, "Satz speichern",
+                                        f"Name für die {len(current)} Werkzeuge in {self.machine}:")
+        if not ok:
+            return
+        name = name.strip()
+        if self.data_manager.tool_sets.get(self.machine, self.box, name):
+            if QMessageBox.question(self, "Überschreiben", f"Satz '{name}' überschreiben?") != QMessageBox.Yes:
+                return
+        try:
+            self.data_manager.tool_sets.save(
+                ToolSet(name, self.machine, self.box, [(t.id, t.name) for t in current]))
+        except (ValueError, OSError) as e:
+            QMessageBox.warning(self, "Fehler", str(e))
+            return
+        self.refresh_sets(select=name)
+
+    def delete_selected(self):
+        tool_set = self.selected_set()
+        if tool_set is None:
+            return
+        if QMessageBox.question(self, "Löschen", f"Satz '{tool_set.name}' löschen?") != QMessageBox.Yes:
+            return
+        try:
+            self.data_manager.tool_sets.delete(*tool_set.key)
+        except OSError as e:
+            QMessageBox.warning(self, "Fehler", str(e))
+        self.refresh_sets()
+
+    def apply_selected(self):
+        tool_set = self.selected_set()
+        if tool_set is None:
+            return
+        try:
+            diff = self.data_manager.apply_tool_set(tool_set)
+        except (ValueError, OSError) as e:
+            notify(self, str(e), "error")
+            self.update_preview()
+            return
+        notify(self.parent() or self, f"Werkzeugsatz {tool_set.name}: {len(diff.load)} geladen, "
+                                      f"{len(diff.unload)} entladen")
+        self.accept()
@@ -0,0 +1,22 @@
+class ReusableDialog:
+    """
+    Mixin für Dialoge, die oft für wechselnde Werkzeuge geöffnet werden:
+    `reuse(owner, tool, ...)` baut den Dialog nur beim ersten Aufruf je
+    Besitzer (Seite) und stellt ihn danach per `bind(tool, ...)` um, statt
+    den ganzen Widget-Baum neu zu erzeugen.
+
+    Unterklassen definieren `bind(tool, **kwargs)`: es nimmt dieselben
+    Schlüsselwortargumente wie der Konstruktor und zeigt `tool` in den
+    vorhandenen Widgets an. Kein abc.ABC, weil dessen Metaklasse nicht mit
+    der von QDialog kombiniert werden kann.
+    """
+
+    @classmethod
+    def reuse(cls, owner, tool=None, **kwargs):
+        pool = owner.__dict__.setdefault('_dialog_pool', {})
+        dialog = pool.get(cls)
+        if dialog is None:
+            dialog = pool[cls] = cls(parent=owner, tool=tool, **kwargs)
+        else:
+            dialog.bind(tool, **kwargs)
+        return dialog
@@ -1,9 +1,15 @@
-
 from PySide6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QStackedWidget
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QKeySequence, QShortcut
 from src.oberflaeche.stile import ModernStyles
 from src.oberflaeche.komponenten.seitenleiste import Sidebar
 from src.oberflaeche.komponenten.uebersicht import Dashboard
 from src.oberflaeche.komponenten.werkzeugleiste import Toolbar
+from src.oberflaeche.komponenten.benachrichtigung import ToastOverlay
+from src.oberflaeche.start_lader import StartupLoader
+from src.mindestbestand import LowStockMonitor
+from src.kennzahlen import DashboardCounters
+from src.ereignisse import DatasetReloaded
 
 # Import Pages
 from src.oberflaeche.seiten.werkzeugkasten_seite import ToolboxPage
@@ -16,103 +22,227 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.setWindowTitle("ToolBuddy")
         self.resize(1800, 860)
-        
+
         self.data_manager = data_manager
         self.auth_manager = auth_manager
-        
+
         # Apply Global Styles
         self.setStyleSheet(ModernStyles.get_stylesheet())
-        
+
         # Central Widget
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
-        
+
         # Main Layout (Vertical: Content + Toolbar)
         main_layout = QVBoxLayout(central_widget)
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.setSpacing(0)
-        
+
         # Content Layout (Horizontal: Sidebar + Stack)
         content_layout = QHBoxLayout()
         content_layout.setContentsMargins(0, 0, 0, 0)
         content_layout.setSpacing(0)
-        
+
         # Sidebar
         self.sidebar = Sidebar(self.auth_manager)
         self.sidebar.page_selected.connect(self.switch_page)
         self.sidebar.login_changed.connect(self.on_login_changed)
         content_layout.addWidget(self.sidebar)
-        
+
         # Stacked Widget for Pages
         self.stack = QStackedWidget()
         content_layout.addWidget(self.stack)
-        
+
         # --- Initialize Pages ---
-        
-        # 0. Dashboard
+
+        # Dashboard is built immediately, all other pages on first use
+        # (or in idle time after the first frame) so that startup does not
+        # depend on catalogue size.
         self.dashboard = Dashboard()
         self.dashboard.page_selected.connect(self.switch_page)
+        self.dashboard.badge_selected.connect(self.on_badge_selected)
         self.stack.addWidget(self.dashboard)
-        
-        # 1. Werkzeugkasten (ToolboxPage)
-        self.toolbox_page = ToolboxPage(self.data_manager, self.auth_manager)
-        self.stack.addWidget(self.toolbox_page)
-        
-        # 2. Rüstwerkzeug (RuestwerkzeugPage)
-        self.ruestwerkzeug_page = RuestwerkzeugPage(self.data_manager, self.auth_manager)
-        self.stack.addWidget(self.ruestwerkzeug_page)
-        
-        # 3. Admin (AdminPage)
-        self.admin_page = AdminPage(self.data_manager, self.auth_manager, parent_window=self)
-        self.stack.addWidget(self.admin_page)
-        
-        # 4. Suche (DetailedSearchPage)
-        self.search_page = DetailedSearchPage(self.data_manager)
-        self.stack.addWidget(self.search_page)
-        
+
+        self._page_factories = {
+            "Werkzeugkasten": lambda: ToolboxPage(self.data_manager, self.auth_manager),
+            "Rüstwerkzeug": lambda: RuestwerkzeugPage(self.data_manager, self.auth_manager),
+            "Admin": lambda: AdminPage(self.data_manager, self.auth_manager, parent_window=self),
+            "Suche": lambda: DetailedSearchPage(self.data_manager),
+        }
+        self._pages = {}
+        self._idle_queue = list(self._page_factories)
+
         # Add Content to Main Layout
         main_layout.addLayout(content_layout)
-        
+
         # Toolbar (Bottom)
         self.toolbar = Toolbar()
+        self.toolbar.undo_requested.connect(self.undo)
+        self.toolbar.redo_requested.connect(self.redo)
         main_layout.addWidget(self.toolbar)
-        
+        # Text fields keep their own Ctrl+Z (they claim it via ShortcutOverride)
+        QShortcut(QKeySequence.Undo, self, activated=self.undo)
+        QShortcut(QKeySequence.Redo, self, activated=self.redo)
+
+        # Non-modal notifications over the bottom-right corner of the pages
+        self.toasts = ToastOverlay(self, anchor=self.stack, history=self.data_manager.history)
+        self.toasts.undo_requested.connect(self.undo)
+
+        # Every committed change (or undo/redo) publishes events
+        self.data_manager.events.subscribe(self.update_history_buttons)
+
+        # Parse all data files concurrently; tiles activate as their data
+        # arrives and the remaining pages are built once everything is cached
+        self.loader = StartupLoader(self.data_manager, self)
+        self.loader.progress.connect(self.dashboard.set_progress)
+        self.loader.page_ready.connect(self.dashboard.set_page_ready)
+        self.loader.page_ready.connect(self.on_page_data_ready)
+        self.loader.finished.connect(self.schedule_idle_build)
+        self.dashboard.begin_loading(self.loader.total)
+        self.loader.start()
+
+    def on_page_data_ready(self, page_name):
+        events = self.data_manager.events
+        if page_name == "Werkzeugkasten":
+            # Tile numbers follow the incrementally kept counters from now on
+            events.subscribe(self.update_tool_counters, *DashboardCounters.TOOL_EVENT_TYPES, DatasetReloaded)
+            self.update_tool_counters()
+        elif page_name == "Rüstwerkzeug":
+            # Badge follows the low-stock monitor from now on
+            events.subscribe(self.update_low_stock_badge, *LowStockMonitor.EVENT_TYPES)
+            events.subscribe(self.update_ruest_counters, *DashboardCounters.RUEST_EVENT_TYPES, DatasetReloaded)
+            self.update_low_stock_badge()
+            self.update_ruest_counters()
+
+    def update_tool_counters(self, events=None):
+        counters = self.data_manager.counters
+        per_box = counters.per_box()
+        per_machine = counters.per_machine()
+        machines = "\n".join(f"{machine or 'ohne Maschine'}: {n}" for machine, n in per_machine.items())
+        self.dashboard.set_info(
+            "Werkzeugkasten",
+            f"{counters.loaded_count} in Maschinen\n" + " · ".join(f"K{box} {n}" for box, n in per_box.items()),
+            f"Je Maschine:\n{machines}" if machines else "Keine Werkzeuge in Maschinen")
+
+        per_status = counters.per_status()
+        statuses = [f"{n} {status or 'ohne Status'}" for status, n in per_status.items()]
+        self.dashboard.set_info(
+            "Admin",
+            # Tile is too narrow for all statuses: most frequent one, the rest in the tooltip
+            f"{counters.tool_count} Werkzeuge\n" + (statuses[0] if statuses else ""),
+            "Je Status:\n" + "\n".join(statuses))
+
+    def update_ruest_counters(self, events=None):
+        count = self.data_manager.counters.unassigned_ruest
+        self.dashboard.set_info("Rüstwerkzeug", f"{count} ohne Lagerplatz" if count else "",
+                                "Rüstwerkzeuge auf K0/L0/F0")
+
+    def update_low_stock_badge(self, events=None):
+        count = self.data_manager.low_stock.count
+        self.dashboard.set_badge("Rüstwerkzeug", count, f"{count} Rüstwerkzeuge auf oder unter Mindestbestand")
+
+    def on_badge_selected(self, page_name):
+        if page_name == "Rüstwerkzeug":
+            self.switch_page(page_name)
+            self.ruestwerkzeug_page.show_low_stock()
+        else:
+            self.switch_page(page_name)
+
+    def update_history_buttons(self, events=None):
+        history = self.data_manager.history
+        undo, redo = history.next_undo(), history.next_redo()
+        self.toolbar.set_history(undo.label if undo else None, redo.label if redo else None)
+        self.toasts.update_undo_buttons()
+
+    def undo(self, entries=None):
+        """Letzte Änderung, oder genau `entries` (Rückgängig eines Toasts)."""
+        self._run_history(lambda: self.data_manager.undo(entries), "Rückgängig")
+
+    def redo(self):
+        self._run_history(self.data_manager.redo, "Wiederholen")
+
+    def _run_history(self, action, name):
+        try:
+            label = action()
+        except ValueError as e:
+            self.toasts.show_toast(str(e), "error")
+            return
+        except Exception as e:
+            self.toasts.show_toast(f"{name} fehlgeschlagen: {e}", "error")
+            return
+        finally:
+            self.update_history_buttons()
+        if label is not None:
+            self.toasts.show_toast(f"{name}: {label}", "info")
+
+    def schedule_idle_build(self):
+        QTimer.singleShot(0, self._build_next_idle_page)
+
+    def _build_next_idle_page(self):
+        """Builds and renders one pending page per event loop turn."""
+        while self._idle_queue:
+            page_name = self._idle_queue.pop(0)
+            if page_name not in self._pages:
+                page = self.get_page(page_name)
+                if page_name != "Admin" or self.auth_manager.is_admin():
+                    page.refresh_data()
+                break
+        if self._idle_queue:
+            self.schedule_idle_build()
+
+    def get_page(self, page_name):
+        """Returns the page, constructing it on first access."""
+        page = self._pages.get(page_name)
+        if page is None:
+            page = self._page_factories[page_name]()
+            self._pages[page_name] = page
+            self.stack.addWidget(page)
+        return page
+
+    @property
+    def toolbox_page(self):
+        return self.get_page("Werkzeugkasten")
+
+    @property
+    def ruestwerkzeug_page(self):
+        return self.get_page("Rüstwerkzeug")
+
+    @property
+    def admin_page(self):
+        return self.get_page("Admin")
+
+    @property
+    def search_page(self):
+        return self.get_page("Suche")
+
     def switch_page(self, page_name):
         """Switch the stacked widget to the requested page."""
         if page_name == "Dashboard":
-            self.stack.setCurrentIndex(0)
-        elif page_name == "Werkzeugkasten":
-            self.toolbox_page.refresh_data()
-            self.stack.setCurrentIndex(1)
-        elif page_name == "Rüstwerkzeug":
-            self.ruestwerkzeug_page.refresh_data()
-            self.stack.setCurrentIndex(2)
+            self.stack.setCurrentWidget(self.dashboard)
         elif page_name == "Admin":
             # Check if user has permission to access admin page
             if self.auth_manager.is_admin():
                 self.admin_page.refresh_data()
-                self.stack.setCurrentIndex(3)
+                self.stack.setCurrentWidget(self.admin_page)
             else:
                 # Show error message
-                from PySide6.QtWidgets import QMessageBox
-                QMessageBox.warning(self, "Zugriff verweigert", 
-                    "Sie haben keine Berechtigung für den Admin-Bereich!\n\n"
-                    "Bitte melden Sie sich als Administrator an.")
+                self.toasts.show_toast(
+                    "Keine Berechtigung für den Admin-Bereich. "
+                    "Bitte melden Sie sich als Administrator an.", "error")
                 # Stay on current page
-        elif page_name == "Suche":
-            self.search_page.refresh_data()
-            self.stack.setCurrentIndex(4)
-            
+        elif page_name in self._page_factories:
+            page = self.get_page(page_name)
+            page.refresh_data()
+            self.stack.setCurrentWidget(page)
+
     def on_login_changed(self):
         """Handle login status changes - update page access."""
         # If user logs out or changes, go back to dashboard
-        self.stack.setCurrentIndex(0)
+        self.stack.setCurrentWidget(self.dashboard)
         # Refresh all pages with new user context
         self.refresh_all()
-    
+
     def refresh_all(self):
-        """Refresh all pages data."""
-        self.toolbox_page.refresh_data()
-        self.ruestwerkzeug_page.refresh_data()
-        self.admin_page.refresh_data()
-        self.search_page.refresh_data()
+        """Refresh all built pages. Pages whose data generation is current skip the reload."""
+        for page in self._pages.values():
+            page.refresh_data()
@@ -1,38 +1,60 @@
 """
 Icon-Manager für die gesamte Anwendung.
 Lädt und cached SVG-Icons für konsistente Verwendung.
+
+Gerenderte Icons werden zusätzlich als PNG auf der Platte abgelegt
+(Schlüssel: SVG-Hash, Größe, Pixel-Ratio), damit ein Neustart nicht erneut
+rastern muss. Der Speicher-Cache ist nach Bytes begrenzt (LRU).
 """
 
-from PySide6.QtGui import QPixmap, QIcon
+from PySide6.QtGui import QPixmap, QIcon, QGuiApplication
 from PySide6.QtSvg import QSvgRenderer
 from PySide6.QtGui import QPainter, QImage
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QStandardPaths, QCoreApplication
+from collections import OrderedDict
+import hashlib
+import logging
 import os
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
 
 class IconManager:
     """Zentraler Manager für alle Icons in der Anwendung."""
-    
+
     _instance = None
-    _icons_cache = {}
-    
+
+    # Speicher-Budget für gerenderte Pixmaps (Bytes)
+    MEMORY_BUDGET = 4 * 1024 * 1024
+
+    # Größen, die Dashboard (80), ToolboxPage (64) und Seitenleiste (24) verwenden
+    PREWARM_SIZES = {
+        'werkzeugkasten': (80, 64, 24),
+        'ruestwerkzeug': (80, 24),
+        'admin': (80, 24),
+        'suche': (80, 24),
+        'maschine': (64,),
+    }
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(IconManager, cls).__new__(cls)
             cls._instance._initialized = False
         return cls._instance
-    
+
     def __init__(self):
         if self._initialized:
             return
-        
+
         self._initialized = True
-        
+
         # Basis-Pfad für Icons ermitteln
         # Von src/oberflaeche/... aus gesehen
         current_file = os.path.abspath(__file__)
         src_dir = os.path.dirname(os.path.dirname(current_file))
         self.icons_dir = os.path.join(os.path.dirname(src_dir), "icons")
-        
+
         # Verfügbare Icons
         self.icon_files = {
             'werkzeugkasten': 'werkzeugkasten.svg',
@@ -41,68 +63,181 @@ class IconManager:
             'suche': 'suche.svg',
             'maschine': 'maschine.svg',
         }
-    
-    def get_pixmap(self, icon_name: str, size: int = 64) -> QPixmap:
+
+        # (name, size, dpr) -> QPixmap, nur im GUI-Thread benutzt
+        self._icons_cache = OrderedDict()
+        self._cache_bytes = 0
+
+        # Ein Renderer und ein Hash pro SVG; Rendern ist per Lock serialisiert,
+        # da auch der Prewarm-Thread rendert
+        self._renderers = {}
+        self._svg_hashes = {}
+        self._render_lock = threading.Lock()
+
+        # Prewarm-Thread; wird bei aboutToQuit abgebrochen und eingeholt
+        self._prewarm_thread = None
+        self._prewarm_stop = threading.Event()
+
+        self._disk_cache_dir = None
+
+    @property
+    def disk_cache_dir(self) -> str:
+        if self._disk_cache_dir is None:
+            base = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+            if not base:
+                base = os.path.join(tempfile.gettempdir(), "ToolBuddy")
+            self._disk_cache_dir = os.path.join(base, "icon_cache")
+            os.makedirs(self._disk_cache_dir, exist_ok=True)
+        return self._disk_cache_dir
+
+    def _default_dpr(self) -> float:
+        screen = QGuiApplication.primaryScreen() if QGuiApplication.instance() else None
+        return screen.devicePixelRatio() if screen else 1.0
+
+    def _svg_hash(self, icon_path: str) -> str:
+        digest = self._svg_hashes.get(icon_path)
+        if digest is None:
+            with open(icon_path, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()[:16]
+            self._svg_hashes[icon_path] = digest
+        return digest
+
+    def _icon_path(self, icon_name: str):
+        if icon_name not in self.icon_files:
+            return None
+        icon_path = os.path.join(self.icons_dir, self.icon_files[icon_name])
+        return icon_path if os.path.exists(icon_path) else None
+
+    def _render_image(self, icon_name: str, size: int, dpr: float) -> QImage:
+        """
+        Liefert das Icon als QImage: aus dem Platten-Cache oder frisch gerendert
+        (und dann auf der Platte abgelegt). Thread-sicher.
+        """
+        icon_path = self._icon_path(icon_name)
+        if icon_path is None:
+            return QImage()
+
+        with self._render_lock:
+            cache_file = os.path.join(
+                self.disk_cache_dir, f"{icon_name}_{self._svg_hash(icon_path)}_{size}@{dpr:g}x.png")
+
+            image = QImage()
+            if os.path.exists(cache_file) and image.load(cache_file):
+                return image
+
+            renderer = self._renderers.get(icon_path)
+            if renderer is None:
+                renderer = QSvgRenderer(icon_path)
+                self._renderers[icon_path] = renderer
+
+            px = max(1, round(size * dpr))
+            image = QImage(px, px, QImage.Format_ARGB32_Premultiplied)
+            image.fill(0x00000000)  # Transparent
+
+            painter = QPainter(image)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            renderer.render(painter)
+            painter.end()
+
+            # Atomar ablegen, damit kein halbes PNG gelesen wird
+            tmp_file = cache_file + ".tmp"
+            if image.save(tmp_file, "PNG"):
+                try:
+                    os.replace(tmp_file, cache_file)
+                except OSError as e:
+                    logger.error(f"Error writing icon cache {cache_file}: {e}")
+            return image
+
+    def get_pixmap(self, icon_name: str, size: int = 64, dpr: float = None) -> QPixmap:
         """
         Lädt ein Icon als QPixmap in der gewünschten Größe.
-        
+
         Args:
             icon_name: Name des Icons (z.B. 'werkzeugkasten')
-            size: Größe in Pixeln (quadratisch)
-            
+            size: Größe in logischen Pixeln (quadratisch)
+            dpr: Device-Pixel-Ratio, Standard: Primärbildschirm
+
         Returns:
             QPixmap des Icons oder leeres Pixmap bei Fehler
         """
-        cache_key = f"{icon_name}_{size}"
-        
+        if dpr is None:
+            dpr = self._default_dpr()
+        cache_key = (icon_name, size, dpr)
+
         # Aus Cache laden wenn vorhanden
-        if cache_key in self._icons_cache:
-            return self._icons_cache[cache_key]
-        
-        # Icon-Datei ermitteln
-        if icon_name not in self.icon_files:
-            return QPixmap()
-        
-        icon_path = os.path.join(self.icons_dir, self.icon_files[icon_name])
-        
-        # SVG laden und rendern
-        if not os.path.exists(icon_path):
+        pixmap = self._icons_cache.get(cache_key)
+        if pixmap is not None:
+            self._icons_cache.move_to_end(cache_key)
+            return pixmap
+
+        image = self._render_image(icon_name, size, dpr)
+        if image.isNull():
             return QPixmap()
-        
-        renderer = QSvgRenderer(icon_path)
-        image = QImage(size, size, QImage.Format_ARGB32)
-        image.fill(0x00000000)  # Transparent
-        
-        painter = QPainter(image)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform)
-        renderer.render(painter)
-        painter.end()
-        
+
         pixmap = QPixmap.fromImage(image)
-        
-        # Im Cache speichern
+        pixmap.setDevicePixelRatio(dpr)
+
+        # Im Cache speichern, älteste Einträge über Budget verdrängen
         self._icons_cache[cache_key] = pixmap
-        
+        self._cache_bytes += self._pixmap_bytes(pixmap)
+        while self._cache_bytes > self.MEMORY_BUDGET and len(self._icons_cache) > 1:
+            _, old = self._icons_cache.popitem(last=False)
+            self._cache_bytes -= self._pixmap_bytes(old)
+
         return pixmap
-    
+
+    @staticmethod
+    def _pixmap_bytes(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * 4
+
     def get_icon(self, icon_name: str, size: int = 64) -> QIcon:
         """
         Lädt ein Icon als QIcon.
-        
+
         Args:
             icon_name: Name des Icons
             size: Größe in Pixeln
-            
+
         Returns:
             QIcon des Icons
         """
         pixmap = self.get_pixmap(icon_name, size)
         return QIcon(pixmap)
-    
+
+    def prewarm(self):
+        """
+        Rendert alle beim Start benötigten Größen auf einem Worker-Thread in den
+        Platten-Cache, damit die GUI sie nur noch laden muss.
+        """
+        if self._prewarm_thread is not None and self._prewarm_thread.is_alive():
+            return
+        dpr = self._default_dpr()
+
+        def run():
+            for icon_name, sizes in self.PREWARM_SIZES.items():
+                for size in sizes:
+                    if self._prewarm_stop.is_set():
+                        return
+                    self._render_image(icon_name, size, dpr)
+
+        self._prewarm_stop.clear()
+        self._prewarm_thread = threading.Thread(target=run, name="IconPrewarm")
+        self._prewarm_thread.start()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop_prewarm)
+
+    def stop_prewarm(self):
+        """Bricht das Vorrendern ab und wartet auf den Worker."""
+        self._prewarm_stop.set()
+        if self._prewarm_thread is not None:
+            self._prewarm_thread.join()
+
     def clear_cache(self):
-        """Leert den Icon-Cache."""
+        """Leert den Icon-Cache (nur Speicher, der Platten-Cache bleibt gültig)."""
         self._icons_cache.clear()
+        self._cache_bytes = 0
 
 
 # Singleton-Instanz für einfachen Zugriff
@@ -0,0 +1,216 @@
+"""
+Nicht-modale Benachrichtigungen (Toasts).
+
+Häufige Aktionen (Entnehmen, Zurückgeben, Anlegen, ...) melden sich über
+einen kurzen Hinweis unten rechts statt über eine QMessageBox. Gleiche
+Meldungen werden zusammengefasst ("3× DEPO-D35R6 entnommen"), überzählige
+warten in einer Warteschlange, und eine Meldung kann ihre Änderung
+rückgängig machen: sie hält die UndoEntries ihrer Transaktionen und nimmt
+sie über DataManager.undo zurück, solange sie oben auf dem Stapel liegen.
+Modale Dialoge bleiben für destruktive Bestätigungen.
+"""
+
+from PySide6.QtWidgets import QWidget, QFrame, QLabel, QPushButton, QHBoxLayout, QVBoxLayout, QMessageBox
+from PySide6.QtCore import Qt, QTimer, QEvent, QPoint, Signal
+
+LEVELS = ("info", "success", "error")
+
+
+class Toast(QFrame):
+    """Eine einzelne Meldung; zählt zusammengefasste Wiederholungen."""
+
+    def __init__(self, overlay, text, level="info", key=None, undo=None, duration=None):
+        super().__init__(overlay)
+        self.overlay = overlay
+        self.text = text
+        self.key = key
+        self.count = 1
+        self.undo_entries = [entry for entry in undo or [] if entry is not None]
+        self.duration = duration or (ToastOverlay.UNDO_DURATION_MS if self.undo_entries else ToastOverlay.DURATION_MS)
+
+        self.setProperty("class", "toast")
+        self.setProperty("state", level)
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(16, 10, 10, 10)
+        layout.setSpacing(12)
+
+        self.label = QLabel()
+        self.label.setProperty("class", "toast-text")
+        self.label.setWordWrap(True)
+        layout.addWidget(self.label, 1)
+
+        self.undo_btn = QPushButton("Rückgängig")
+        self.undo_btn.setProperty("class", "toast-action")
+        self.undo_btn.setCursor(Qt.PointingHandCursor)
+        self.undo_btn.clicked.connect(self.run_undo)
+        self.undo_btn.setVisible(bool(self.undo_entries))
+        layout.addWidget(self.undo_btn)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(lambda: self.overlay.dismiss(self))
+
+        self.update_text()
+        self.update_undo_button()
+
+    def update_text(self):
+        # Keyed toasts show how often the action was coalesced
+        self.label.setText(f"{self.count}× {self.text}" if self.key is not None else self.text)
+
+    def update_undo_button(self):
+        """Rückgängig nur, solange keine andere Änderung darüber liegt."""
+        self.undo_btn.setEnabled(self.overlay.can_undo(self.undo_entries))
+
+    def coalesce(self, undo=None):
+        self.count += 1
+        entries = [entry for entry in undo or [] if entry is not None]
+        if entries:
+            self.undo_entries.extend(entries)
+            self.undo_btn.show()
+        self.update_text()
+        self.update_undo_button()
+        if self.timer.isActive():
+            self.timer.start(self.duration)
+
+    def start(self):
+        self.timer.start(self.duration)
+
+    def run_undo(self):
+        """Nimmt alle zusammengefassten Änderungen gemeinsam zurück."""
+        entries, self.undo_entries = self.undo_entries, []
+        self.overlay.dismiss(self)
+        self.overlay.undo_requested.emit(entries)
+
+
+class ToastOverlay(QWidget):
+    """
+    Stapel von Toasts über der rechten unteren Ecke von `anchor`.
+    Höchstens MAX_VISIBLE Toasts sind sichtbar, der Rest wird eingereiht.
+    Rückgängig eines Toasts meldet `undo_requested(entries)`; ob es noch
+    möglich ist, entscheidet `history` (UndoStack).
+    """
+
+    undo_requested = Signal(object)  # List[UndoEntry], älteste zuerst
+
+    MAX_VISIBLE = 3
+    DURATION_MS = 3000
+    UNDO_DURATION_MS = 6000
+    MARGIN = 20
+    WIDTH = 420
+
+    def __init__(self, parent, anchor=None, history=None):
+        super().__init__(parent)
+        self.anchor = anchor or parent
+        self.history = history
+        self.visible_toasts = []
+        self.queue = []
+
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.layout.setSpacing(8)
+        self.layout.setAlignment(Qt.AlignBottom)
+
+        self.anchor.installEventFilter(self)
+        self.hide()
+
+    def eventFilter(self, obj, event):
+        if obj is self.anchor and event.type() in (QEvent.Resize, QEvent.Move, QEvent.Show):
+            self.reposition()
+        return False
+
+    def show_toast(self, text, level="info", key=None, undo=None, duration=None):
+        """
+        Zeigt eine Meldung an. Mit `key` werden gleiche Meldungen, die noch
+        sichtbar oder eingereiht sind, zu einer zusammengefasst.
+        `undo` sind die UndoEntries der gemeldeten Änderung.
+        """
+        if level not in LEVELS:
+            level = "info"
+
+        if key is not None:
+            for toast in self.visible_toasts + self.queue:
+                if toast.key == key:
+                    toast.coalesce(undo)
+                    self.reposition()
+                    return toast
+
+        toast = Toast(self, text, level, key, undo, duration)
+        toast.hide()
+        if len(self.visible_toasts) < self.MAX_VISIBLE:
+            self._show(toast)
+        else:
+            self.queue.append(toast)
+        return toast
+
+    def can_undo(self, entries):
+        return bool(entries) and self.history is not None and self.history.is_top(entries)
+
+    def update_undo_buttons(self):
+        """Nach jeder Änderung, Rückgängig oder Wiederholen."""
+        for toast in self.visible_toasts + self.queue:
+            toast.update_undo_button()
+
+    def _show(self, toast):
+        self.visible_toasts.append(toast)
+        self.layout.addWidget(toast)
+        toast.show()
+        toast.start()
+        self.show()
+        self.raise_()
+        self.reposition()
+
+    def dismiss(self, toast):
+        if toast in self.queue:
+            self.queue.remove(toast)
+        elif toast in self.visible_toasts:
+            self.visible_toasts.remove(toast)
+            self.layout.removeWidget(toast)
+            toast.timer.stop()
+            if self.queue:
+                self._show(self.queue.pop(0))
+        toast.hide()
+        toast.deleteLater()
+
+        if not self.visible_toasts:
+            self.hide()
+        else:
+            self.reposition()
+
+    def reposition(self):
+        if not self.visible_toasts:
+            return
+        self.setFixedWidth(self.WIDTH)
+        self.adjustSize()
+        corner = QPoint(self.anchor.width(), self.anchor.height())
+        if self.anchor is not self.parentWidget():
+            corner = self.anchor.mapTo(self.parentWidget(), corner)
+        self.move(corner.x() - self.width() - self.MARGIN,
+                  corner.y() - self.height() - self.MARGIN)
+
+
+def find_overlay(widget):
+    """Sucht das ToastOverlay des Fensters (auch von Dialogen aus über deren Eltern)."""
+    while widget is not None:
+        window = widget.window()
+        overlay = getattr(window, "toasts", None)
+        if isinstance(overlay, ToastOverlay):
+            return overlay
+        widget = window.parentWidget()
+    return None
+
+
+def notify(widget, text, level="success", key=None, undo=None):
+    """
+    Meldet `text` als Toast im Fenster von `widget`. Ohne Overlay (z.B.
+    eigenständiger Dialog) wird auf eine QMessageBox zurückgefallen.
+    """
+    overlay = find_overlay(widget)
+    if overlay is not None:
+        return overlay.show_toast(text, level, key, undo)
+
+    if level == "error":
+        QMessageBox.warning(widget, "Fehler", text)
+    else:
+        QMessageBox.information(widget, "Info", text)
+    return None
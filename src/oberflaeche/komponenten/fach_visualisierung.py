@@ -1,9 +1,20 @@
+from collections import OrderedDict
 from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import Qt, QRectF
-from PySide6.QtGui import QPainter, QColor, QPen, QLinearGradient
+from PySide6.QtGui import QPainter, QColor, QPen, QLinearGradient, QPixmap
+
+MARGIN = 10
+COMP_GAP = 4
+
 
 class FachVisualization(QWidget):
     """Compact compartment visualization widget for displaying drawer compartments"""
+
+    # Rendered empty grids shared by all instances:
+    # (rows, cols, cells, fixed, width, height, dpr) -> QPixmap
+    _grid_cache = OrderedDict()
+    GRID_CACHE_SIZE = 32
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumHeight(200)
@@ -11,157 +22,186 @@ class FachVisualization(QWidget):
         self.max_faecher = 6
         self.grid_rows = 0
         self.grid_cols = 0
-        
+
     def set_compartment(self, fach, max_faecher=6, rows=0, cols=0):
         """
         Set the active compartment to highlight.
         If rows and cols are provided (>0), a fixed grid is used.
         Otherwise, a dynamic grid based on max_faecher is calculated.
         """
+        same_grid = (self.active_fach >= 0 and self.max_faecher == max_faecher
+                     and self.grid_rows == rows and self.grid_cols == cols)
+        old_fach = self.active_fach
+
         self.active_fach = fach
         self.max_faecher = max_faecher
         self.grid_rows = rows
         self.grid_cols = cols
-        self.update()
-        
+
+        if same_grid:
+            # Same drawer: only the old and the new highlight change
+            for f in (old_fach, fach):
+                rect = self.cell_rect(f)
+                if rect is not None:
+                    self.update(rect.adjusted(-2, -2, 2, 2).toAlignedRect())
+        else:
+            self.update()
+
     def clear(self):
         """Clear the visualization"""
         self.active_fach = -1
         self.update()
-    
-    def paintEvent(self, event):
-        if self.active_fach < 0:
-            return
-            
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        w = self.width()
-        h = self.height()
-        
-        # Margins
-        margin = 10
-        comp_area_w = w - 2 * margin
-        comp_area_h = h - 2 * margin
-        
+
+    def prefetch(self, max_faecher=6, rows=0, cols=0):
+        """Render the empty grid of another drawer into the cache without showing it."""
+        if self.width() > 0 and self.height() > 0:
+            self.grid_pixmap(self.layout_for(max_faecher, rows, cols))
+
+    def grid_layout(self):
+        """Returns (rows, cols, cells, fixed) for the current configuration."""
+        return self.layout_for(self.max_faecher, self.grid_rows, self.grid_cols)
+
+    @staticmethod
+    def layout_for(max_faecher, grid_rows=0, grid_cols=0):
+        """Returns (rows, cols, cells, fixed) for a drawer configuration."""
         # Determine Grid Layout
-        if self.grid_rows > 0 and self.grid_cols > 0:
-            rows = self.grid_rows
-            cols = self.grid_cols
-            total_cells = rows * cols
+        if grid_rows > 0 and grid_cols > 0:
+            return grid_rows, grid_cols, grid_rows * grid_cols, True
+
+        # Dynamic fallback
+        if max_faecher <= 3:
+            cols = max_faecher
+            rows = 1
+        elif max_faecher <= 6:
+            cols = 3
+            rows = 2
+        elif max_faecher <= 9:
+            cols = 3
+            rows = 3
+        elif max_faecher <= 12:
+            cols = 4
+            rows = 3
         else:
-            # Dynamic fallback
-            if self.max_faecher <= 3:
-                cols = self.max_faecher
-                rows = 1
-            elif self.max_faecher <= 6:
-                cols = 3
-                rows = 2
-            elif self.max_faecher <= 9:
-                cols = 3
-                rows = 3
-            elif self.max_faecher <= 12:
-                cols = 4
-                rows = 3
-            else:
-                cols = 4
-                rows = (self.max_faecher + 3) // 4
-            total_cells = self.max_faecher
-        
-        comp_gap = 4
-        
-        single_comp_w = (comp_area_w - (cols - 1) * comp_gap) / cols
-        single_comp_h = (comp_area_h - (rows - 1) * comp_gap) / rows
-        
-        # Draw compartments
-        # If using fixed grid, we draw all cells up to rows*cols
-        # If dynamic, we draw up to max_faecher
-        
-        limit = total_cells if (self.grid_rows > 0) else self.max_faecher
-        
-        for i in range(limit):
-            # Calculate logical number (1-based)
-            fach_num = i + 1
-            
-            # Calculate position (row, col)
-            if self.grid_rows > 0:
-                # Fixed Grid: Front-Left (1) -> Back-Right (Max)
-                # Visual Layout:
-                # Row 0 (Top)    : ... Max
-                # ...
-                # Row N (Bottom) : 1 ...
-                #
-                # We want 1 at Bottom-Left.
-                # So we fill from Bottom-Left to Right, then Up.
-                # Or Bottom-Left to Up, then Right?
-                # "links vorne mit 1 begonnen und bis rechts hinten sich steigern"
-                # Usually implies reading order, but starting at front-left.
-                # Let's assume Row-Major from Bottom-Left.
-                
-                # Logical Index (0 to total-1)
-                # Row index from bottom (0 is bottom, rows-1 is top)
-                row_from_bottom = i // cols
-                col_index = i % cols
-                
-                # Visual Row (0 is top)
-                row = (rows - 1) - row_from_bottom
-                col = col_index
-                
-            else:
-                # Dynamic: Standard Top-Left to Bottom-Right
-                row = i // cols
-                col = i % cols
-            
-            comp_cx = margin + col * (single_comp_w + comp_gap)
-            comp_cy = margin + row * (single_comp_h + comp_gap)
-            
-            is_active = (self.active_fach == fach_num)
-            
-            # Compartment background
-            if is_active:
-                # Highlighted active compartment
-                comp_grad = QLinearGradient(comp_cx, comp_cy, comp_cx, comp_cy + single_comp_h)
-                comp_grad.setColorAt(0, QColor(255, 120, 20))
-                comp_grad.setColorAt(0.5, QColor(255, 80, 0))
-                comp_grad.setColorAt(1, QColor(200, 50, 0))
-                painter.setBrush(comp_grad)
-                painter.setPen(QPen(QColor(255, 200, 0), 3))
-            else:
-                # Darker compartments
-                comp_grad = QLinearGradient(comp_cx, comp_cy, comp_cx, comp_cy + single_comp_h)
-                comp_grad.setColorAt(0, QColor(50, 60, 70))
-                comp_grad.setColorAt(1, QColor(30, 35, 40))
-                painter.setBrush(comp_grad)
-                painter.setPen(QPen(QColor(90, 100, 110), 1))
-            
-            painter.drawRoundedRect(int(comp_cx), int(comp_cy), 
-                                  int(single_comp_w), int(single_comp_h), 4, 4)
-            
-            # Compartment number
-            painter.setPen(QColor("#FFFFFF"))
-            font = painter.font()
-            if is_active:
-                font.setPointSize(20)
-                font.setBold(True)
-            else:
-                font.setPointSize(12)
-                font.setBold(False)
-            painter.setFont(font)
-            painter.drawText(QRectF(comp_cx, comp_cy, single_comp_w, single_comp_h), 
-                           Qt.AlignCenter, str(fach_num))
-        
+            cols = 4
+            rows = (max_faecher + 3) // 4
+        return rows, cols, max_faecher, False
+
+    def cell_rect(self, fach_num, layout=None):
+        """Rectangle of compartment `fach_num` (1-based) or None if it is not drawn."""
+        rows, cols, cells, fixed = layout or self.grid_layout()
+        if cols <= 0 or not 1 <= fach_num <= cells:
+            return None
+
+        comp_area_w = self.width() - 2 * MARGIN
+        comp_area_h = self.height() - 2 * MARGIN
+        single_comp_w = (comp_area_w - (cols - 1) * COMP_GAP) / cols
+        single_comp_h = (comp_area_h - (rows - 1) * COMP_GAP) / rows
+
+        i = fach_num - 1
+        if fixed:
+            # Fixed Grid: Front-Left (1) -> Back-Right (Max)
+            # "links vorne mit 1 begonnen und bis rechts hinten sich steigern"
+            # Row-Major from Bottom-Left: row 0 is the top (back) row.
+            row_from_bottom = i // cols
+            row = (rows - 1) - row_from_bottom
+            col = i % cols
+        else:
+            # Dynamic: Standard Top-Left to Bottom-Right
+            row = i // cols
+            col = i % cols
+
+        comp_cx = MARGIN + col * (single_comp_w + COMP_GAP)
+        comp_cy = MARGIN + row * (single_comp_h + COMP_GAP)
+        return QRectF(comp_cx, comp_cy, single_comp_w, single_comp_h)
+
+    def grid_pixmap(self, layout=None):
+        """The empty grid (no highlight), rendered once per layout, size and DPR."""
+        layout = layout or self.grid_layout()
+        rows, cols, cells, fixed = layout
+        dpr = self.devicePixelRatioF()
+        key = (rows, cols, cells, fixed, self.width(), self.height(), dpr)
+
+        cache = FachVisualization._grid_cache
+        pixmap = cache.get(key)
+        if pixmap is not None:
+            cache.move_to_end(key)
+            return pixmap
+
+        pixmap = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        for fach_num in range(1, cells + 1):
+            self.draw_compartment(painter, fach_num, False, layout)
+
         # Draw "Vorne" / "Hinten" labels if fixed grid to help orientation
-        if self.grid_rows > 0:
+        if fixed:
             painter.setPen(QColor("#7F8C8D"))
             font = painter.font()
             font.setPointSize(10)
             font.setBold(True)
             painter.setFont(font)
-            
+
             # "Vorne" (Front) label at the bottom
-            painter.drawText(QRectF(0, h - margin + 2, w, margin), Qt.AlignCenter, "VORNE (GRIFF)")
-            
-            # "Hinten" (Back) label at the top
-            # painter.drawText(QRectF(0, 0, w, margin), Qt.AlignCenter, "HINTEN")
-        
+            painter.drawText(QRectF(0, self.height() - MARGIN + 2, self.width(), MARGIN),
+                             Qt.AlignCenter, "VORNE (GRIFF)")
+        painter.end()
+
+        cache[key] = pixmap
+        if len(cache) > self.GRID_CACHE_SIZE:
+            cache.popitem(last=False)
+        return pixmap
+
+    def draw_compartment(self, painter, fach_num, is_active, layout=None):
+        rect = self.cell_rect(fach_num, layout)
+        if rect is None:
+            return
+        comp_cx, comp_cy = rect.x(), rect.y()
+        single_comp_w, single_comp_h = rect.width(), rect.height()
+
+        # Compartment background
+        if is_active:
+            # Highlighted active compartment
+            comp_grad = QLinearGradient(comp_cx, comp_cy, comp_cx, comp_cy + single_comp_h)
+            comp_grad.setColorAt(0, QColor(255, 120, 20))
+            comp_grad.setColorAt(0.5, QColor(255, 80, 0))
+            comp_grad.setColorAt(1, QColor(200, 50, 0))
+            painter.setBrush(comp_grad)
+            painter.setPen(QPen(QColor(255, 200, 0), 3))
+        else:
+            # Darker compartments
+            comp_grad = QLinearGradient(comp_cx, comp_cy, comp_cx, comp_cy + single_comp_h)
+            comp_grad.setColorAt(0, QColor(50, 60, 70))
+            comp_grad.setColorAt(1, QColor(30, 35, 40))
+            painter.setBrush(comp_grad)
+            painter.setPen(QPen(QColor(90, 100, 110), 1))
+
+        painter.drawRoundedRect(int(comp_cx), int(comp_cy),
+                                int(single_comp_w), int(single_comp_h), 4, 4)
+
+        # Compartment number
+        painter.setPen(QColor("#FFFFFF"))
+        font = painter.font()
+        if is_active:
+            font.setPointSize(20)
+            font.setBold(True)
+        else:
+            font.setPointSize(12)
+            font.setBold(False)
+        painter.setFont(font)
+        painter.drawText(rect, Qt.AlignCenter, str(fach_num))
+
+    def paintEvent(self, event):
+        if self.active_fach < 0:
+            return
+
+        painter = QPainter(self)
+        painter.setClipRect(event.rect())
+        painter.drawPixmap(0, 0, self.grid_pixmap())
+
+        # Overlay only the highlighted compartment
+        painter.setRenderHint(QPainter.Antialiasing)
+        self.draw_compartment(painter, self.active_fach, True)
         painter.setPen(Qt.NoPen)
@@ -0,0 +1,102 @@
+"""
+Vorgerenderte Schlagschatten.
+
+QGraphicsDropShadowEffect weichzeichnet bei jedem Neuzeichnen des Widgets
+(Hover, Resize, ...) offscreen. Hier wird der Schatten pro Größe nur einmal
+weichgezeichnet, als QPixmap gecacht und vom Eltern-Widget unter das Kind
+geblittet. Verwendbar für Kacheln und andere Karten-Widgets (#card).
+"""
+
+from collections import OrderedDict
+from PySide6.QtWidgets import QWidget, QGraphicsScene, QGraphicsPixmapItem, QGraphicsBlurEffect
+from PySide6.QtCore import Qt, QRectF, QPointF
+from PySide6.QtGui import QPainter, QPixmap, QImage, QColor
+
+# (width, height, radius, blur, rgba, dpr) -> (QPixmap, padding)
+_shadow_cache = OrderedDict()
+SHADOW_CACHE_SIZE = 32
+
+
+def shadow_pixmap(width, height, radius=12, blur=15, color=QColor(0, 0, 0), dpr=1.0):
+    """
+    Weichgezeichneter Schatten einer abgerundeten Fläche width x height.
+    Liefert (pixmap, padding): die Pixmap ist um `padding` nach allen Seiten
+    größer als die Fläche, damit die Unschärfe Platz hat.
+    """
+    color = QColor(color)
+    key = (width, height, radius, blur, color.rgba(), dpr)
+    cached = _shadow_cache.get(key)
+    if cached is not None:
+        _shadow_cache.move_to_end(key)
+        return cached
+
+    padding = blur
+    full_w = width + 2 * padding
+    full_h = height + 2 * padding
+
+    # Scharfe Silhouette
+    mask = QImage(int(full_w * dpr), int(full_h * dpr), QImage.Format_ARGB32_Premultiplied)
+    mask.setDevicePixelRatio(dpr)
+    mask.fill(Qt.transparent)
+    painter = QPainter(mask)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(color)
+    painter.drawRoundedRect(QRectF(padding, padding, width, height), radius, radius)
+    painter.end()
+
+    # Einmalig weichzeichnen (gleicher Blur wie QGraphicsDropShadowEffect)
+    scene = QGraphicsScene()
+    item = QGraphicsPixmapItem(QPixmap.fromImage(mask))
+    effect = QGraphicsBlurEffect()
+    effect.setBlurRadius(blur * dpr)
+    effect.setBlurHints(QGraphicsBlurEffect.QualityHint)
+    item.setGraphicsEffect(effect)
+    scene.addItem(item)
+
+    target = QRectF(0, 0, full_w * dpr, full_h * dpr)
+    blurred = QImage(int(target.width()), int(target.height()), QImage.Format_ARGB32_Premultiplied)
+    blurred.fill(Qt.transparent)
+    painter = QPainter(blurred)
+    scene.render(painter, target, target)
+    painter.end()
+
+    pixmap = QPixmap.fromImage(blurred)
+    pixmap.setDevicePixelRatio(dpr)
+
+    _shadow_cache[key] = (pixmap, padding)
+    if len(_shadow_cache) > SHADOW_CACHE_SIZE:
+        _shadow_cache.popitem(last=False)
+    return pixmap, padding
+
+
+class ShadowContainer(QWidget):
+    """
+    Container, der unter registrierten Kind-Widgets einen gecachten Schatten
+    zeichnet. Die Kinder selbst brauchen keinen Grafikeffekt mehr.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._shadows = {}  # child -> (radius, blur, offset, color)
+
+    def add_shadow(self, widget, radius=12, blur=15, offset=(0, 4), color=Qt.black):
+        self._shadows[widget] = (radius, blur, QPointF(*offset), QColor(color))
+        widget.destroyed.connect(lambda _=None, w=widget: self._shadows.pop(w, None))
+        self.update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._shadows:
+            return
+
+        painter = QPainter(self)
+        dpr = self.devicePixelRatioF()
+        for widget, (radius, blur, offset, color) in self._shadows.items():
+            if not widget.isVisible():
+                continue
+            geo = widget.geometry()
+            pixmap, padding = shadow_pixmap(geo.width(), geo.height(), radius, blur, color, dpr)
+            pos = QPointF(geo.topLeft()) + offset - QPointF(padding, padding)
+            if event.rect().intersects(QRectF(pos, pixmap.deviceIndependentSize()).toAlignedRect()):
+                painter.drawPixmap(pos, pixmap)
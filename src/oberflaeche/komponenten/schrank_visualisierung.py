@@ -1,6 +1,14 @@
 from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import Qt, QRectF, QPropertyAnimation, Property, QEasingCurve, QSize
-from PySide6.QtGui import QPainter, QColor, QBrush, QPen, QLinearGradient, QFont
+from PySide6.QtGui import QPainter, QColor, QBrush, QPen, QLinearGradient, QFont, QPixmap
+
+# Geometry shared by the static layer and the animated drawer
+MARGIN = 20
+SPACING = 40
+NUM_DRAWERS = 15
+DRAWER_GAP = 2
+OPEN_DISTANCE = 50
+SHADOW_DEPTH = 8
 
 class CabinetVisualization(QWidget):
     def __init__(self, parent=None):
@@ -10,6 +18,11 @@ class CabinetVisualization(QWidget):
         self.active_lade = -1
         self._open_factor = 0.0
         
+        # Pre-rendered cabinets with all closed drawers. Only the active
+        # drawer is painted per animation frame on top of this pixmap.
+        self._static_cache = None
+        self._static_key = None
+        
         # Animation for drawer opening
         self._animation = QPropertyAnimation(self, b"open_factor", self)
         self._animation.setDuration(600)
@@ -19,8 +32,19 @@ class CabinetVisualization(QWidget):
         return self._open_factor
 
     def set_open_factor(self, value):
+        old_offset = OPEN_DISTANCE * self._open_factor
         self._open_factor = value
-        self.update()
+        
+        # Repaint only the strip the active drawer moved through
+        rect = self.active_drawer_rect()
+        if rect is None:
+            self.update()
+            return
+        new_offset = OPEN_DISTANCE * value
+        left = rect.x() + min(old_offset, new_offset)
+        right = rect.right() + max(old_offset, new_offset) + SHADOW_DEPTH
+        dirty = QRectF(left, rect.y(), right - left, rect.height() + SHADOW_DEPTH)
+        self.update(dirty.adjusted(-2, -2, 2, 2).toAlignedRect())
 
     open_factor = Property(float, get_open_factor, set_open_factor)
 
@@ -36,6 +60,10 @@ class CabinetVisualization(QWidget):
         self.active_kasten = kasten
         self.active_lade = lade
         
+        # The previously active drawer is now closed - static layer changes once
+        self._static_key = None
+        self.update()
+        
         # Reset and start animation
         self._animation.stop()
         self._animation.setStartValue(0.0)
@@ -46,33 +74,69 @@ class CabinetVisualization(QWidget):
         self.active_kasten = -1
         self.active_lade = -1
         self._open_factor = 0.0
+        self._static_key = None
         self.update()
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        w = self.width()
-        h = self.height()
-        
-        # Margins and spacing
-        margin = 20
-        spacing = 40
-        
-        avail_w = w - (2 * margin) - spacing
-        avail_h = h - (2 * margin)
+    def cabinet_rect(self, kasten_idx):
+        """Housing rectangle of cabinet 1 (left) or 2 (right)."""
+        avail_w = self.width() - (2 * MARGIN) - SPACING
+        avail_h = self.height() - (2 * MARGIN)
         
         # Calculate cabinet width to fit 2 side by side
         cab_w = avail_w / 2
-        cab_h = avail_h
-        
-        # Draw Cabinet 1 (Left)
-        self.draw_cabinet(painter, 1, margin, margin, cab_w, cab_h)
+        x = MARGIN if kasten_idx == 1 else MARGIN + cab_w + SPACING
+        return QRectF(x, MARGIN, cab_w, avail_h)
+
+    def drawer_rect(self, kasten_idx, lade_num):
+        """Front face of a closed drawer."""
+        cab = self.cabinet_rect(kasten_idx)
+        header_h = cab.height() * 0.05
+        drawers_y = cab.y() + header_h + 5
+        drawers_h = cab.height() - header_h - 10
+        single_drawer_h = (drawers_h - (NUM_DRAWERS - 1) * DRAWER_GAP) / NUM_DRAWERS
+        dy = drawers_y + (lade_num - 1) * (single_drawer_h + DRAWER_GAP)
+        return QRectF(cab.x() + 5, dy, cab.width() - 10, single_drawer_h)
+
+    def active_drawer_rect(self):
+        if self.active_kasten not in (1, 2) or not 1 <= self.active_lade <= NUM_DRAWERS:
+            return None
+        return self.drawer_rect(self.active_kasten, self.active_lade)
+
+    def static_layer(self):
+        """Cabinets and all closed drawers, cached per size, DPR and active drawer."""
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr, self.active_kasten, self.active_lade)
+        if self._static_key != key:
+            pixmap = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            for kasten_idx in (1, 2):
+                cab = self.cabinet_rect(kasten_idx)
+                self.draw_cabinet(painter, kasten_idx, cab.x(), cab.y(), cab.width(), cab.height())
+            painter.end()
+            
+            self._static_cache = pixmap
+            self._static_key = key
+        return self._static_cache
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setClipRect(event.rect())
+        painter.drawPixmap(0, 0, self.static_layer())
         
-        # Draw Cabinet 2 (Right)
-        self.draw_cabinet(painter, 2, margin + cab_w + spacing, margin, cab_w, cab_h)
+        rect = self.active_drawer_rect()
+        if rect is not None:
+            painter.setRenderHint(QPainter.Antialiasing)
+            # The label pen of the drawer above outlines the next one
+            painter.setPen(QColor("#000000") if self.active_lade > 1 else Qt.NoPen)
+            self.draw_drawer(painter, rect.x(), rect.y(), rect.width(), rect.height(),
+                             self.active_lade, True)
 
     def draw_cabinet(self, painter, kasten_idx, x, y, w, h):
+        """Housing plus all drawers except the active one (drawn per frame)."""
         # 3D Effect: Draw back panel shadow first (depth)
         depth = 8
         painter.setPen(Qt.NoPen)
@@ -106,96 +170,86 @@ class CabinetVisualization(QWidget):
         painter.drawRoundedRect(x, y, w, header_h, 4, 4)
         
         # Drawers area
-        drawers_y = y + header_h + 5
-        drawers_h = h - header_h - 10
+        for i in range(NUM_DRAWERS):
+            lade_num = i + 1
+            if kasten_idx == self.active_kasten and lade_num == self.active_lade:
+                continue
+            rect = self.drawer_rect(kasten_idx, lade_num)
+            self.draw_drawer(painter, rect.x(), rect.y(), rect.width(), rect.height(), lade_num, False)
+
+    def draw_drawer(self, painter, dx, dy, dw, single_drawer_h, lade_num, is_active):
+        # Animation: Slide out to the right
+        offset = 0
+        if is_active:
+            offset = OPEN_DISTANCE * self._open_factor
         
-        # Support up to 15 drawers
-        num_drawers = 15 
-        drawer_gap = 2
-        single_drawer_h = (drawers_h - (num_drawers - 1) * drawer_gap) / num_drawers
+        # Multi-layer shadow for depth (stronger 3D effect)
+        if is_active:
+            # Shadow layer 1 (darkest, furthest)
+            painter.setBrush(QColor(0, 0, 0, 120))
+            painter.drawRect(dx + 8, dy + 8, dw, single_drawer_h)
+            # Shadow layer 2 (medium)
+            painter.setBrush(QColor(0, 0, 0, 80))
+            painter.drawRect(dx + 6, dy + 6, dw, single_drawer_h)
+            # Shadow layer 3 (lightest, closest)
+            painter.setBrush(QColor(0, 0, 0, 40))
+            painter.drawRect(dx + 3, dy + 3, dw, single_drawer_h)
         
-        for i in range(num_drawers):
-            lade_num = i + 1
-            dy = drawers_y + i * (single_drawer_h + drawer_gap)
-            
-            is_active = (kasten_idx == self.active_kasten and lade_num == self.active_lade)
-            
-            # Drawer Rect
-            dx = x + 5
-            dw = w - 10
-            
-            # Animation: Slide out to the right
-            offset = 0
-            if is_active:
-                offset = 50 * self._open_factor
-            
-            # Multi-layer shadow for depth (stronger 3D effect)
-            if is_active:
-                # Shadow layer 1 (darkest, furthest)
-                painter.setBrush(QColor(0, 0, 0, 120))
-                painter.drawRect(dx + 8, dy + 8, dw, single_drawer_h)
-                # Shadow layer 2 (medium)
-                painter.setBrush(QColor(0, 0, 0, 80))
-                painter.drawRect(dx + 6, dy + 6, dw, single_drawer_h)
-                # Shadow layer 3 (lightest, closest)
-                painter.setBrush(QColor(0, 0, 0, 40))
-                painter.drawRect(dx + 3, dy + 3, dw, single_drawer_h)
-            
-            # Drawer Color - Blue like image
-            base_color = QColor("#005090")
-            if is_active:
-                base_color = QColor("#0078D7") 
-            
-            # Front face of drawer
-            grad = QLinearGradient(dx + offset, dy, dx + offset, dy + single_drawer_h)
-            grad.setColorAt(0, base_color.lighter(150))
-            grad.setColorAt(0.2, base_color.lighter(120))
-            grad.setColorAt(0.5, base_color)
-            grad.setColorAt(0.8, base_color.darker(120))
-            grad.setColorAt(1, base_color.darker(140))
-            
-            painter.setBrush(grad)
-            painter.drawRoundedRect(dx + offset, dy, dw, single_drawer_h, 2, 2)
-            
-            # 3D edge highlights on front
-            painter.setPen(QPen(base_color.lighter(180), 1))
-            painter.drawLine(dx + offset, dy, dx + offset + dw, dy)
-            
-            painter.setPen(QPen(base_color.darker(150), 1))
-            painter.drawLine(dx + offset, dy + single_drawer_h, 
-                           dx + offset + dw, dy + single_drawer_h)
-            
-            painter.setPen(Qt.NoPen)
-            
-            # Handle (Silver strip) with enhanced chrome effect
-            handle_h = single_drawer_h * 0.35
-            handle_y = dy + (single_drawer_h - handle_h) / 2
-            
-            # Handle Gradient (Chrome/Metallic)
-            handle_grad = QLinearGradient(dx + offset, handle_y, dx + offset, handle_y + handle_h)
-            handle_grad.setColorAt(0, QColor("#c8c8c8"))
-            handle_grad.setColorAt(0.3, QColor("#f5f5f5"))
-            handle_grad.setColorAt(0.5, QColor("#ffffff"))
-            handle_grad.setColorAt(0.7, QColor("#e8e8e8"))
-            handle_grad.setColorAt(1, QColor("#a0a0a0"))
-            
-            painter.setBrush(handle_grad)
-            painter.drawRect(dx + offset, handle_y, dw, handle_h)
-            
-            # Handle reflection highlight
-            painter.setBrush(QColor(255, 255, 255, 100))
-            painter.drawRect(dx + offset, handle_y, dw, handle_h * 0.3)
+        # Drawer Color - Blue like image
+        base_color = QColor("#005090")
+        if is_active:
+            base_color = QColor("#0078D7") 
+        
+        # Front face of drawer
+        grad = QLinearGradient(dx + offset, dy, dx + offset, dy + single_drawer_h)
+        grad.setColorAt(0, base_color.lighter(150))
+        grad.setColorAt(0.2, base_color.lighter(120))
+        grad.setColorAt(0.5, base_color)
+        grad.setColorAt(0.8, base_color.darker(120))
+        grad.setColorAt(1, base_color.darker(140))
+        
+        painter.setBrush(grad)
+        painter.drawRoundedRect(QRectF(dx + offset, dy, dw, single_drawer_h), 2, 2)
+        
+        # 3D edge highlights on front
+        painter.setPen(QPen(base_color.lighter(180), 1))
+        painter.drawLine(dx + offset, dy, dx + offset + dw, dy)
+        
+        painter.setPen(QPen(base_color.darker(150), 1))
+        painter.drawLine(dx + offset, dy + single_drawer_h, 
+                       dx + offset + dw, dy + single_drawer_h)
+        
+        painter.setPen(Qt.NoPen)
+        
+        # Handle (Silver strip) with enhanced chrome effect
+        handle_h = single_drawer_h * 0.35
+        handle_y = dy + (single_drawer_h - handle_h) / 2
+        
+        # Handle Gradient (Chrome/Metallic)
+        handle_grad = QLinearGradient(dx + offset, handle_y, dx + offset, handle_y + handle_h)
+        handle_grad.setColorAt(0, QColor("#c8c8c8"))
+        handle_grad.setColorAt(0.3, QColor("#f5f5f5"))
+        handle_grad.setColorAt(0.5, QColor("#ffffff"))
+        handle_grad.setColorAt(0.7, QColor("#e8e8e8"))
+        handle_grad.setColorAt(1, QColor("#a0a0a0"))
+        
+        painter.setBrush(handle_grad)
+        painter.drawRect(QRectF(dx + offset, handle_y, dw, handle_h))
+        
+        # Handle reflection highlight
+        painter.setBrush(QColor(255, 255, 255, 100))
+        painter.drawRect(QRectF(dx + offset, handle_y, dw, handle_h * 0.3))
+        
+        # Label (Lade Number) - BLACK for better visibility
+        font = painter.font()
+        if is_active:
+            font.setBold(True)
+            font.setPointSize(14)
+            painter.setPen(QColor("#000000"))  # Black
+        else:
+            font.setBold(False)
+            font.setPointSize(8)
+            painter.setPen(QColor("#000000"))  # Black
             
-            # Label (Lade Number) - BLACK for better visibility
-            font = painter.font()
-            if is_active:
-                font.setBold(True)
-                font.setPointSize(14)
-                painter.setPen(QColor("#000000"))  # Black
-            else:
-                font.setBold(False)
-                font.setPointSize(8)
-                painter.setPen(QColor("#000000"))  # Black
-                
-            painter.setFont(font)
-            painter.drawText(QRectF(dx + offset, dy, dw, single_drawer_h), Qt.AlignCenter, str(lade_num))
+        painter.setFont(font)
+        painter.drawText(QRectF(dx + offset, dy, dw, single_drawer_h), Qt.AlignCenter, str(lade_num))
@@ -6,6 +6,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QSize, Signal
 from PySide6.QtGui import QIcon, QFont
 from ..icon_manager import icon_manager
+from ..stile import ModernStyles
+from .benachrichtigung import notify
 
 class LoginDialog(QDialog):
     def __init__(self, data_manager, parent=None):
@@ -81,8 +83,7 @@ class Sidebar(QWidget):
         
         # "Navigation" Label
         lbl_nav = QLabel("Navigation")
-        lbl_nav.setProperty("class", "section-header")
-        lbl_nav.setStyleSheet("font-size: 16px; color: #BDC3C7; font-weight: bold;")
+        lbl_nav.setProperty("class", "nav-label")
         
         header_layout.addWidget(lbl_nav)
         header_layout.addStretch()
@@ -102,49 +103,22 @@ class Sidebar(QWidget):
         
         # --- Login/User Area (at bottom) ---
         self.user_container = QFrame()
-        self.user_container.setStyleSheet("""
-            QFrame {
-                background-color: #1A252F;
-                border-top: 1px solid #5D6D7E;
-                padding: 10px;
-            }
-        """)
+        self.user_container.setProperty("class", "user-container")
         user_layout = QVBoxLayout(self.user_container)
         user_layout.setContentsMargins(15, 15, 15, 15)
         
         self.lbl_user = QLabel("Nicht angemeldet")
-        self.lbl_user.setStyleSheet("font-size: 14px; font-weight: bold; color: #BDC3C7;")
+        self.lbl_user.setProperty("class", "user-label")
         user_layout.addWidget(self.lbl_user)
         
         btn_user_layout = QHBoxLayout()
         self.btn_login = QPushButton("Login")
-        self.btn_login.setStyleSheet("""
-            QPushButton {
-                background-color: #1ABC9C; 
-                color: white; 
-                padding: 8px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #16A085;
-            }
-        """)
+        self.btn_login.setProperty("class", "session-btn")
         self.btn_login.clicked.connect(self.show_login_dialog)
         
         self.btn_logout = QPushButton("Logout")
-        self.btn_logout.setStyleSheet("""
-            QPushButton {
-                background-color: #E74C3C; 
-                color: white; 
-                padding: 8px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #C0392B;
-            }
-        """)
+        self.btn_logout.setProperty("class", "session-btn")
+        self.btn_logout.setProperty("state", "logout")
         self.btn_logout.clicked.connect(self.logout)
         self.btn_logout.hide()
         
@@ -210,42 +184,18 @@ class Sidebar(QWidget):
             
             # Change login button to "Wechseln" (Switch account)
             self.btn_login.setText("Wechseln")
-            self.btn_login.setStyleSheet("""
-                QPushButton {
-                    background-color: #3498DB; 
-                    color: white; 
-                    padding: 8px;
-                    border-radius: 4px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #2980B9;
-                }
-            """)
+            ModernStyles.set_state(self.btn_login, "switch")
             self.btn_login.show()
             self.btn_logout.show()
         else:
             self.lbl_user.setText("Nicht angemeldet")
             self.btn_login.setText("Login")
-            self.btn_login.setStyleSheet("""
-                QPushButton {
-                    background-color: #1ABC9C; 
-                    color: white; 
-                    padding: 8px;
-                    border-radius: 4px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #16A085;
-                }
-            """)
+            ModernStyles.set_state(self.btn_login, "login")
             self.btn_login.show()
             self.btn_logout.hide()
 
     def show_login_dialog(self):
         """Show login dialog and process login."""
-        from PySide6.QtWidgets import QMessageBox
-        
         dialog = LoginDialog(self.auth_manager.data_manager, self)
         if dialog.exec():
             username, password = dialog.get_credentials()
@@ -254,7 +204,7 @@ class Sidebar(QWidget):
             print(f"Login attempt - Username: '{username}', Password length: {len(password)}")
             
             if not username:
-                QMessageBox.warning(self, "Login Fehler", "Bitte geben Sie einen Benutzernamen ein!")
+                notify(self, "Bitte geben Sie einen Benutzernamen ein!", "error")
                 return
             
             if self.auth_manager.login(username, password):
@@ -262,15 +212,13 @@ class Sidebar(QWidget):
                 self.update_user_display()
                 self.update_navigation()
                 self.login_changed.emit()
-                QMessageBox.information(self, "Erfolg", f"Willkommen {username}!")
+                notify(self, f"Willkommen {username}!")
             else:
                 print(f"Login failed for user: {username}")
-                QMessageBox.warning(self, "Login Fehler", 
-                    "Ungültige Anmeldedaten!\n\n"
-                    "Verfügbare Benutzer:\n"
-                    "- admin (mit Passwort)\n"
-                    "- Lager (mit Passwort)\n"
-                    "- Bediener (ohne Passwort)")
+                notify(self,
+                    "Ungültige Anmeldedaten! Verfügbare Benutzer: "
+                    "admin (mit Passwort), Lager (mit Passwort), Bediener (ohne Passwort)",
+                    "error")
 
     def logout(self):
         """Logout current user."""
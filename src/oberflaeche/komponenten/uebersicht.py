@@ -1,13 +1,15 @@
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QGridLayout, QLabel, QFrame, QGraphicsDropShadowEffect
+    QWidget, QVBoxLayout, QGridLayout, QLabel, QFrame, QProgressBar
 )
 from PySide6.QtCore import Qt, QSize, Signal
 from PySide6.QtGui import QIcon, QFont, QCursor, QPixmap
 from ..icon_manager import icon_manager
+from .schatten import ShadowContainer
 
 class DashboardTile(QFrame):
     clicked = Signal()
+    badge_clicked = Signal()
 
     def __init__(self, title, icon_name, parent=None):
         super().__init__(parent)
@@ -22,6 +24,7 @@ class DashboardTile(QFrame):
         # Icon Label - Verwende Icon-Manager
         self.icon_label = QLabel()
         self.icon_label.setAlignment(Qt.AlignCenter)
+        self.icon_label.setProperty("class", "tile-icon")
         
         # Icon vom Icon-Manager laden
         pixmap = icon_manager.get_pixmap(icon_name, size=80)
@@ -30,29 +33,63 @@ class DashboardTile(QFrame):
         else:
             # Fallback
             self.icon_label.setText("?")
-            self.icon_label.setStyleSheet("font-size: 80px; color: #E50914;")
+            self.icon_label.setProperty("state", "missing")
         
         # Text Label
         self.text_label = QLabel(title)
         self.text_label.setAlignment(Qt.AlignCenter)
         self.text_label.setProperty("class", "tile-label")
         
+        # Live numbers below the title (see Dashboard.set_info)
+        self.info_label = QLabel()
+        self.info_label.setAlignment(Qt.AlignCenter)
+        self.info_label.setProperty("class", "tile-info")
+        self.info_label.hide()
+        
         layout.addWidget(self.icon_label)
         layout.addWidget(self.text_label)
+        layout.addWidget(self.info_label)
+        
+        # Counter in the top-right corner (e.g. tools below minimum stock)
+        self.badge = QLabel(self)
+        self.badge.setProperty("class", "tile-badge")
+        self.badge.setAlignment(Qt.AlignCenter)
+        self.badge.hide()
         
-        # Shadow effect for depth
-        shadow = QGraphicsDropShadowEffect(self)
-        shadow.setBlurRadius(15)
-        shadow.setColor(Qt.black)
-        shadow.setOffset(0, 4)
-        self.setGraphicsEffect(shadow)
+        # Shadow for depth is pre-rendered and painted by the Dashboard grid
+        # (ShadowContainer) - no per-repaint blur on hover
+
+    def set_badge(self, count, tooltip=""):
+        """Show `count` in the badge; 0 hides it."""
+        self.badge.setVisible(count > 0)
+        if count <= 0:
+            return
+        self.badge.setText(str(count) if count < 100 else "99+")
+        self.badge.setToolTip(tooltip)
+        self.badge.adjustSize()
+        size = max(36, self.badge.width())
+        self.badge.setFixedSize(size, 36)
+        self.badge.move(self.width() - size - 10, 10)
+        self.badge.raise_()
+
+    def set_info(self, text, tooltip=""):
+        """Short live figures under the title; empty text hides them."""
+        self.info_label.setVisible(bool(text))
+        self.layout().setSpacing(8 if text else 15)
+        if self.info_label.text() != text:
+            self.info_label.setText(text)
+        self.info_label.setToolTip(tooltip)
 
     def mousePressEvent(self, event):
-        self.clicked.emit()
+        if self.badge.isVisible() and self.badge.geometry().contains(event.position().toPoint()):
+            self.badge_clicked.emit()
+        else:
+            self.clicked.emit()
         super().mousePressEvent(event)
 
 class Dashboard(QWidget):
     page_selected = Signal(str)
+    badge_selected = Signal(str)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -65,16 +102,19 @@ class Dashboard(QWidget):
         # Title
         title = QLabel("»ToolBuddy«")
         title.setAlignment(Qt.AlignCenter)
-        title.setStyleSheet("""
-            font-size: 48px; 
-            font-weight: 300; 
-            color: #BDC3C7;
-            letter-spacing: 2px;
-        """)
+        title.setProperty("class", "dashboard-title")
         layout.addWidget(title)
         
+        # Startup progress (hidden unless a StartupLoader is running)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFixedWidth(470)
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.setFormat("Lade Daten... %v/%m")
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar, 0, Qt.AlignCenter)
+        
         # Grid
-        grid_container = QWidget()
+        grid_container = ShadowContainer()
         grid = QGridLayout(grid_container)
         grid.setSpacing(30)
         grid.setAlignment(Qt.AlignCenter)
@@ -87,11 +127,44 @@ class Dashboard(QWidget):
             ("Suche", "suche", 1, 1, "Suche"),
         ]
         
+        self.tiles = {}
         for text, icon_name, r, c, page_name in tiles_data:
             tile = DashboardTile(text, icon_name)
             # Use lambda with default arg to capture variable correctly in loop
             tile.clicked.connect(lambda p=page_name: self.page_selected.emit(p))
+            tile.badge_clicked.connect(lambda p=page_name: self.badge_selected.emit(p))
             grid.addWidget(tile, r, c)
+            grid_container.add_shadow(tile, radius=12, blur=15, offset=(0, 4))
+            self.tiles[page_name] = tile
             
         layout.addWidget(grid_container)
         layout.addStretch()
+    
+    def begin_loading(self, total):
+        """Show the progress bar and disable all tiles until their data is loaded."""
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        for tile in self.tiles.values():
+            tile.setEnabled(False)
+    
+    def set_progress(self, done, total):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+        if done >= total:
+            self.progress_bar.hide()
+    
+    def set_badge(self, page_name, count, tooltip=""):
+        tile = self.tiles.get(page_name)
+        if tile:
+            tile.set_badge(count, tooltip)
+    
+    def set_info(self, page_name, text, tooltip=""):
+        tile = self.tiles.get(page_name)
+        if tile:
+            tile.set_info(text, tooltip)
+    
+    def set_page_ready(self, page_name):
+        tile = self.tiles.get(page_name)
+        if tile:
+            tile.setEnabled(True)
@@ -0,0 +1,196 @@
+"""
+Bearbeitbare Werkzeugtabelle für die Admin-Seite.
+
+ToolTableModel zeigt Werkzeuge mit allen Spalten von werkzeuge.csv.
+Zellen werden direkt in der Tabelle bearbeitet, aber nicht sofort
+gespeichert: das Modell sammelt die Änderungen (markiert), bis
+pending_edits() gemeinsam übernommen (DataManager.edit_tools, ein
+Speichern) oder discard() verworfen wird. ToolCellDelegate liefert je
+Spalte den passenden Editor und prüft Geometriewerte schon bei der Eingabe.
+"""
+
+from typing import Dict, List, Tuple
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRegularExpression, Signal
+from PySide6.QtGui import QColor, QRegularExpressionValidator
+from PySide6.QtWidgets import QStyledItemDelegate, QComboBox, QLineEdit
+from ...daten_manager import TOOL_COLUMNS, TOOL_STATUSES, GEOMETRY_COLUMNS, check_tool_value
+from ...modelle import Tool
+
+CORE_COLUMNS = ["ID", "Name", "Status", "Lagerplatz"]
+READ_ONLY_COLUMNS = ("ID",)
+
+
+def tool_value(tool: Tool, column: str) -> str:
+    field = TOOL_COLUMNS.get(column)
+    if field:
+        return getattr(tool, field) or ''
+    return tool.extra_data.get(column, '') or ''
+
+
+class ToolTableModel(QAbstractTableModel):
+    """Werkzeuge als Zeilen; geänderte Zellen bleiben bis zum Übernehmen im Modell."""
+
+    pending_changed = Signal(int)  # Anzahl geänderter Zellen
+    edit_rejected = Signal(str)  # Meldung bei ungültigem Wert
+
+    PENDING_COLOR = QColor(243, 156, 18, 90)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.columns: List[str] = list(CORE_COLUMNS)
+        self._tools: List[Tool] = []
+        self._row_by_tool: Dict[int, int] = {}  # id(tool) -> row
+        self._pending: Dict[int, Tuple[Tool, Dict[str, str]]] = {}  # id(tool) -> (tool, column -> value)
+
+    # --- Daten ---
+
+    def set_columns(self, extra_columns: List[str]):
+        # dict.fromkeys: werkzeuge.csv has duplicate headers (Werkzeug-L)
+        columns = CORE_COLUMNS + [c for c in dict.fromkeys(extra_columns)
+                                  if c not in CORE_COLUMNS and c not in TOOL_COLUMNS]
+        if columns != self.columns:
+            self.beginResetModel()
+            self.columns = columns
+            self.endResetModel()
+
+    def set_tools(self, tools: List[Tool]):
+        """Neue Zeilen (z.B. gefiltert); gesammelte Änderungen bleiben erhalten."""
+        self.beginResetModel()
+        self._tools = list(tools)
+        self._row_by_tool = {id(tool): row for row, tool in enumerate(self._tools)}
+        self.endResetModel()
+
+    def tool_at(self, row: int) -> Tool:
+        return self._tools[row]
+
+    def row_of(self, tool: Tool) -> int:
+        return self._row_by_tool.get(id(tool), -1)
+
+    def refresh_tool(self, tool: Tool):
+        """Eine Zeile neu anzeigen (nach einem Change-Event)."""
+        row = self.row_of(tool)
+        if row >= 0:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.columns) - 1))
+
+    # --- Gesammelte Änderungen ---
+
+    def pending_count(self) -> int:
+        return sum(len(values) for _, values in self._pending.values())
+
+    def pending_edits(self) -> List[Tuple[Tool, Dict[str, str]]]:
+        return [(tool, dict(values)) for tool, values in self._pending.values()]
+
+    def rebind_pending(self, tools: List[Tool]):
+        """
+        Nach Neuladen/Löschen: Änderungen gelten weiter für dieselben Objekte
+        oder deren Nachfolger mit gleicher ID und Name; die übrigen entfallen.
+        """
+        alive = {id(tool) for tool in tools}
+        by_key: Dict[Tuple[str, str], Tool] = {}
+        for tool in tools:
+            by_key.setdefault((tool.id, tool.name), tool)
+        pending, self._pending = self._pending, {}
+        for tool, values in pending.values():
+            target = tool if id(tool) in alive else by_key.get((tool.id, tool.name))
+            if target is not None:
+                self._pending[id(target)] = (target, values)
+        self.pending_changed.emit(self.pending_count())
+
+    def discard(self):
+        rows = [self.row_of(tool) for tool, _ in self._pending.values()]
+        self._pending.clear()
+        for row in rows:
+            if row >= 0:
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.columns) - 1))
+        self.pending_changed.emit(0)
+
+    def _pending_value(self, tool: Tool, column: str):
+        entry = self._pending.get(id(tool))
+        return entry[1].get(column) if entry else None
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._tools)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section]
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.isValid() and self.columns[index.column()] not in READ_ONLY_COLUMNS:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        tool = self._tools[index.row()]
+        column = self.columns[index.column()]
+        pending = self._pending_value(tool, column)
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return pending if pending is not None else tool_value(tool, column)
+        if role == Qt.BackgroundRole and pending is not None:
+            return self.PENDING_COLOR
+        if role == Qt.ToolTipRole and pending is not None:
+            return f"Ungespeichert, vorher: {tool_value(tool, column) or '(leer)'}"
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        tool = self._tools[index.row()]
+        column = self.columns[index.column()]
+        try:
+            value = check_tool_value(column, str(value))
+        except ValueError as e:
+            self.edit_rejected.emit(str(e))
+            return False
+
+        entry = self._pending.setdefault(id(tool), (tool, {}))[1]
+        if value == tool_value(tool, column):
+            entry.pop(column, None)  # back to the saved value
+            if not entry:
+                del self._pending[id(tool)]
+        else:
+            entry[column] = value
+        self.dataChanged.emit(index, index)
+        self.pending_changed.emit(self.pending_count())
+        return True
+
+
+class ToolCellDelegate(QStyledItemDelegate):
+    """Status als Auswahl, Geometriespalten nur mit Zahl, '-' oder leer."""
+
+    NUMBER_PATTERN = QRegularExpression(r"(\d+([.,]\d+)?|-)?")  # Teileingaben: Intermediate
+
+    def _column(self, index) -> str:
+        return index.model().columns[index.column()]
+
+    def createEditor(self, parent, option, index):
+        column = self._column(index)
+        if column == "Status":
+            editor = QComboBox(parent)
+            editor.addItems(list(dict.fromkeys([*TOOL_STATUSES, index.data(Qt.EditRole)])))
+            return editor
+        editor = QLineEdit(parent)
+        if column in GEOMETRY_COLUMNS:
+            editor.setValidator(QRegularExpressionValidator(self.NUMBER_PATTERN, editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        if isinstance(editor, QComboBox):
+            editor.setCurrentText(index.data(Qt.EditRole))
+        else:
+            super().setEditorData(editor, index)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QComboBox):
+            model.setData(index, editor.currentText(), Qt.EditRole)
+        else:
+            super().setModelData(editor, model, index)
@@ -2,9 +2,12 @@
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QPushButton, QLabel, QFrame
 )
-from PySide6.QtCore import Qt, QTimer, QDateTime
+from PySide6.QtCore import Qt, QTimer, QDateTime, Signal
 
 class Toolbar(QWidget):
+    undo_requested = Signal()
+    redo_requested = Signal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName("Toolbar")
@@ -14,11 +17,25 @@ class Toolbar(QWidget):
         layout.setContentsMargins(10, 0, 10, 0)
         layout.setSpacing(10)
         
+        # Left Side: Undo / Redo (DataManager.history)
+        self.btn_undo = QPushButton("↶ Rückgängig")
+        self.btn_undo.setProperty("class", "icon-btn")
+        self.btn_undo.setCursor(Qt.PointingHandCursor)
+        self.btn_undo.clicked.connect(self.undo_requested)
+        layout.addWidget(self.btn_undo)
+        
+        self.btn_redo = QPushButton("↷ Wiederholen")
+        self.btn_redo.setProperty("class", "icon-btn")
+        self.btn_redo.setCursor(Qt.PointingHandCursor)
+        self.btn_redo.clicked.connect(self.redo_requested)
+        layout.addWidget(self.btn_redo)
+        self.set_history(None, None)
+        
         layout.addStretch()
         
         # Right Side Info
         self.lbl_time = QLabel()
-        self.lbl_time.setStyleSheet("color: #BDC3C7; font-weight: bold;")
+        self.lbl_time.setProperty("class", "clock-label")
         layout.addWidget(self.lbl_time)
         
         # Timer for clock
@@ -27,6 +44,13 @@ class Toolbar(QWidget):
         self.timer.start(1000)
         self.update_time()
         
+    def set_history(self, undo_label, redo_label):
+        """Enables the buttons; the labels name the change in the tooltip."""
+        self.btn_undo.setEnabled(undo_label is not None)
+        self.btn_undo.setToolTip(f"Rückgängig: {undo_label} (Strg+Z)" if undo_label is not None else "")
+        self.btn_redo.setEnabled(redo_label is not None)
+        self.btn_redo.setToolTip(f"Wiederholen: {redo_label} (Strg+Y)" if redo_label is not None else "")
+        
     def update_time(self):
         now = QDateTime.currentDateTime()
         self.lbl_time.setText(now.toString("dd.MM.yyyy HH:mm"))
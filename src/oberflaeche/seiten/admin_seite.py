@@ -1,18 +1,24 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QLabel, 
-                               QMessageBox, QGroupBox, QTableWidget, QTableWidgetItem, 
+                               QMessageBox, QGroupBox, QTableView,
                                QHeaderView, QAbstractItemView, QHBoxLayout, QLineEdit)
 from ...daten_manager import DataManager
 from ...authentifizierung import AuthManager
+from ...ereignisse import ToolAdded, ToolUpdated, ToolRemoved, AssignmentChanged, DatasetReloaded, DATASET_TOOLS
 from ..benutzer_verwaltung import UserManagementDialog
 from ..werkzeug_dialog import ToolDialog
+from ..dialoge.auslastung_dialog import UtilisationDialog
+from ..dialoge.mehrfach_bearbeiten_dialog import BulkEditDialog
+from ..komponenten.benachrichtigung import notify
+from ..komponenten.werkzeug_tabelle import ToolTableModel, ToolCellDelegate
 
 class AdminPage(QWidget):
     def __init__(self, data_manager: DataManager, auth_manager: AuthManager, parent_window=None):
         super().__init__()
         self.data_manager = data_manager
         self.auth_manager = auth_manager
-        self.parent_window = parent_window # To trigger global refresh if needed
+        self.parent_window = parent_window
         self.all_tools = []  # Store all tools for filtering
+        self._rendered_generation = None  # Data generation shown in the table
         
         layout = QVBoxLayout()
         layout.setContentsMargins(40, 40, 40, 40)
@@ -20,14 +26,14 @@ class AdminPage(QWidget):
         
         # Header
         label = QLabel("Admin")
-        label.setStyleSheet("font-size: 24px; font-weight: bold; color: #1ABC9C; margin-bottom: 10px;")
+        label.setProperty("class", "page-header")
         layout.addWidget(label)
         
         # Search Field (Top)
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Suche...")
         self.search_input.setMinimumHeight(60)
-        self.search_input.setStyleSheet("font-size: 18px; padding: 10px;")
+        self.search_input.setProperty("class", "touch-input")
         self.search_input.textChanged.connect(self.filter_tools)
         layout.addWidget(self.search_input)
         
@@ -57,72 +63,129 @@ class AdminPage(QWidget):
         edit_tool_btn.clicked.connect(self.edit_tool)
         btn_layout.addWidget(edit_tool_btn)
         
+        bulk_btn = QPushButton("Mehrfach bearbeiten")
+        bulk_btn.setMinimumHeight(60)
+        bulk_btn.clicked.connect(self.bulk_edit)
+        btn_layout.addWidget(bulk_btn)
+        
+        stats_btn = QPushButton("Auslastung")
+        stats_btn.setMinimumHeight(60)
+        stats_btn.clicked.connect(self.open_utilisation)
+        btn_layout.addWidget(stats_btn)
+        
         reset_btn = QPushButton("Werkzeugkästen zurücksetzen")
         reset_btn.setMinimumHeight(60)
-        reset_btn.setStyleSheet("background-color: #d9534f; color: white;")
+        reset_btn.setProperty("class", "warning-btn")
         reset_btn.clicked.connect(self.reset_toolboxes)
         btn_layout.addWidget(reset_btn)
         
         del_tool_btn = QPushButton("Werkzeug löschen")
         del_tool_btn.setMinimumHeight(60)
-        del_tool_btn.setStyleSheet("background-color: #c0392b; color: white;")
+        del_tool_btn.setProperty("class", "danger-btn")
         del_tool_btn.clicked.connect(self.delete_tool)
         btn_layout.addWidget(del_tool_btn)
         
         tool_layout.addLayout(btn_layout)
         
+        # Inline edits are collected in the model and saved together
+        pending_layout = QHBoxLayout()
+        self.pending_label = QLabel("Zellen per Doppelklick bearbeiten, dann gemeinsam speichern.")
+        self.pending_label.setProperty("class", "hint")
+        pending_layout.addWidget(self.pending_label)
+        pending_layout.addStretch()
+        
+        self.discard_btn = QPushButton("Verwerfen")
+        self.discard_btn.setMinimumHeight(50)
+        self.discard_btn.clicked.connect(self.discard_edits)
+        pending_layout.addWidget(self.discard_btn)
+        
+        self.save_edits_btn = QPushButton("Änderungen speichern")
+        self.save_edits_btn.setMinimumHeight(50)
+        self.save_edits_btn.setProperty("class", "save-btn")
+        self.save_edits_btn.clicked.connect(self.save_edits)
+        pending_layout.addWidget(self.save_edits_btn)
+        tool_layout.addLayout(pending_layout)
+        
         # Table
-        self.tool_table = QTableWidget()
-        self.tool_table.setColumnCount(4)
-        self.tool_table.setHorizontalHeaderLabels(["ID", "Name", "Status", "Lagerplatz"])
+        self.tool_model = ToolTableModel(self)
+        self.tool_model.pending_changed.connect(self.update_pending)
+        self.tool_model.edit_rejected.connect(lambda text: notify(self, text, "error"))
+        self.tool_table = QTableView()
+        self.tool_table.setModel(self.tool_model)
+        self.tool_table.setItemDelegate(ToolCellDelegate(self.tool_table))
+        self.tool_table.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed)
         
         # Configure column widths - Name gets more space
         header = self.tool_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)  # ID
+        header.setSectionResizeMode(QHeaderView.ResizeToContents)
         header.setSectionResizeMode(1, QHeaderView.Stretch)  # Name - takes most space
-        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)  # Status
-        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)  # Lagerplatz
         
         self.tool_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.tool_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.tool_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.tool_table.verticalHeader().setDefaultSectionSize(60)  # Smaller row height
         self.tool_table.setShowGrid(True)
         self.tool_table.setAlternatingRowColors(True)
-        self.tool_table.setStyleSheet("QTableWidget::item { font-size: 14px; }")
-        self.tool_table.doubleClicked.connect(self.edit_tool)
+        self.tool_table.setProperty("class", "admin-table")
         tool_layout.addWidget(self.tool_table)
+        self.update_pending(0)
         
         tool_group.setLayout(tool_layout)
         layout.addWidget(tool_group)
         
-        self.refresh_data()
+        # Data is loaded on first refresh_data() (MainWindow builds pages lazily)
         
         # Remove the stretch to make table bigger
         # layout.addStretch()
         self.setLayout(layout)
         
+        self.data_manager.events.subscribe(
+            self.on_data_changed, ToolAdded, ToolUpdated, ToolRemoved, AssignmentChanged, DatasetReloaded)
+        
     def open_benutzer_verwaltung(self):
         dialog = UserManagementDialog(self.data_manager, self)
         dialog.exec()
         
+    def open_utilisation(self):
+        dialog = UtilisationDialog(self.data_manager, self)
+        dialog.exec()
+        
     def refresh_data(self):
+        if self._rendered_generation == self.data_manager.generation(DATASET_TOOLS):
+            return
         self.all_tools = self.data_manager.load_tools()
-        self.update_table(self.all_tools)
+        self.tool_model.set_columns(self.data_manager.fieldnames)
+        self.tool_model.rebind_pending(self.all_tools)
+        self.filter_tools()
+        self._rendered_generation = self.data_manager.generation(DATASET_TOOLS)
     
-    def update_table(self, tools):
-        self.tool_table.setRowCount(len(tools))
+    def on_data_changed(self, events):
+        """Update only the affected rows; structural changes re-filter the cached list."""
+        if self._rendered_generation is None:
+            return
         
+        if any(isinstance(e, DatasetReloaded) for e in events):
+            self._rendered_generation = None
+            if self.isVisible():
+                self.refresh_data()
+            return
+        
+        if any(isinstance(e, (ToolAdded, ToolRemoved)) for e in events):
+            self.all_tools = self.data_manager.load_tools()
+            self.tool_model.rebind_pending(self.all_tools)
+            self.filter_tools()
+        else:
+            for e in events:
+                self.tool_model.refresh_tool(e.tool)
+        self._rendered_generation = self.data_manager.generation(DATASET_TOOLS)
+    
+    def update_table(self, tools):
         # Sort by ID (numeric if possible)
         try:
             tools.sort(key=lambda t: float(t.id.replace(',', '.')) if t.id.replace(',', '.').replace('.', '', 1).isdigit() else float('inf'))
         except:
             pass # Keep original order if sort fails
-            
-        for i, tool in enumerate(tools):
-            self.tool_table.setItem(i, 0, QTableWidgetItem(str(tool.id)))
-            self.tool_table.setItem(i, 1, QTableWidgetItem(tool.name))
-            self.tool_table.setItem(i, 2, QTableWidgetItem(tool.status))
-            self.tool_table.setItem(i, 3, QTableWidgetItem(tool.lagerplatz))
+        
+        self.tool_model.set_tools(tools)
     
     def filter_tools(self):
         query = self.search_input.text().lower()
@@ -142,9 +205,33 @@ class AdminPage(QWidget):
         
         self.update_table(filtered)
 
+    def selected_tools(self):
+        rows = sorted({index.row() for index in self.tool_table.selectionModel().selectedRows()})
+        return [self.tool_model.tool_at(row) for row in rows]
+
+    def update_pending(self, count):
+        self.save_edits_btn.setEnabled(count > 0)
+        self.discard_btn.setEnabled(count > 0)
+        self.save_edits_btn.setText(f"Änderungen speichern ({count})" if count else "Änderungen speichern")
+
+    def save_edits(self):
+        edits = self.tool_model.pending_edits()
+        if not edits:
+            return
+        try:
+            changed = self.data_manager.edit_tools(edits, f"{len(edits)} Werkzeug(e) in der Tabelle bearbeiten")
+        except (ValueError, OSError) as e:
+            notify(self, str(e), "error")
+            return
+        self.tool_model.discard()
+        notify(self, f"{changed} Werkzeug(e) gespeichert.")
+
+    def discard_edits(self):
+        self.tool_model.discard()
+
     def add_tool(self):
-        # Erstelle Dialog einmal
-        dialog = ToolDialog(self, data_manager=self.data_manager)
+        # Dialog wird wiederverwendet (ToolDialog.reuse), nicht jedes Mal neu gebaut
+        dialog = ToolDialog.reuse(self, data_manager=self.data_manager)
         
         # Schleife für Validierung
         while True:
@@ -166,8 +253,7 @@ class AdminPage(QWidget):
                     
                     if response == QMessageBox.Ok:
                         # Dialog erneut anzeigen mit den bisherigen Daten
-                        # Erstelle neuen Dialog mit den eingegebenen Daten
-                        dialog = ToolDialog(self, new_tool, self.data_manager)
+                        dialog.bind(new_tool)
                         # ID-Feld wieder editierbar machen (da es ein "neues" Werkzeug ist)
                         dialog.id_input.setReadOnly(False)
                         dialog.id_input.selectAll()  # Markiere ID für einfaches Überschreiben
@@ -178,8 +264,12 @@ class AdminPage(QWidget):
                         break
                 
                 # Alles OK - Werkzeug hinzufügen
-                tools.append(new_tool)
-                self.data_manager.save_tools(tools)
+                try:
+                    self.data_manager.add_tool(new_tool)
+                except (ValueError, OSError) as e:
+                    notify(self, str(e), "error")
+                    break
+                undo = [self.data_manager.last_undo_entry]
                 
                 # Wenn Status "Rüstwerkzeuge" ist, auch in ruestwerkzeuge.csv eintragen
                 if new_tool.status == "Rüstwerkzeuge":
@@ -201,75 +291,95 @@ class AdminPage(QWidget):
                         # Versuche Rüstwerkzeug hinzuzufügen
                         success = self.data_manager.add_ruestwerkzeug(ruest)
                         if success:
-                            QMessageBox.information(
-                                self, 
-                                "Erfolg", 
-                                f"Werkzeug angelegt.\n\n"
-                                f"Das Werkzeug wurde auch als Rüstwerkzeug eingetragen.\n"
-                                f"Bitte weisen Sie den Lagerplatz (Kasten/Lade/Fach) im Rüstwerkzeug-Bereich zu!"
+                            undo.append(self.data_manager.last_undo_entry)
+                            notify(
+                                self,
+                                f"Werkzeug {new_tool.id} angelegt und als Rüstwerkzeug eingetragen. "
+                                f"Bitte Lagerplatz (Kasten/Lade/Fach) im Rüstwerkzeug-Bereich zuweisen!",
+                                undo=undo
                             )
                         else:
                             # ID existiert bereits in Rüstwerkzeuge (sollte theoretisch nicht passieren)
-                            QMessageBox.warning(
+                            notify(
                                 self,
-                                "Teilweise erfolgreich",
-                                "Werkzeug wurde angelegt, aber in Rüstwerkzeuge-Liste war diese ID bereits vorhanden."
+                                "Werkzeug wurde angelegt, aber in Rüstwerkzeuge-Liste war diese ID bereits vorhanden.",
+                                "error"
                             )
-                    except ValueError as e:
+                    except (ValueError, OSError) as e:
                         # Fehler beim Hinzufügen (sollte bei K=0/L=0/F=0 nicht passieren)
-                        QMessageBox.warning(
+                        notify(
                             self,
-                            "Teilweise erfolgreich", 
-                            f"Werkzeug wurde angelegt, aber konnte nicht in Rüstwerkzeuge eingetragen werden:\n{str(e)}\n\n"
-                            f"Bitte tragen Sie das Werkzeug manuell im Rüstwerkzeug-Bereich ein."
+                            f"Werkzeug wurde angelegt, aber konnte nicht in Rüstwerkzeuge eingetragen werden: {e}",
+                            "error"
                         )
                 else:
                     # Normales Werkzeug - Standard-Erfolgsmeldung
-                    QMessageBox.information(self, "Erfolg", "Werkzeug angelegt.")
+                    notify(self, f"Werkzeug {new_tool.id} angelegt", undo=undo)
                 
-                self.refresh_data()
-                if self.parent_window:
-                    self.parent_window.refresh_all()
                 break  # Schleife verlassen
             else:
                 # Benutzer hat abgebrochen
                 break
 
     def edit_tool(self):
-        selected_items = self.tool_table.selectedItems()
-        if not selected_items:
+        tools = self.selected_tools()
+        if not tools:
+            return
+        if len(tools) > 1:
+            self.bulk_edit()
             return
-            
-        row = selected_items[0].row()
-        tool_id = self.tool_table.item(row, 0).text()
         
-        tools = self.data_manager.load_tools()
-        tool = next((t for t in tools if t.id == tool_id), None)
+        tool = tools[0]
+        dialog = ToolDialog.reuse(self, tool, data_manager=self.data_manager)
+        if dialog.exec():
+            try:
+                self.data_manager.update_tool(tool, dialog.get_data())
+            except (ValueError, OSError) as e:
+                notify(self, str(e), "error")
+
+    def bulk_edit(self):
+        tools = self.selected_tools()
+        if not tools:
+            notify(self, "Bitte wählen Sie die zu bearbeitenden Werkzeuge aus.", "info")
+            return
         
-        if tool:
-            dialog = ToolDialog(self, tool, self.data_manager)
-            if dialog.exec():
-                updated_tool = dialog.get_data()
-                # Update list
-                for i, t in enumerate(tools):
-                    if t.id == tool.id:
-                        tools[i] = updated_tool
-                        break
-                
-                self.data_manager.save_tools(tools)
-                self.refresh_data()
-                if self.parent_window:
-                    self.parent_window.refresh_all()
+        dialog = BulkEditDialog(self.data_manager, tools, self)
+        if not dialog.exec():
+            return
+        values = dialog.get_values()
+        try:
+            changed = self.data_manager.update_tools(tools, values)
+        except (ValueError, OSError) as e:
+            notify(self, str(e), "error")
+            return
+        column, value = next(iter(values.items()))
+        notify(self, f"{column} = '{value}' für {changed} von {len(tools)} Werkzeug(en) gesetzt.")
 
     def delete_tool(self):
-        selected_items = self.tool_table.selectedItems()
-        if not selected_items:
-            QMessageBox.warning(self, "Auswahl", "Bitte wählen Sie ein Werkzeug zum Löschen aus.")
+        tools = self.selected_tools()
+        if not tools:
+            notify(self, "Bitte wählen Sie ein Werkzeug zum Löschen aus.", "info")
+            return
+        
+        if len(tools) > 1:
+            reply = QMessageBox.question(
+                self,
+                "Löschen bestätigen",
+                f"Möchten Sie die {len(tools)} ausgewählten Werkzeuge wirklich löschen?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No
+            )
+            if reply == QMessageBox.Yes:
+                try:
+                    self.data_manager.delete_tools(tools)
+                except (ValueError, OSError) as e:
+                    notify(self, str(e), "error")
+                    return
+                notify(self, f"{len(tools)} Werkzeuge wurden gelöscht.")
             return
             
-        row = selected_items[0].row()
-        tool_id = self.tool_table.item(row, 0).text()
-        tool_name = self.tool_table.item(row, 1).text()
+        tool_id = tools[0].id
+        tool_name = tools[0].name
         
         reply = QMessageBox.question(
             self, 
@@ -280,13 +390,15 @@ class AdminPage(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            if self.data_manager.delete_tool(tool_id):
-                self.refresh_data()
-                if self.parent_window:
-                    self.parent_window.refresh_all()
-                QMessageBox.information(self, "Erfolg", f"Werkzeug '{tool_name}' wurde gelöscht.")
+            try:
+                deleted = self.data_manager.delete_tool(tool_id)
+            except (ValueError, OSError) as e:
+                notify(self, str(e), "error")
+                return
+            if deleted:
+                notify(self, f"Werkzeug '{tool_name}' wurde gelöscht.")
             else:
-                QMessageBox.warning(self, "Fehler", "Werkzeug konnte nicht gelöscht werden.")
+                notify(self, "Werkzeug konnte nicht gelöscht werden.", "error")
 
     def reset_toolboxes(self):
         reply = QMessageBox.question(self, "Zurücksetzen bestätigen", 
@@ -294,29 +406,9 @@ class AdminPage(QWidget):
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            tools = self.data_manager.load_tools()
-            for tool in tools:
-                # Clear per-box status and machine assignment
-                keys_to_remove = []
-                for k in tool.extra_data.keys():
-                    if k.startswith('Status_Box_') or k.startswith('Maschine_Box_'):
-                        keys_to_remove.append(k)
-                
-                for k in keys_to_remove:
-                    del tool.extra_data[k]
-                
-                # Reset global status if it was 'maschine'
-                if tool.status.lower() == 'maschine':
-                    tool.status = 'frei'
-                
-                # Clear global machine/origin data
-                if 'Maschine' in tool.extra_data:
-                    del tool.extra_data['Maschine']
-                if 'Herkunft_Kasten' in tool.extra_data:
-                    del tool.extra_data['Herkunft_Kasten']
-            
-            self.data_manager.save_tools(tools)
-            self.refresh_data()
-            QMessageBox.information(self, "Erfolg", "Alle Werkzeugkästen wurden zurückgesetzt.")
-            if self.parent_window:
-                self.parent_window.refresh_all()
+            try:
+                self.data_manager.reset_toolboxes()
+            except (ValueError, OSError) as e:
+                notify(self, str(e), "error")
+                return
+            notify(self, "Alle Werkzeugkästen wurden zurückgesetzt.")
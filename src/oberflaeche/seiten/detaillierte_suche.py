@@ -2,6 +2,7 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLineEdit, QLabel,
                                QTableWidget, QTableWidgetItem, QHeaderView, QComboBox, QHBoxLayout)
 from PySide6.QtCore import Qt
 from ...daten_manager import DataManager
+from ...ereignisse import ToolAdded, ToolUpdated, ToolRemoved, AssignmentChanged, DatasetReloaded, DATASET_TOOLS
 from ..dialoge.werkzeug_details_dialog import ToolDetailsDialog
 
 class DetailedSearchPage(QWidget):
@@ -9,6 +10,7 @@ class DetailedSearchPage(QWidget):
         super().__init__()
         self.data_manager = data_manager
         self.tools = []
+        self._rendered_generation = None  # Data generation shown in the table
         
         layout = QVBoxLayout()
         layout.setContentsMargins(40, 40, 40, 40)
@@ -16,7 +18,7 @@ class DetailedSearchPage(QWidget):
         
         # Header
         header = QLabel("Suche")
-        header.setStyleSheet("font-size: 24px; font-weight: bold; color: #1ABC9C; margin-bottom: 10px;")
+        header.setProperty("class", "page-header")
         layout.addWidget(header)
 
         # Search Controls
@@ -25,14 +27,14 @@ class DetailedSearchPage(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Suche...")
         self.search_input.setMinimumHeight(60)
-        self.search_input.setStyleSheet("font-size: 18px; padding: 10px;")
+        self.search_input.setProperty("class", "touch-input")
         self.search_input.textChanged.connect(self.filter_tools)
         search_layout.addWidget(self.search_input)
         
         self.status_filter = QComboBox()
         self.status_filter.addItems(["Alle Status", "MASCHIENE", "GERÜSTET", "RÜSTWERKZEUG"])
         self.status_filter.setMinimumHeight(60)
-        self.status_filter.setStyleSheet("font-size: 18px; padding: 10px;")
+        self.status_filter.setProperty("class", "touch-input")
         self.status_filter.currentIndexChanged.connect(self.filter_tools)
         search_layout.addWidget(self.status_filter)
         
@@ -42,7 +44,7 @@ class DetailedSearchPage(QWidget):
         self.table = QTableWidget()
         self.table.setSelectionBehavior(QTableWidget.SelectRows)
         self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.setStyleSheet("QTableWidget::item { font-size: 16px; min-height: 50px; }")
+        self.table.setProperty("class", "search-table")
         self.table.verticalHeader().setDefaultSectionSize(60)
         self.table.verticalHeader().hide()
         self.table.setShowGrid(True)
@@ -52,9 +54,20 @@ class DetailedSearchPage(QWidget):
         
         self.setLayout(layout)
         
+        self.data_manager.events.subscribe(
+            self.on_data_changed, ToolAdded, ToolUpdated, ToolRemoved, AssignmentChanged, DatasetReloaded)
+        
     def refresh_data(self):
+        if self._rendered_generation == self.data_manager.generation(DATASET_TOOLS):
+            return
         self.tools = self.data_manager.load_tools()
-        self.update_table(self.tools)
+        self.filter_tools()
+        self._rendered_generation = self.data_manager.generation(DATASET_TOOLS)
+    
+    def on_data_changed(self, events):
+        """The table is rebuilt from the filter, so only refresh while visible."""
+        if self._rendered_generation is not None and self.isVisible():
+            self.refresh_data()
         
     def update_table(self, tools):
         headers = self.data_manager.fieldnames
@@ -169,5 +182,5 @@ class DetailedSearchPage(QWidget):
                 break
         
         if tool:
-            dialog = ToolDetailsDialog(tool, self)
+            dialog = ToolDetailsDialog.reuse(self, tool)
             dialog.exec()
@@ -1,32 +1,46 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                                QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
                                QHeaderView, QMessageBox, QTabWidget, QGridLayout, QFrame,
-                               QDialog, QFormLayout, QSpinBox, QComboBox)
+                               QDialog, QFormLayout, QSpinBox, QComboBox, QGroupBox)
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont, QColor
 from ...daten_manager import DataManager
 from ...modelle import Ruestwerkzeug
+from ...routenplanung import plan_route, route_summary
 from ...authentifizierung import AuthManager
+from ...ereignisse import (RuestToolAdded, RuestToolUpdated, RuestToolRemoved, StockChanged,
+                           DatasetReloaded, DATASET_RUEST)
 from ..dialoge.laden_konfig_dialog import DrawerConfigDialog
+from ..dialoge.wiederverwendung import ReusableDialog
+from ..stile import ModernStyles
+from ..komponenten.benachrichtigung import notify
 
 class RuestwerkzeugPage(QWidget):
+    STATS_DAYS = 30  # Zeitraum der Verbrauchsstatistik
+
     def __init__(self, data_manager: DataManager, auth_manager: AuthManager):
         super().__init__()
         self.data_manager = data_manager
         self.auth_manager = auth_manager
+        self.all_tools = []
+        self.pick_list = {}  # tool.id -> Menge, in Reihenfolge des Hinzufügens
+        self.route = []  # Geplante PickSteps der aktiven Route
+        self.route_index = -1
+        self._rendered_generation = None  # Data generation shown in the tables
+        self._row_by_id = {}  # tool.id -> row in the (filtered) tables
         
         self.layout = QVBoxLayout(self)
         
         # Header
         header = QLabel("Rüstwerkzeug")
-        header.setStyleSheet("font-size: 24px; font-weight: bold; color: #1ABC9C; margin-bottom: 10px;")
+        header.setProperty("class", "page-header")
         self.layout.addWidget(header)
         
         # Search Bar (Top)
         self.search_bar = QLineEdit()
         self.search_bar.setPlaceholderText("Suche...")
         self.search_bar.setMinimumHeight(60)
-        self.search_bar.setStyleSheet("font-size: 18px; padding: 10px;")
+        self.search_bar.setProperty("class", "touch-input")
         self.search_bar.textChanged.connect(self.filter_tools)
         self.layout.addWidget(self.search_bar)
         
@@ -44,8 +58,21 @@ class RuestwerkzeugPage(QWidget):
         self.setup_admin_tab()
         self.tabs.addTab(self.admin_tab, "🛠️ Verwaltung")
         
-        # Initial load
-        self.refresh_data()
+        # Statistics Tab (aggregates from the movement log)
+        self.stats_tab = QWidget()
+        self.setup_stats_tab()
+        self.tabs.addTab(self.stats_tab, "📊 Verbrauch")
+        
+        # Low Stock Tab (from DataManager.low_stock, no catalogue scan)
+        self.low_stock_tab = QWidget()
+        self.setup_low_stock_tab()
+        self.tabs.addTab(self.low_stock_tab, "⚠️ Mindestbestand")
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        
+        # Data is loaded on first refresh_data() (MainWindow builds pages lazily)
+        self.data_manager.events.subscribe(
+            self.on_data_changed, RuestToolAdded, RuestToolUpdated, RuestToolRemoved,
+            StockChanged, DatasetReloaded)
 
     def setup_user_tab(self):
         layout = QHBoxLayout(self.user_tab)
@@ -59,7 +86,7 @@ class RuestwerkzeugPage(QWidget):
         self.tool_list.setHorizontalHeaderLabels(["Name", "Bestand", "Ort"])
         self.tool_list.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.tool_list.setSelectionBehavior(QTableWidget.SelectRows)
-        self.tool_list.setStyleSheet("QTableWidget::item { font-size: 18px; min-height: 60px; }")
+        self.tool_list.setProperty("class", "touch-list")
         self.tool_list.verticalHeader().setDefaultSectionSize(60)
         self.tool_list.verticalHeader().hide()
         self.tool_list.setShowGrid(True)
@@ -67,6 +94,38 @@ class RuestwerkzeugPage(QWidget):
         self.tool_list.itemSelectionChanged.connect(self.on_tool_selected)
         left_layout.addWidget(self.tool_list)
         
+        # Pick list: collect several tools and take them in one step
+        self.pick_group = QGroupBox("Pickliste")
+        pick_layout = QVBoxLayout(self.pick_group)
+        
+        self.pick_table = QTableWidget(0, 3)
+        self.pick_table.setHorizontalHeaderLabels(["Name", "Menge", ""])
+        self.pick_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.pick_table.verticalHeader().setDefaultSectionSize(50)
+        self.pick_table.verticalHeader().hide()
+        self.pick_table.setSelectionMode(QTableWidget.NoSelection)
+        self.pick_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.pick_table.setMaximumHeight(220)
+        pick_layout.addWidget(self.pick_table)
+        
+        pick_btns = QHBoxLayout()
+        self.commit_pick_btn = QPushButton("Alle entnehmen")
+        self.commit_pick_btn.setProperty("class", "take-btn")
+        self.commit_pick_btn.clicked.connect(self.commit_pick_list)
+        pick_btns.addWidget(self.commit_pick_btn)
+        
+        self.route_btn = QPushButton("Route starten")
+        self.route_btn.clicked.connect(self.start_route)
+        pick_btns.addWidget(self.route_btn)
+        
+        self.clear_pick_btn = QPushButton("Leeren")
+        self.clear_pick_btn.clicked.connect(self.clear_pick_list)
+        pick_btns.addWidget(self.clear_pick_btn)
+        pick_layout.addLayout(pick_btns)
+        
+        left_layout.addWidget(self.pick_group)
+        self.update_pick_table()
+        
         layout.addWidget(left_panel, 1)
         
         # Right: Visualization and Action
@@ -75,11 +134,11 @@ class RuestwerkzeugPage(QWidget):
         
         # Info Box
         self.info_box = QFrame()
-        self.info_box.setStyleSheet("background-color: #2b2b2b; border-radius: 10px; padding: 10px;")
+        self.info_box.setProperty("class", "info-box")
         info_layout = QVBoxLayout(self.info_box)
         
         self.selected_tool_label = QLabel("Kein Werkzeug ausgewählt")
-        self.selected_tool_label.setStyleSheet("font-size: 18px; font-weight: bold;")
+        self.selected_tool_label.setProperty("class", "info-title")
         info_layout.addWidget(self.selected_tool_label)
         
         self.location_label = QLabel("")
@@ -88,6 +147,10 @@ class RuestwerkzeugPage(QWidget):
         self.stock_label = QLabel("")
         info_layout.addWidget(self.stock_label)
         
+        self.usage_label = QLabel("")
+        self.usage_label.setProperty("class", "hint")
+        info_layout.addWidget(self.usage_label)
+        
         # Add Fach Visualization in info box
         from ..komponenten.fach_visualisierung import FachVisualization
         self.fach_visualisierung = FachVisualization()
@@ -101,16 +164,45 @@ class RuestwerkzeugPage(QWidget):
         self.schrank_visualisierung = CabinetVisualization()
         right_layout.addWidget(self.schrank_visualisierung)
         
+        # Route walk-through (only visible while a pick route is active)
+        self.route_box = QFrame()
+        self.route_box.setProperty("class", "info-box")
+        route_layout = QVBoxLayout(self.route_box)
+        self.route_label = QLabel("")
+        self.route_label.setProperty("class", "info-title")
+        self.route_label.setWordWrap(True)
+        route_layout.addWidget(self.route_label)
+        
+        route_btns = QHBoxLayout()
+        self.route_prev_btn = QPushButton("◀ Zurück")
+        self.route_prev_btn.clicked.connect(lambda: self.show_route_step(self.route_index - 1))
+        route_btns.addWidget(self.route_prev_btn)
+        self.route_next_btn = QPushButton("Weiter ▶")
+        self.route_next_btn.clicked.connect(self.next_route_step)
+        route_btns.addWidget(self.route_next_btn)
+        route_end_btn = QPushButton("Beenden")
+        route_end_btn.clicked.connect(self.end_route)
+        route_btns.addWidget(route_end_btn)
+        route_layout.addLayout(route_btns)
+        
+        self.route_box.hide()
+        right_layout.addWidget(self.route_box)
+        
         # Action Buttons
         action_layout = QHBoxLayout()
         self.take_btn = QPushButton("Entnehmen")
-        self.take_btn.setStyleSheet("background-color: #E50914; color: white; font-weight: bold; padding: 10px;")
+        self.take_btn.setProperty("class", "take-btn")
         self.take_btn.clicked.connect(self.take_tool)
         self.take_btn.setEnabled(False)
         action_layout.addWidget(self.take_btn)
         
+        self.pick_btn = QPushButton("+ Pickliste")
+        self.pick_btn.clicked.connect(self.add_to_pick_list)
+        self.pick_btn.setEnabled(False)
+        action_layout.addWidget(self.pick_btn)
+        
         self.return_btn = QPushButton("Zurückgeben")
-        self.return_btn.setStyleSheet("background-color: #28a745; color: white; font-weight: bold; padding: 10px;")
+        self.return_btn.setProperty("class", "return-btn")
         self.return_btn.clicked.connect(self.return_tool)
         self.return_btn.setEnabled(False)
         action_layout.addWidget(self.return_btn)
@@ -155,59 +247,218 @@ class RuestwerkzeugPage(QWidget):
         self.admin_table.setAlternatingRowColors(True)
         layout.addWidget(self.admin_table)
 
+    def setup_stats_tab(self):
+        layout = QVBoxLayout(self.stats_tab)
+        
+        hint = QLabel(f"Entnahmen der letzten {self.STATS_DAYS} Tage, alle Terminals")
+        hint.setProperty("class", "hint")
+        layout.addWidget(hint)
+        
+        self.stats_table = QTableWidget(0, 6)
+        self.stats_table.setHorizontalHeaderLabels(
+            ["Name", f"Entnommen ({self.STATS_DAYS} T.)", "Ø / Tag", "Ø Abstand", "Letzte Entnahme", "Benutzer"])
+        self.stats_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.stats_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.stats_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.stats_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.stats_table.verticalHeader().hide()
+        self.stats_table.setAlternatingRowColors(True)
+        layout.addWidget(self.stats_table)
+
+    def setup_low_stock_tab(self):
+        layout = QVBoxLayout(self.low_stock_tab)
+        
+        self.low_stock_hint = QLabel("")
+        self.low_stock_hint.setProperty("class", "hint")
+        layout.addWidget(self.low_stock_hint)
+        
+        self.low_stock_table = QTableWidget(0, 5)
+        self.low_stock_table.setHorizontalHeaderLabels(["Name", "Bestand", "Min", "Fehlmenge", "Ort"])
+        self.low_stock_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.low_stock_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.low_stock_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.low_stock_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.low_stock_table.verticalHeader().hide()
+        self.low_stock_table.setAlternatingRowColors(True)
+        self.low_stock_table.doubleClicked.connect(self.open_low_stock_tool)
+        layout.addWidget(self.low_stock_table)
+
+    def show_low_stock(self):
+        self.tabs.setCurrentWidget(self.low_stock_tab)
+        self.refresh_low_stock()
+
+    def refresh_low_stock(self):
+        tools = self.data_manager.low_stock.ordered()
+        self.low_stock_hint.setText(
+            f"{len(tools)} Rüstwerkzeuge auf oder unter Mindestbestand, größte Fehlmenge zuerst. "
+            "Doppelklick zeigt das Werkzeug." if tools else "Alle Rüstwerkzeuge über Mindestbestand.")
+        self.low_stock_table.setRowCount(len(tools))
+        for i, tool in enumerate(tools):
+            values = [tool.name, str(tool.bestand), str(tool.min_bestand),
+                      str(tool.min_bestand - tool.bestand), f"K{tool.kasten}/L{tool.lade}/F{tool.fach}"]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col in (1, 2, 3):
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.low_stock_table.setItem(i, col, item)
+            self.low_stock_table.item(i, 0).setData(Qt.UserRole, tool.id)
+
+    def open_low_stock_tool(self, index):
+        """Jump to the tool in the search tab."""
+        tool_id = self.low_stock_table.item(index.row(), 0).data(Qt.UserRole)
+        self.search_bar.clear()
+        self.tabs.setCurrentWidget(self.user_tab)
+        self.restore_selection(tool_id)
+
+    @staticmethod
+    def format_interval(hours):
+        if hours is None:
+            return "–"
+        if hours < 48:
+            return f"{hours:.1f} h"
+        return f"{hours / 24:.1f} T"
+
+    def usage_text(self, tool):
+        stats = self.data_manager.movements.stats(tool.id)
+        if not stats.takes:
+            return "Noch keine Entnahmen erfasst"
+        return (f"Verbrauch: Ø {stats.per_day(self.STATS_DAYS):.1f}/Tag · "
+                f"Entnahme alle {self.format_interval(stats.avg_interval_hours)} · "
+                f"zuletzt {stats.last_take.replace('T', ' ')[:16]}")
+
+    def on_tab_changed(self, index):
+        if self.tabs.widget(index) is self.stats_tab:
+            self.refresh_stats()
+        elif self.tabs.widget(index) is self.low_stock_tab:
+            self.refresh_low_stock()
+
+    def refresh_stats(self):
+        """Fill the statistics tab from the running aggregates (no history scan)."""
+        self.data_manager.movements.refresh()
+        all_stats = self.data_manager.movements.all_stats()
+        names = {t.id: t.name for t in self.data_manager.load_ruestwerkzeuge()}
+        rows = sorted(((tool_id, s) for tool_id, s in all_stats.items() if s.takes),
+                      key=lambda r: (r[1].consumption(self.STATS_DAYS), r[1].last_take), reverse=True)
+        
+        self.stats_table.setRowCount(len(rows))
+        for i, (tool_id, s) in enumerate(rows):
+            consumption = s.consumption(self.STATS_DAYS)
+            values = [names.get(tool_id, f"{tool_id} (gelöscht)"), str(consumption),
+                      f"{consumption / self.STATS_DAYS:.1f}", self.format_interval(s.avg_interval_hours),
+                      s.last_take.replace('T', ' ')[:16], s.last_user]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col in (1, 2):
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.stats_table.setItem(i, col, item)
+
     def refresh_data(self):
+        self.update_permissions()
+        if self._rendered_generation == self.data_manager.generation(DATASET_RUEST):
+            return
         self.all_tools = self.data_manager.load_ruestwerkzeuge()
         self.filter_tools()
-        
+        self._rendered_generation = self.data_manager.generation(DATASET_RUEST)
+        self.on_tab_changed(self.tabs.currentIndex())
+
+    def update_permissions(self):
         # Check admin permission (Admin OR Lager)
-        can_manage = self.auth_manager.is_lager_admin()
+        can_manage = bool(self.auth_manager.is_lager_admin())
         self.tabs.setTabEnabled(1, can_manage)
         if not can_manage and self.tabs.currentIndex() == 1:
             self.tabs.setCurrentIndex(0)
 
+    def on_data_changed(self, events):
+        """Update only the affected rows; additions/removals re-filter the cached list."""
+        if self._rendered_generation is None:
+            return
+
+        if any(isinstance(e, DatasetReloaded) for e in events):
+            self._rendered_generation = None
+            if self.isVisible():
+                self.refresh_data()
+            return
+
+        if any(isinstance(e, (RuestToolAdded, RuestToolRemoved)) for e in events):
+            selected = self.selected_tool()
+            self.all_tools = self.data_manager.load_ruestwerkzeuge()
+            self.filter_tools()
+            if selected:
+                self.restore_selection(selected.id)
+        else:
+            for e in events:
+                row = self._row_by_id.get(e.tool.id)
+                if row is not None:
+                    self.set_rows(row, e.tool)
+
+            selected = self.selected_tool()
+            if selected and any(e.tool is selected for e in events):
+                self.on_tool_selected()
+
+        if any(e.tool.id in self.pick_list for e in events):
+            self.update_pick_table()
+        if self.tabs.currentWidget() is self.stats_tab and any(isinstance(e, StockChanged) for e in events):
+            self.refresh_stats()
+        if self.tabs.currentWidget() is self.low_stock_tab:
+            self.refresh_low_stock()
+        self._rendered_generation = self.data_manager.generation(DATASET_RUEST)
+
+    def selected_tool(self):
+        items = self.tool_list.selectedItems()
+        return items[0].data(Qt.UserRole) if items else None
+
     def filter_tools(self):
         query = self.search_bar.text().lower()
         filtered = [t for t in self.all_tools if query in t.name.lower() or query in t.id.lower()]
         
-        # Update User List
+        # Update User List and Admin Table
         self.tool_list.setRowCount(len(filtered))
-        for i, tool in enumerate(filtered):
-            self.tool_list.setItem(i, 0, QTableWidgetItem(tool.name))
-            self.tool_list.setItem(i, 1, QTableWidgetItem(str(tool.bestand)))
-            self.tool_list.setItem(i, 2, QTableWidgetItem(f"K{tool.kasten}/L{tool.lade}/F{tool.fach}"))
-            self.tool_list.item(i, 0).setData(Qt.UserRole, tool)
-
-        # Update Admin Table
         self.admin_table.setRowCount(len(filtered))
+        self._row_by_id = {}
         for i, tool in enumerate(filtered):
-            self.admin_table.setItem(i, 0, QTableWidgetItem(tool.id))
-            self.admin_table.setItem(i, 1, QTableWidgetItem(tool.name))
-            self.admin_table.setItem(i, 2, QTableWidgetItem(str(tool.kasten)))
-            self.admin_table.setItem(i, 3, QTableWidgetItem(str(tool.lade)))
-            self.admin_table.setItem(i, 4, QTableWidgetItem(str(tool.fach)))
-            self.admin_table.setItem(i, 5, QTableWidgetItem(str(tool.bestand)))
-            self.admin_table.setItem(i, 6, QTableWidgetItem(str(tool.min_bestand)))
-            self.admin_table.item(i, 0).setData(Qt.UserRole, tool)
+            self.set_rows(i, tool)
+            self._row_by_id[tool.id] = i
+
+    def set_rows(self, i, tool):
+        """Fill row `i` of the user list and the admin table with `tool`."""
+        self.tool_list.setItem(i, 0, QTableWidgetItem(tool.name))
+        self.tool_list.setItem(i, 1, QTableWidgetItem(str(tool.bestand)))
+        self.tool_list.setItem(i, 2, QTableWidgetItem(f"K{tool.kasten}/L{tool.lade}/F{tool.fach}"))
+        self.tool_list.item(i, 0).setData(Qt.UserRole, tool)
+
+        self.admin_table.setItem(i, 0, QTableWidgetItem(tool.id))
+        self.admin_table.setItem(i, 1, QTableWidgetItem(tool.name))
+        self.admin_table.setItem(i, 2, QTableWidgetItem(str(tool.kasten)))
+        self.admin_table.setItem(i, 3, QTableWidgetItem(str(tool.lade)))
+        self.admin_table.setItem(i, 4, QTableWidgetItem(str(tool.fach)))
+        self.admin_table.setItem(i, 5, QTableWidgetItem(str(tool.bestand)))
+        self.admin_table.setItem(i, 6, QTableWidgetItem(str(tool.min_bestand)))
+        self.admin_table.item(i, 0).setData(Qt.UserRole, tool)
 
     def on_tool_selected(self):
-        items = self.tool_list.selectedItems()
-        if not items:
+        self.show_tool(self.selected_tool())
+
+    def show_tool(self, tool, grid=None):
+        """Show `tool` in the info box and drive both visualizations. `grid` = (rows, cols) if already known."""
+        if not tool:
             self.selected_tool_label.setText("Kein Werkzeug ausgewählt")
             self.location_label.setText("")
             self.stock_label.setText("")
+            self.usage_label.setText("")
             self.schrank_visualisierung.clear_selection()
             self.fach_visualisierung.clear()
             self.take_btn.setEnabled(False)
+            self.pick_btn.setEnabled(False)
             return
             
-        tool = items[0].data(Qt.UserRole)
         self.selected_tool_label.setText(tool.name)
         self.location_label.setText(f"Ort: Kasten {tool.kasten}, Lade {tool.lade}, Fach {tool.fach}")
         self.stock_label.setText(f"Bestand: {tool.bestand} (Min: {tool.min_bestand})")
+        self.usage_label.setText(self.usage_text(tool))
         
         # Update Visualization
         # Fetch grid size from configuration
-        rows, cols = self.data_manager.get_drawer_grid(tool.kasten, tool.lade)
+        rows, cols = grid or self.data_manager.get_drawer_grid(tool.kasten, tool.lade)
         
         # Calculate max fach based on grid
         max_fach = rows * cols
@@ -219,6 +470,7 @@ class RuestwerkzeugPage(QWidget):
         self.schrank_visualisierung.set_selection(tool.kasten, tool.lade)
         
         self.take_btn.setEnabled(tool.bestand > 0)
+        self.pick_btn.setEnabled(self.pick_list.get(tool.id, 0) < tool.bestand)
         self.return_btn.setEnabled(True)
 
     def open_drawer_config(self):
@@ -226,59 +478,179 @@ class RuestwerkzeugPage(QWidget):
         dialog.exec()
 
     def take_tool(self):
-        items = self.tool_list.selectedItems()
-        if not items:
+        tool = self.selected_tool()
+        if not tool:
             return
         
-        tool = items[0].data(Qt.UserRole)
         if tool.bestand > 0:
-            tool.bestand -= 1
-            
-            # Immediate UI Update
-            self.stock_label.setText(f"Bestand: {tool.bestand} (Min: {tool.min_bestand})")
-            
-            # Update list item immediately
-            current_row = self.tool_list.currentRow()
-            if current_row >= 0:
-                 self.tool_list.setItem(current_row, 1, QTableWidgetItem(str(tool.bestand)))
-            
             try:
-                self.data_manager.update_ruestwerkzeug(tool)
-                self.refresh_data()
-                
-                # Restore selection
-                self.restore_selection(tool.id)
-                
-                QMessageBox.information(self, "Erfolg", f"1x {tool.name} entnommen.")
-            except ValueError as e:
-                QMessageBox.warning(self, "Fehler", str(e))
+                self.data_manager.change_stock(tool.id, -1)
+                notify(self, f"{tool.name} entnommen", key=("take", tool.id),
+                       undo=[self.data_manager.last_undo_entry])
+            except (ValueError, OSError) as e:
+                notify(self, str(e), "error")
 
     def return_tool(self):
-        items = self.tool_list.selectedItems()
-        if not items:
+        tool = self.selected_tool()
+        if not tool:
             return
         
-        tool = items[0].data(Qt.UserRole)
-        tool.bestand += 1
-        
-        # Immediate UI Update
-        self.stock_label.setText(f"Bestand: {tool.bestand} (Min: {tool.min_bestand})")
+        try:
+            self.data_manager.change_stock(tool.id, 1)
+            notify(self, f"{tool.name} zurückgegeben", key=("return", tool.id),
+                   undo=[self.data_manager.last_undo_entry])
+        except (ValueError, OSError) as e:
+            notify(self, str(e), "error")
+
+    def add_to_pick_list(self):
+        tool = self.selected_tool()
+        if not tool:
+            return
         
-        # Update list item immediately
-        current_row = self.tool_list.currentRow()
-        if current_row >= 0:
-             self.tool_list.setItem(current_row, 1, QTableWidgetItem(str(tool.bestand)))
+        qty = self.pick_list.get(tool.id, 0)
+        if qty >= tool.bestand:
+            notify(self, f"Nicht genug Bestand für {tool.name} (Bestand: {tool.bestand})!", "error")
+            return
+        self.pick_list[tool.id] = qty + 1
+        self.update_pick_table()
+        self.on_tool_selected()
+
+    def remove_from_pick_list(self, tool_id):
+        self.pick_list.pop(tool_id, None)
+        self.update_pick_table()
+        self.on_tool_selected()
+
+    def set_pick_quantity(self, tool_id, qty):
+        if tool_id in self.pick_list:
+            self.pick_list[tool_id] = qty
+            self.update_pick_title()
+            self.on_tool_selected()
+
+    def clear_pick_list(self):
+        self.pick_list.clear()
+        self.update_pick_table()
+        self.on_tool_selected()
+
+    def update_pick_table(self):
+        """
+        Rebuild the pick list. Quantities are clamped to the current stock so
+        that the list is always valid before it is committed.
+        """
+        by_id = {t.id: t for t in self.data_manager.load_ruestwerkzeuge()} if self.pick_list else {}
+        for tool_id in list(self.pick_list):
+            tool = by_id.get(tool_id)
+            if tool is None or tool.bestand <= 0:
+                del self.pick_list[tool_id]
+            else:
+                self.pick_list[tool_id] = min(self.pick_list[tool_id], tool.bestand)
         
-        try:
-            self.data_manager.update_ruestwerkzeug(tool)
-            self.refresh_data()
+        self.pick_table.setRowCount(len(self.pick_list))
+        for row, (tool_id, qty) in enumerate(self.pick_list.items()):
+            tool = by_id[tool_id]
+            self.pick_table.setItem(row, 0, QTableWidgetItem(f"{tool.name}  (K{tool.kasten}/L{tool.lade}/F{tool.fach})"))
             
-            # Restore selection
-            self.restore_selection(tool.id)
+            spin = QSpinBox()
+            spin.setRange(1, tool.bestand)
+            spin.setValue(qty)
+            spin.valueChanged.connect(lambda value, tid=tool_id: self.set_pick_quantity(tid, value))
+            self.pick_table.setCellWidget(row, 1, spin)
             
-            QMessageBox.information(self, "Erfolg", f"1x {tool.name} zurückgegeben.")
-        except ValueError as e:
-            QMessageBox.warning(self, "Fehler", str(e))
+            remove_btn = QPushButton("✕")
+            remove_btn.clicked.connect(lambda _=False, tid=tool_id: self.remove_from_pick_list(tid))
+            self.pick_table.setCellWidget(row, 2, remove_btn)
+        
+        self.commit_pick_btn.setEnabled(bool(self.pick_list))
+        self.route_btn.setEnabled(bool(self.pick_list))
+        self.clear_pick_btn.setEnabled(bool(self.pick_list))
+        if self.route:
+            # A changed list invalidates the planned route
+            self.end_route()
+        self.update_pick_title()
+
+    def update_pick_title(self):
+        if self.pick_list:
+            self.pick_group.setTitle(
+                f"Pickliste ({len(self.pick_list)} Werkzeuge, {sum(self.pick_list.values())} Stück)")
+        else:
+            self.pick_group.setTitle("Pickliste")
+
+    def commit_pick_list(self):
+        """Take all picked tools with one stock check, one save and one update."""
+        picks = dict(self.pick_list)
+        if not picks:
+            return
+        
+        # Cleared first so the change events do not rebuild the list once more
+        self.pick_list.clear()
+        try:
+            self.data_manager.take_ruestwerkzeuge(picks)
+        except (ValueError, OSError) as e:
+            self.pick_list.update(picks)
+            notify(self, str(e), "error")
+            return
+        
+        self.update_pick_table()
+        self.on_tool_selected()
+        notify(self, f"Pickliste entnommen: {len(picks)} Werkzeuge, {sum(picks.values())} Stück",
+               undo=[self.data_manager.last_undo_entry])
+
+    def start_route(self):
+        """Plan the pick list as a route (grouped by Kasten and Lade) and walk through it."""
+        if not self.pick_list:
+            return
+        by_id = {t.id: t for t in self.data_manager.load_ruestwerkzeuge()}
+        picks = [(by_id[tid], qty) for tid, qty in self.pick_list.items() if tid in by_id]
+        
+        start = self.schrank_visualisierung.active_kasten
+        self.route = plan_route(picks, start if start in (1, 2) else 1, self.data_manager.get_drawer_grid)
+        summary = route_summary(self.route)
+        self.route_box.show()
+        self.show_route_step(0)
+        notify(self, f"Route: {summary['steps']} Entnahmen, {summary['openings']} Laden, "
+                     f"{summary['cabinet_switches']} Kastenwechsel", "info")
+
+    def show_route_step(self, index):
+        if not 0 <= index < len(self.route):
+            return
+        self.route_index = index
+        step = self.route[index]
+        tool = step.tool
+        
+        # Select the tool in the list without re-running on_tool_selected
+        self.tool_list.blockSignals(True)
+        self.tool_list.clearSelection()
+        row = self._row_by_id.get(tool.id)
+        if row is not None:
+            self.tool_list.selectRow(row)
+        self.tool_list.blockSignals(False)
+        self.show_tool(tool, (step.rows, step.cols) if step.rows and step.cols else None)
+        
+        # Render the next drawer's grid now so the next step only blits it
+        if index + 1 < len(self.route):
+            nxt = self.route[index + 1]
+            if nxt.opens_drawer and nxt.rows and nxt.cols:
+                self.fach_visualisierung.prefetch(nxt.rows * nxt.cols, nxt.rows, nxt.cols)
+        
+        if tool.kasten > 0:
+            where = f"Kasten {tool.kasten}, Lade {tool.lade}, Fach {tool.fach}"
+            if step.opens_drawer:
+                where += " – Lade öffnen"
+        else:
+            where = "Kein Lagerplatz zugewiesen"
+        self.route_label.setText(f"Schritt {index + 1}/{len(self.route)}: {where}\n{step.menge}× {tool.name}")
+        self.route_prev_btn.setEnabled(index > 0)
+        self.route_next_btn.setText("Alle entnehmen" if index == len(self.route) - 1 else "Weiter ▶")
+
+    def next_route_step(self):
+        if self.route_index < len(self.route) - 1:
+            self.show_route_step(self.route_index + 1)
+        else:
+            self.commit_pick_list()
+
+    def end_route(self):
+        self.route = []
+        self.route_index = -1
+        self.route_box.hide()
 
     def restore_selection(self, tool_id):
         for i in range(self.tool_list.rowCount()):
@@ -288,12 +660,12 @@ class RuestwerkzeugPage(QWidget):
                 break
 
     def add_tool_dialog(self):
-        dialog = ToolEditDialog(self, data_manager=self.data_manager)
+        dialog = ToolEditDialog.reuse(self, data_manager=self.data_manager)
         if dialog.exec():
             data = dialog.get_data()
             # Generate ID if empty or handle duplicates
             if not data['id']:
-                QMessageBox.warning(self, "Fehler", "ID darf nicht leer sein.")
+                notify(self, "ID darf nicht leer sein.", "error")
                 return
                 
             new_tool = Ruestwerkzeug(
@@ -308,11 +680,11 @@ class RuestwerkzeugPage(QWidget):
             
             try:
                 if self.data_manager.add_ruestwerkzeug(new_tool):
-                    self.refresh_data()
+                    notify(self, f"{new_tool.name} angelegt", undo=[self.data_manager.last_undo_entry])
                 else:
-                    QMessageBox.warning(self, "Fehler", "ID existiert bereits.")
-            except ValueError as e:
-                QMessageBox.warning(self, "Fehler", str(e))
+                    notify(self, "ID existiert bereits.", "error")
+            except (ValueError, OSError) as e:
+                notify(self, str(e), "error")
 
     def edit_tool_dialog(self):
         items = self.admin_table.selectedItems()
@@ -320,21 +692,24 @@ class RuestwerkzeugPage(QWidget):
             return
             
         tool = items[0].data(Qt.UserRole)
-        dialog = ToolEditDialog(self, tool, data_manager=self.data_manager)
+        dialog = ToolEditDialog.reuse(self, tool, data_manager=self.data_manager)
         if dialog.exec():
             data = dialog.get_data()
-            tool.name = data['name']
-            tool.kasten = data['kasten']
-            tool.lade = data['lade']
-            tool.fach = data['fach']
-            tool.bestand = data['bestand']
-            tool.min_bestand = data['min_bestand']
+            updated = Ruestwerkzeug(
+                id=tool.id,
+                name=data['name'],
+                kasten=data['kasten'],
+                lade=data['lade'],
+                fach=data['fach'],
+                bestand=data['bestand'],
+                min_bestand=data['min_bestand']
+            )
             
             try:
-                self.data_manager.update_ruestwerkzeug(tool)
-                self.refresh_data()
-            except ValueError as e:
-                QMessageBox.warning(self, "Fehler", str(e))
+                self.data_manager.update_ruestwerkzeug(updated)
+                notify(self, f"{updated.name} gespeichert")
+            except (ValueError, OSError) as e:
+                notify(self, str(e), "error")
 
     def delete_tool(self):
         items = self.admin_table.selectedItems()
@@ -343,13 +718,16 @@ class RuestwerkzeugPage(QWidget):
             
         tool = items[0].data(Qt.UserRole)
         if QMessageBox.question(self, "Löschen", f"Soll {tool.name} wirklich gelöscht werden?") == QMessageBox.Yes:
-            self.data_manager.delete_ruestwerkzeug(tool.id)
-            self.refresh_data()
+            try:
+                self.data_manager.delete_ruestwerkzeug(tool.id)
+            except (ValueError, OSError) as e:
+                notify(self, str(e), "error")
+                return
+            notify(self, f"{tool.name} gelöscht")
 
-class ToolEditDialog(QDialog):
+class ToolEditDialog(ReusableDialog, QDialog):
     def __init__(self, parent=None, tool: Ruestwerkzeug = None, data_manager=None):
         super().__init__(parent)
-        self.setWindowTitle("Werkzeug bearbeiten" if tool else "Neues Werkzeug")
         self.setMinimumSize(600, 650)
         self.data_manager = data_manager
         self.current_tool = tool
@@ -358,74 +736,58 @@ class ToolEditDialog(QDialog):
         self.layout.setContentsMargins(30, 30, 30, 30)
         self.layout.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
         
-        # Style for input widgets
-        input_style = "font-size: 16px; padding: 8px; min-height: 50px;"
-        
-        self.id_edit = QLineEdit(tool.id if tool else "")
-        self.id_edit.setEnabled(not tool) # ID not editable
-        self.id_edit.setStyleSheet(input_style)
+        self.id_edit = QLineEdit()
+        self.id_edit.setProperty("class", "form-input")
         self.id_edit.setMinimumWidth(300)
         self.layout.addRow("ID:", self.id_edit)
         
-        self.name_edit = QLineEdit(tool.name if tool else "")
-        self.name_edit.setStyleSheet(input_style)
+        self.name_edit = QLineEdit()
+        self.name_edit.setProperty("class", "form-input")
         self.name_edit.setMinimumWidth(300)
         self.layout.addRow("Name:", self.name_edit)
         
         self.kasten_spin = QSpinBox()
         self.kasten_spin.setRange(1, 2)
-        self.kasten_spin.setValue(tool.kasten if tool else 1)
-        self.kasten_spin.setStyleSheet(input_style)
+        self.kasten_spin.setProperty("class", "form-input")
         self.kasten_spin.setMinimumWidth(300)
         self.kasten_spin.valueChanged.connect(self.update_fach_max)
         self.layout.addRow("Kasten (1-2):", self.kasten_spin)
         
         self.lade_spin = QSpinBox()
         self.lade_spin.setRange(1, 15)
-        self.lade_spin.setValue(tool.lade if tool else 1)
-        self.lade_spin.setStyleSheet(input_style)
+        self.lade_spin.setProperty("class", "form-input")
         self.lade_spin.setMinimumWidth(300)
         self.lade_spin.valueChanged.connect(self.update_fach_max)
         self.layout.addRow("Lade (1-15):", self.lade_spin)
         
         self.fach_spin = QSpinBox()
         self.fach_spin.setRange(1, 99)
-        self.fach_spin.setValue(tool.fach if tool else 1)
-        self.fach_spin.setStyleSheet(input_style)
+        self.fach_spin.setProperty("class", "form-input")
         self.fach_spin.setMinimumWidth(300)
         self.fach_spin.valueChanged.connect(self.update_fach_availability)
         self.layout.addRow("Fach:", self.fach_spin)
         
         # Info label for max fach
         self.fach_info = QLabel("")
-        self.fach_info.setStyleSheet("color: #7F8C8D; font-style: italic; font-size: 14px;")
+        self.fach_info.setProperty("class", "hint")
         self.layout.addRow("", self.fach_info)
         
         # Availability warning with better visibility
         self.availability_warning = QLabel("")
-        self.availability_warning.setStyleSheet("""
-            color: #FFFFFF; 
-            font-weight: bold; 
-            font-size: 14px;
-            background-color: #E74C3C;
-            padding: 10px;
-            border-radius: 5px;
-        """)
+        self.availability_warning.setProperty("class", "availability")
         self.availability_warning.setWordWrap(True)
         self.availability_warning.setMinimumHeight(50)
         self.layout.addRow("", self.availability_warning)
         
         self.bestand_spin = QSpinBox()
         self.bestand_spin.setRange(0, 9999)
-        self.bestand_spin.setValue(tool.bestand if tool else 0)
-        self.bestand_spin.setStyleSheet(input_style)
+        self.bestand_spin.setProperty("class", "form-input")
         self.bestand_spin.setMinimumWidth(300)
         self.layout.addRow("Bestand:", self.bestand_spin)
         
         self.min_spin = QSpinBox()
         self.min_spin.setRange(0, 9999)
-        self.min_spin.setValue(tool.min_bestand if tool else 0)
-        self.min_spin.setStyleSheet(input_style)
+        self.min_spin.setProperty("class", "form-input")
         self.min_spin.setMinimumWidth(300)
         self.layout.addRow("Min. Bestand:", self.min_spin)
         
@@ -434,19 +796,43 @@ class ToolEditDialog(QDialog):
         btns.setSpacing(10)
         ok_btn = QPushButton("Speichern")
         ok_btn.setMinimumHeight(60)
-        ok_btn.setStyleSheet("font-size: 16px; font-weight: bold; background-color: #27AE60; color: white;")
+        ok_btn.setProperty("class", "save-btn")
         ok_btn.clicked.connect(self.accept)
         
         cancel_btn = QPushButton("Abbrechen")
         cancel_btn.setMinimumHeight(60)
-        cancel_btn.setStyleSheet("font-size: 16px;")
+        cancel_btn.setProperty("class", "dialog-btn")
         cancel_btn.clicked.connect(self.reject)
         
         btns.addWidget(ok_btn)
         btns.addWidget(cancel_btn)
         self.layout.addRow(btns)
         
-        # Initial update
+        self.bind(tool)
+
+    def bind(self, tool: Ruestwerkzeug = None, data_manager=None):
+        """Zeigt `tool` (None = neues Rüstwerkzeug) in den vorhandenen Feldern an."""
+        self.current_tool = tool
+        if data_manager is not None:
+            self.data_manager = data_manager
+        self.setWindowTitle("Werkzeug bearbeiten" if tool else "Neues Werkzeug")
+        self.id_edit.setText(tool.id if tool else "")
+        self.id_edit.setEnabled(not tool) # ID not editable
+        self.name_edit.setText(tool.name if tool else "")
+        
+        # Set all values first, then derive Fach limit and availability once
+        spins = (self.kasten_spin, self.lade_spin, self.fach_spin)
+        for spin in spins:
+            spin.blockSignals(True)
+        self.fach_spin.setMaximum(99)
+        self.kasten_spin.setValue(tool.kasten if tool else 1)
+        self.lade_spin.setValue(tool.lade if tool else 1)
+        self.fach_spin.setValue(tool.fach if tool else 1)
+        for spin in spins:
+            spin.blockSignals(False)
+        self.bestand_spin.setValue(tool.bestand if tool else 0)
+        self.min_spin.setValue(tool.min_bestand if tool else 0)
+        
         self.update_fach_max()
 
     def update_fach_max(self):
@@ -497,25 +883,11 @@ class ToolEditDialog(QDialog):
                 self.availability_warning.setText("⚠️ Dieses Fach ist bereits belegt!")
             
             # Red background for occupied
-            self.availability_warning.setStyleSheet("""
-                color: #FFFFFF; 
-                font-weight: bold; 
-                font-size: 14px;
-                background-color: #E74C3C;
-                padding: 10px;
-                border-radius: 5px;
-            """)
+            ModernStyles.set_state(self.availability_warning, "occupied")
         else:
             self.availability_warning.setText("✓ Fach verfügbar")
             # Green background for available
-            self.availability_warning.setStyleSheet("""
-                color: #FFFFFF; 
-                font-weight: bold; 
-                font-size: 14px;
-                background-color: #27AE60;
-                padding: 10px;
-                border-radius: 5px;
-            """)
+            ModernStyles.set_state(self.availability_warning, "free")
 
         
     def accept(self):
@@ -1,8 +1,23 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListWidget, 
-                               QPushButton, QLabel, QComboBox, QMessageBox, QAbstractItemView, QListWidgetItem, QLineEdit)
+                               QPushButton, QLabel, QComboBox, QAbstractItemView, QListWidgetItem, QLineEdit,
+                               QListView, QStyledItemDelegate)
 from PySide6.QtCore import Qt
 from ...daten_manager import DataManager
 from ...authentifizierung import AuthManager
+from ..dialoge.werkzeugsatz_dialog import ToolSetDialog
+from ..komponenten.benachrichtigung import notify
+from ...ereignisse import (ToolAdded, ToolUpdated, ToolRemoved, AssignmentChanged,
+                           DatasetReloaded, DATASET_TOOLS)
+
+
+class TouchItemDelegate(QStyledItemDelegate):
+    """Tall dropdown rows for the touch selectors (style: QComboBox.touch-combo)."""
+
+    def sizeHint(self, option, index):
+        size = super().sizeHint(option, index)
+        size.setHeight(80)
+        return size
+
 
 class ToolboxPage(QWidget):
     def __init__(self, data_manager: DataManager, auth_manager: AuthManager):
@@ -12,8 +27,11 @@ class ToolboxPage(QWidget):
         self.tools = []
         self.available_tools = []  # Store filtered tools for search
         self.machines = ["Hermle40", "Hermle400", "Evo60", "EVO100", "650V"]
+        self._rendered_generation = None  # Data generation shown in the lists
         
         self.init_ui()
+        self.data_manager.events.subscribe(
+            self.on_data_changed, ToolAdded, ToolUpdated, ToolRemoved, AssignmentChanged, DatasetReloaded)
 
     def init_ui(self):
         # Main Layout (Vertical)
@@ -23,14 +41,14 @@ class ToolboxPage(QWidget):
         
         # Header
         header = QLabel("Werkzeugkasten")
-        header.setStyleSheet("font-size: 24px; font-weight: bold; color: #1ABC9C; margin-bottom: 10px;")
+        header.setProperty("class", "page-header")
         main_layout.addWidget(header)
         
         # Search Bar (Top)
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Suche...")
         self.search_input.setMinimumHeight(60)
-        self.search_input.setStyleSheet("font-size: 18px; padding: 10px;")
+        self.search_input.setProperty("class", "touch-input")
         self.search_input.textChanged.connect(self.filter_left_list)
         main_layout.addWidget(self.search_input)
         
@@ -50,7 +68,7 @@ class ToolboxPage(QWidget):
         from ..icon_manager import icon_manager
         left_icon = QLabel()
         left_icon.setPixmap(icon_manager.get_pixmap('werkzeugkasten', 64))
-        left_icon.setStyleSheet("background: transparent;")
+        left_icon.setProperty("class", "transparent")
         left_header = QLabel("WERKZEUGKÄSTEN")
         left_header.setObjectName("header")
         left_header_box.addWidget(left_icon)
@@ -61,69 +79,9 @@ class ToolboxPage(QWidget):
         self.toolbox_selector = QComboBox()
         self.toolbox_selector.addItems([f"Werkzeugkasten {i}" for i in range(1, 5)])
         self.toolbox_selector.setFixedHeight(180) # Larger for touch - closed state
-        self.toolbox_selector.setStyleSheet("""
-            QComboBox {
-                background-color: #2C3E50;
-                color: #BDC3C7;
-                font-size: 20px; 
-                padding: 15px;
-                font-weight: bold;
-                border: 2px solid white;
-                border-radius: 8px;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 2px solid white;
-                border-bottom: 2px solid white;
-                width: 10px;
-                height: 10px;
-                margin-right: 15px;
-                transform: rotate(-45deg);
-            }
-            QComboBox QAbstractItemView {
-                background-color: #2C3E50;
-                color: #BDC3C7;
-                font-size: 18px;
-                selection-background-color: #1ABC9C;
-            }
-            QComboBox QAbstractItemView::item {
-                min-height: 80px;
-                padding: 15px;
-            }
-        """)
-        # Set custom view for dropdown items
-        from PySide6.QtWidgets import QListView, QStyledItemDelegate
-        from PySide6.QtCore import QSize
-        
-        list_view = QListView()
-        list_view.setStyleSheet("""
-            QListView {
-                background-color: #2C3E50;
-                color: #BDC3C7;
-                outline: none;
-            }
-            QListView::item { 
-                min-height: 80px; 
-                padding: 15px; 
-                font-size: 18px; 
-            }
-            QListView::item:selected {
-                background-color: #1ABC9C;
-                color: white;
-            }
-        """)
-        self.toolbox_selector.setView(list_view)
-        
-        class ItemDelegate(QStyledItemDelegate):
-            def sizeHint(self, option, index):
-                size = super().sizeHint(option, index)
-                size.setHeight(80)
-                return size
-        
-        self.toolbox_selector.setItemDelegate(ItemDelegate())
+        self.toolbox_selector.setProperty("class", "touch-combo")
+        self.toolbox_selector.setView(QListView())
+        self.toolbox_selector.setItemDelegate(TouchItemDelegate(self.toolbox_selector))
         self.toolbox_selector.currentIndexChanged.connect(self.update_left_view)
         
         # Available Tools List
@@ -131,7 +89,7 @@ class ToolboxPage(QWidget):
         self.left_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.left_list.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.left_list.setAlternatingRowColors(True)
-        self.left_list.setStyleSheet("QListWidget::item { font-size: 18px; min-height: 60px; }")
+        self.left_list.setProperty("class", "touch-list")
         
         left_layout.addLayout(left_header_box)
         left_layout.addWidget(self.toolbox_selector)
@@ -153,10 +111,18 @@ class ToolboxPage(QWidget):
         self.btn_unload.setFixedSize(160, 160)
         self.btn_unload.setCursor(Qt.PointingHandCursor)
         self.btn_unload.clicked.connect(self.move_to_toolbox)
+
+        # Saved tool sets for the selected machine and box
+        self.btn_sets = QPushButton("SÄTZE")
+        self.btn_sets.setFixedSize(160, 80)
+        self.btn_sets.setCursor(Qt.PointingHandCursor)
+        self.btn_sets.clicked.connect(self.open_tool_sets)
         
         center_layout.addWidget(self.btn_load)
         center_layout.addSpacing(30)
         center_layout.addWidget(self.btn_unload)
+        center_layout.addSpacing(30)
+        center_layout.addWidget(self.btn_sets)
         center_layout.addStretch()
 
         # --- Right Side: Machine Selection & Loaded Tools ---
@@ -170,7 +136,7 @@ class ToolboxPage(QWidget):
         right_header_box = QHBoxLayout()
         right_icon = QLabel() 
         right_icon.setPixmap(icon_manager.get_pixmap('maschine', 64))
-        right_icon.setStyleSheet("background: transparent;")
+        right_icon.setProperty("class", "transparent")
         right_header = QLabel("MASCHINE")
         right_header.setObjectName("header")
         right_header_box.addWidget(right_icon)
@@ -181,80 +147,21 @@ class ToolboxPage(QWidget):
         self.machine_selector = QComboBox()
         self.machine_selector.addItems(self.machines)
         self.machine_selector.setFixedHeight(180) # Larger for touch - closed state (same as toolbox)
-        self.machine_selector.setStyleSheet("""
-            QComboBox {
-                background-color: #2C3E50;
-                color: #BDC3C7;
-                font-size: 20px; 
-                padding: 15px;
-                font-weight: bold;
-                border: 2px solid white;
-                border-radius: 8px;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 2px solid white;
-                border-bottom: 2px solid white;
-                width: 10px;
-                height: 10px;
-                margin-right: 15px;
-                transform: rotate(-45deg);
-            }
-            QComboBox QAbstractItemView {
-                background-color: #2C3E50;
-                color: #BDC3C7;
-                font-size: 18px;
-                selection-background-color: #1ABC9C;
-            }
-            QComboBox QAbstractItemView::item {
-                min-height: 80px;
-                padding: 15px;
-            }
-        """)
-        # Set custom view for dropdown items
-        from PySide6.QtWidgets import QListView, QStyledItemDelegate
-        
-        machine_list_view = QListView()
-        machine_list_view.setStyleSheet("""
-            QListView {
-                background-color: #2C3E50;
-                color: #BDC3C7;
-                outline: none;
-            }
-            QListView::item { 
-                min-height: 80px; 
-                padding: 15px; 
-                font-size: 18px; 
-            }
-            QListView::item:selected {
-                background-color: #1ABC9C;
-                color: white;
-            }
-        """)
-        self.machine_selector.setView(machine_list_view)
-        
-        class MachineItemDelegate(QStyledItemDelegate):
-            def sizeHint(self, option, index):
-                size = super().sizeHint(option, index)
-                size.setHeight(80)
-                return size
-        
-        self.machine_selector.setItemDelegate(MachineItemDelegate())
+        self.machine_selector.setProperty("class", "touch-combo")
+        self.machine_selector.setView(QListView())
+        self.machine_selector.setItemDelegate(TouchItemDelegate(self.machine_selector))
         self.machine_selector.currentIndexChanged.connect(self.update_right_view)
         
         # Machine Tools List
         self.right_list = QListWidget()
         self.right_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.right_list.setAlternatingRowColors(True)
-        self.right_list.setStyleSheet("QListWidget::item { font-size: 18px; min-height: 60px; }")
+        self.right_list.setProperty("class", "touch-list")
         
         # Empty State Label
         self.empty_state_label = QLabel("Keine Werkzeuge\nin dieser Maschine")
         self.empty_state_label.setAlignment(Qt.AlignCenter)
-        self.empty_state_label.setStyleSheet("color: #444; font-size: 18px; font-weight: bold; margin-top: 50px; background: transparent;")
+        self.empty_state_label.setProperty("class", "empty-state")
         self.empty_state_label.hide()
         
         right_layout.addLayout(right_header_box)
@@ -270,9 +177,43 @@ class ToolboxPage(QWidget):
         main_layout.addLayout(content_layout)
 
     def refresh_data(self):
+        if self._rendered_generation == self.data_manager.generation(DATASET_TOOLS):
+            return
         self.tools = self.data_manager.load_tools()
         self.update_left_view()
         self.update_right_view()
+        self._rendered_generation = self.data_manager.generation(DATASET_TOOLS)
+
+    def on_data_changed(self, events):
+        """Apply change events to the lists instead of reloading everything."""
+        if self._rendered_generation is None:
+            return  # Never shown - first refresh_data renders everything
+
+        if any(isinstance(e, DatasetReloaded) for e in events):
+            self._rendered_generation = None
+            if self.isVisible():
+                self.refresh_data()
+            return
+
+        self.tools = self.data_manager.load_tools()
+        current_box = self.toolbox_selector.currentIndex() + 1
+        current_machine = self.machine_selector.currentText()
+
+        left_dirty = right_dirty = False
+        for e in events:
+            if isinstance(e, AssignmentChanged):
+                left_dirty = left_dirty or e.box == current_box
+                right_dirty = right_dirty or current_machine in (e.old_machine, e.new_machine)
+            else:
+                left_dirty = right_dirty = True
+
+        if left_dirty:
+            self.update_left_view()
+            if self.search_input.text():
+                self.filter_left_list()
+        if right_dirty:
+            self.update_right_view()
+        self._rendered_generation = self.data_manager.generation(DATASET_TOOLS)
 
     def update_left_view(self):
         self.left_list.clear()
@@ -375,10 +316,8 @@ class ToolboxPage(QWidget):
         
         target_machine = self.machine_selector.currentText()
         current_box_idx = self.toolbox_selector.currentIndex() + 1
-        status_key = f'Status_Box_{current_box_idx}'
-        machine_key = f'Maschine_Box_{current_box_idx}'
-        original_status_key = f'OriginalStatus_Box_{current_box_idx}'
         
+        tools = []
         for item in items:
             tool_data = item.data(Qt.UserRole)
             if not tool_data: continue
@@ -388,64 +327,37 @@ class ToolboxPage(QWidget):
                         if t.name == tool_data['name'] 
                         and t.lagerplatz == tool_data['pos']), None)
             if tool:
-                # Save the ORIGINAL status before changing to 'maschine'
-                current_status = tool.extra_data.get(status_key, tool.status)
-                tool.extra_data[original_status_key] = current_status
-                
-                # Set status for THIS toolbox ONLY
-                tool.extra_data[status_key] = 'maschine'
-                tool.extra_data[machine_key] = target_machine
-                
-                # DO NOT change tool.status (main Status column)!
-                # Only update legacy fields for compatibility
-                tool.extra_data['Maschine'] = target_machine
-                tool.extra_data['Herkunft_Kasten'] = f"Werkzeugkasten {current_box_idx}"
-        
-        self.data_manager.save_tools(self.tools)
-        self.refresh_data()
+                tools.append(tool)
+        
+        if tools:
+            try:
+                self.data_manager.load_to_machine(tools, current_box_idx, target_machine)
+            except (ValueError, OSError) as e:
+                notify(self, str(e), "error")
         
     def move_to_toolbox(self):
         items = self.right_list.selectedItems()
         if not items: return
         
+        assignments = []
         for item in items:
             data = item.data(Qt.UserRole)
             if not data: continue
             
-            box_idx = data['box']
-            
             # Find tool by Name + Lagerplatz (ID is only for external programs)
             tool = next((t for t in self.tools 
                         if t.name == data['name'] 
                         and t.lagerplatz == data['pos']), None)
             if tool:
-                # Restore the ORIGINAL status (before it was loaded into machine)
-                original_status_key = f'OriginalStatus_Box_{box_idx}'
-                original_status = tool.extra_data.get(original_status_key, tool.status)
-                
-                # Reset status for that specific box to its ORIGINAL value
-                tool.extra_data[f'Status_Box_{box_idx}'] = original_status
-                
-                # Clear the saved original status
-                if original_status_key in tool.extra_data:
-                    del tool.extra_data[original_status_key]
-                
-                # Clear machine assignment for that box
-                if f'Maschine_Box_{box_idx}' in tool.extra_data:
-                    del tool.extra_data[f'Maschine_Box_{box_idx}']
-                
-                # DO NOT change tool.status (main Status column)!
-                # Only clear legacy machine field if no box has it in a machine
-                is_in_any_machine = False
-                for i in range(1, 5):
-                    if tool.extra_data.get(f'Status_Box_{i}') == 'maschine':
-                        is_in_any_machine = True
-                        break
-                
-                if not is_in_any_machine:
-                    # Clear legacy machine field only
-                    if 'Maschine' in tool.extra_data:
-                        del tool.extra_data['Maschine']
-        
-        self.data_manager.save_tools(self.tools)
-        self.refresh_data()
+                assignments.append((tool, data['box']))
+        
+        if assignments:
+            try:
+                self.data_manager.unload_from_machine(assignments)
+            except (ValueError, OSError) as e:
+                notify(self, str(e), "error")
+
+    def open_tool_sets(self):
+        dialog = ToolSetDialog(self.data_manager, self.machine_selector.currentText(),
+                               self.toolbox_selector.currentIndex() + 1, self)
+        dialog.exec()
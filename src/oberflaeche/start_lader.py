@@ -0,0 +1,65 @@
+"""
+Start-Lader: parst alle Datendateien parallel im Hintergrund und meldet den
+Fortschritt an die Oberfläche, damit das Dashboard sofort sichtbar ist.
+"""
+
+import threading
+from PySide6.QtCore import QObject, QCoreApplication, Signal
+from ..daten_manager import DataManager, STARTUP_FILES
+
+# Datei-Schlüssel, die eine Seite braucht, bevor ihre Kachel aktiv wird
+PAGE_REQUIREMENTS = {
+    "Werkzeugkasten": {'werkzeuge', 'wkzkaesten'},
+    "Rüstwerkzeug": {'ruestwerkzeuge', 'drawer_config'},
+    "Admin": {'werkzeuge', 'wkzkaesten', 'users'},
+    "Suche": {'werkzeuge', 'wkzkaesten'},
+}
+
+
+class StartupLoader(QObject):
+    """
+    Führt DataManager.preload() auf einem eigenen Worker-Thread aus.
+    Die Signale werden aus dem Worker emittiert und von Qt automatisch in den
+    GUI-Thread eingereiht. Der Thread wird bei aboutToQuit eingeholt, damit
+    beim Beenden kein Python-Callable mehr in Qt hängt.
+    """
+    file_loaded = Signal(str)         # Datei-Schlüssel aus STARTUP_FILES
+    progress = Signal(int, int)       # (fertig, gesamt)
+    page_ready = Signal(str)          # Seitenname aus PAGE_REQUIREMENTS
+    finished = Signal()
+
+    def __init__(self, data_manager: DataManager, parent=None):
+        super().__init__(parent)
+        self.data_manager = data_manager
+        self.loaded = set()
+        self._thread = None
+
+    @property
+    def total(self) -> int:
+        return len(STARTUP_FILES)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="StartupLoader")
+        self._thread.start()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.wait)
+
+    def wait(self):
+        """Blockiert, bis der Worker fertig ist."""
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        """Runs on a worker thread."""
+        self.data_manager.preload(self._on_file_loaded)
+        self.finished.emit()
+
+    def _on_file_loaded(self, key: str):
+        # preload() reports from a single thread, so no locking needed here
+        self.loaded.add(key)
+        self.file_loaded.emit(key)
+        self.progress.emit(len(self.loaded), self.total)
+        for page_name, required in PAGE_REQUIREMENTS.items():
+            if key in required and required <= self.loaded:
+                self.page_ready.emit(page_name)
@@ -12,8 +12,32 @@ class ModernStyles:
     # Fonts
     FONT_FAMILY = "Segoe UI, Roboto, Helvetica, Arial, sans-serif"
     
+    # Built once; widgets select named styles via the "class" property and
+    # switch variants via dynamic properties (see set_state)
+    _stylesheet = None
+    
+    @staticmethod
+    def set_state(widget, value, prop="state"):
+        """
+        Switches a property-driven style variant (e.g. state="occupied")
+        without assigning a new stylesheet: only the widget is re-polished.
+        """
+        if widget.property(prop) == value:
+            return
+        widget.setProperty(prop, value)
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+        widget.update()
+    
     @staticmethod
     def get_stylesheet():
+        if ModernStyles._stylesheet is None:
+            ModernStyles._stylesheet = ModernStyles._build_stylesheet()
+        return ModernStyles._stylesheet
+    
+    @staticmethod
+    def _build_stylesheet():
         return f"""
         /* Global Reset */
         * {{
@@ -65,6 +89,10 @@ class ModernStyles:
             background-color: rgba(255, 255, 255, 0.1);
         }}
         
+        QPushButton.icon-btn:disabled {{
+            color: {ModernStyles.COLOR_ACCENT};
+        }}
+        
         /* Tiles (Dashboard) */
         QFrame.tile {{
             background-color: {ModernStyles.COLOR_BACKGROUND_DARK};
@@ -77,19 +105,53 @@ class ModernStyles:
             border: 1px solid {ModernStyles.COLOR_HIGHLIGHT};
         }}
         
+        QFrame.tile:disabled {{
+            border: 1px dashed {ModernStyles.COLOR_ACCENT};
+        }}
+        
+        QFrame.tile:disabled QLabel {{
+            color: {ModernStyles.COLOR_ACCENT};
+        }}
+        
         QLabel.tile-icon {{
             font-size: 64px; /* Placeholder for icon size if using text, otherwise handled by icon size */
             color: {ModernStyles.COLOR_TEXT};
         }}
         
+        QLabel.tile-icon[state="missing"] {{
+            font-size: 80px;
+            color: #E50914;
+        }}
+        
+        QLabel.tile-badge {{
+            background-color: {ModernStyles.COLOR_DANGER};
+            color: white;
+            font-size: 16px;
+            font-weight: bold;
+            border-radius: 18px;
+            padding: 0px 8px;
+        }}
+        
         QLabel.tile-label {{
             font-size: 18px;
             font-weight: bold;
             color: {ModernStyles.COLOR_TEXT};
         }}
         
+        QLabel.tile-info {{
+            font-size: 13px;
+            color: {ModernStyles.COLOR_TEXT};
+        }}
+        
+        QLabel.dashboard-title {{
+            font-size: 48px;
+            font-weight: 300;
+            color: {ModernStyles.COLOR_TEXT};
+            letter-spacing: 2px;
+        }}
+        
         /* Sidebar Navigation (Tree/List) & Tables */
-        QTreeWidget, QListWidget, QTableWidget {{
+        QTreeWidget, QListWidget, QTableView {{
             background-color: #2C3E50;
             border: 1px solid #5D6D7E;
             outline: none;
@@ -98,16 +160,16 @@ class ModernStyles:
             selection-background-color: #1ABC9C;
         }}
         
-        QTreeWidget::item, QListWidget::item, QTableWidget::item {{
+        QTreeWidget::item, QListWidget::item, QTableView::item {{
             padding: 8px;
             border: none;
         }}
         
-        QTreeWidget::item:hover, QListWidget::item:hover, QTableWidget::item:hover {{
+        QTreeWidget::item:hover, QListWidget::item:hover, QTableView::item:hover {{
             background-color: rgba(255, 255, 255, 0.1);
         }}
         
-        QTreeWidget::item:selected, QListWidget::item:selected, QTableWidget::item:selected {{
+        QTreeWidget::item:selected, QListWidget::item:selected, QTableView::item:selected {{
             background-color: rgba(26, 188, 156, 0.4);
             color: #FFFFFF;
         }}
@@ -166,6 +228,299 @@ class ModernStyles:
             padding: 10px 10px 5px 10px;
         }}
         
+        QLabel.nav-label {{
+            font-size: 16px;
+            font-weight: bold;
+            color: {ModernStyles.COLOR_TEXT};
+            padding: 10px 10px 5px 10px;
+        }}
+        
+        QLabel.clock-label {{
+            font-weight: bold;
+            color: {ModernStyles.COLOR_TEXT};
+        }}
+        
+        QLabel.login-title {{
+            font-size: 18px;
+            font-weight: bold;
+            margin-bottom: 10px;
+        }}
+        
+        /* Pages */
+        QLabel.page-header {{
+            font-size: 24px;
+            font-weight: bold;
+            color: {ModernStyles.COLOR_HIGHLIGHT};
+            margin-bottom: 10px;
+        }}
+        
+        QLineEdit.touch-input, QComboBox.touch-input {{
+            font-size: 18px;
+            padding: 10px;
+        }}
+        
+        QListWidget.touch-list::item, QTableWidget.touch-list::item {{
+            font-size: 18px;
+            min-height: 60px;
+        }}
+        
+        QTableWidget.search-table::item {{
+            font-size: 16px;
+            min-height: 50px;
+        }}
+        
+        QTableView.admin-table::item {{
+            font-size: 14px;
+        }}
+        
+        QLabel.transparent {{
+            background: transparent;
+        }}
+        
+        QLabel.empty-state {{
+            color: #444;
+            font-size: 18px;
+            font-weight: bold;
+            margin-top: 50px;
+            background: transparent;
+        }}
+        
+        QLabel.hint {{
+            color: #7F8C8D;
+            font-style: italic;
+            font-size: 14px;
+        }}
+        
+        /* Touch selectors (Werkzeugkasten / Maschine) */
+        QComboBox.touch-combo {{
+            background-color: {ModernStyles.COLOR_BACKGROUND};
+            color: {ModernStyles.COLOR_TEXT};
+            font-size: 20px;
+            padding: 15px;
+            font-weight: bold;
+            border: 2px solid white;
+            border-radius: 8px;
+        }}
+        
+        QComboBox.touch-combo::drop-down {{
+            border: none;
+        }}
+        
+        QComboBox.touch-combo::down-arrow {{
+            image: none;
+            border-left: 2px solid white;
+            border-bottom: 2px solid white;
+            width: 10px;
+            height: 10px;
+            margin-right: 15px;
+        }}
+        
+        QComboBox.touch-combo QAbstractItemView {{
+            background-color: {ModernStyles.COLOR_BACKGROUND};
+            color: {ModernStyles.COLOR_TEXT};
+            font-size: 18px;
+            outline: none;
+            selection-background-color: {ModernStyles.COLOR_HIGHLIGHT};
+        }}
+        
+        QComboBox.touch-combo QAbstractItemView::item {{
+            min-height: 80px;
+            padding: 15px;
+            font-size: 18px;
+        }}
+        
+        QComboBox.touch-combo QAbstractItemView::item:selected {{
+            background-color: {ModernStyles.COLOR_HIGHLIGHT};
+            color: white;
+        }}
+        
+        /* Action buttons */
+        QPushButton.danger-btn {{
+            background-color: #c0392b;
+            color: white;
+        }}
+        
+        QPushButton.warning-btn {{
+            background-color: #d9534f;
+            color: white;
+        }}
+        
+        QPushButton.take-btn, QPushButton.return-btn {{
+            color: white;
+            font-weight: bold;
+            padding: 10px;
+        }}
+        
+        QPushButton.take-btn {{
+            background-color: #E50914;
+        }}
+        
+        QPushButton.return-btn {{
+            background-color: #28a745;
+        }}
+        
+        QPushButton.save-btn {{
+            font-size: 16px;
+            font-weight: bold;
+            background-color: #27AE60;
+            color: white;
+        }}
+        
+        QPushButton.dialog-btn {{
+            font-size: 16px;
+        }}
+        
+        /* Rüstwerkzeug info box */
+        QFrame.info-box {{
+            background-color: #2b2b2b;
+            border-radius: 10px;
+            padding: 10px;
+        }}
+        
+        QLabel.info-title {{
+            font-size: 18px;
+            font-weight: bold;
+        }}
+        
+        /* Tool details dialog */
+        QLabel.ruest-location {{
+            color: #E50914;
+            font-weight: bold;
+        }}
+        
+        /* Main status, state = Tool.status */
+        QLabel.status-label {{
+            color: #FFFFFF;
+        }}
+        
+        QLabel.status-label[state="frei"] {{
+            color: #00BAC4;
+            font-weight: bold;
+        }}
+        
+        QLabel.status-label[state="gerüstet"], QLabel.status-label[state="GERÜSTET"] {{
+            color: #00CBF6;
+            font-weight: bold;
+        }}
+        
+        QLabel.status-label[state="maschine"], QLabel.status-label[state="MASCHIENE"] {{
+            color: #00C7FC;
+            font-weight: bold;
+        }}
+        
+        QLabel.status-label[state="Rüstwerkzeuge"], QLabel.status-label[state="RÜSTWERKZEUG"] {{
+            color: #58ACFF;
+            font-weight: bold;
+        }}
+        
+        /* Form dialogs */
+        QLineEdit.form-input, QSpinBox.form-input {{
+            font-size: 16px;
+            padding: 8px;
+            min-height: 50px;
+        }}
+        
+        QLabel.availability {{
+            color: #FFFFFF;
+            font-weight: bold;
+            font-size: 14px;
+            background-color: {ModernStyles.COLOR_DANGER};
+            padding: 10px;
+            border-radius: 5px;
+        }}
+        
+        QLabel.availability[state="free"] {{
+            background-color: #27AE60;
+        }}
+        
+        /* Sidebar session area */
+        QFrame.user-container, QFrame.user-container QFrame {{
+            background-color: {ModernStyles.COLOR_BACKGROUND_DARK};
+            border-top: 1px solid {ModernStyles.COLOR_ACCENT};
+            padding: 10px;
+        }}
+        
+        QLabel.user-label {{
+            font-size: 14px;
+            font-weight: bold;
+            color: {ModernStyles.COLOR_TEXT};
+        }}
+        
+        QPushButton.session-btn {{
+            background-color: {ModernStyles.COLOR_HIGHLIGHT};
+            color: white;
+            padding: 8px;
+            border-radius: 4px;
+            font-weight: bold;
+        }}
+        
+        QPushButton.session-btn:hover {{
+            background-color: #16A085;
+        }}
+        
+        QPushButton.session-btn[state="switch"] {{
+            background-color: #3498DB;
+        }}
+        
+        QPushButton.session-btn[state="switch"]:hover {{
+            background-color: #2980B9;
+        }}
+        
+        QPushButton.session-btn[state="logout"] {{
+            background-color: {ModernStyles.COLOR_DANGER};
+        }}
+        
+        QPushButton.session-btn[state="logout"]:hover {{
+            background-color: #C0392B;
+        }}
+        
+        /* Toasts (komponenten/benachrichtigung.py) */
+        QFrame.toast {{
+            background-color: {ModernStyles.COLOR_BACKGROUND_DARK};
+            border: 1px solid {ModernStyles.COLOR_ACCENT};
+            border-left: 6px solid {ModernStyles.COLOR_ACCENT};
+            border-radius: 6px;
+        }}
+        
+        QFrame.toast[state="success"] {{
+            border-left-color: {ModernStyles.COLOR_SUCCESS};
+        }}
+        
+        QFrame.toast[state="error"] {{
+            border-left-color: {ModernStyles.COLOR_DANGER};
+        }}
+        
+        QLabel.toast-text {{
+            font-size: 16px;
+            color: #FFFFFF;
+        }}
+        
+        QPushButton.toast-action {{
+            background-color: transparent;
+            border: 1px solid {ModernStyles.COLOR_HIGHLIGHT};
+            color: {ModernStyles.COLOR_HIGHLIGHT};
+            font-weight: bold;
+            padding: 8px 12px;
+        }}
+        
+        QPushButton.toast-action:hover {{
+            background-color: rgba(26, 188, 156, 0.2);
+        }}
+        
+        /* Progress (Dashboard startup loading) */
+        QProgressBar {{
+            background-color: {ModernStyles.COLOR_BACKGROUND_DARK};
+            border: 1px solid {ModernStyles.COLOR_ACCENT};
+            border-radius: 4px;
+            text-align: center;
+            min-height: 20px;
+        }}
+        
+        QProgressBar::chunk {{
+            background-color: {ModernStyles.COLOR_HIGHLIGHT};
+            border-radius: 3px;
+        }}
+        
         /* Scrollbars */
         QScrollBar:vertical {{
             border: none;
@@ -1,49 +1,41 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QGridLayout, QLineEdit, 
                                QComboBox, QDialogButtonBox, QLabel, QScrollArea, QWidget)
 from ..modelle import Tool
+from .dialoge.wiederverwendung import ReusableDialog
+
+class ToolDialog(ReusableDialog, QDialog):
+    CORE_FIELDS = ['WZ.Nr.', 'ID', 'Name', 'Status', 'Pos.', 'Lagerplatz']
 
-class ToolDialog(QDialog):
     def __init__(self, parent=None, tool: Tool = None, data_manager=None):
         super().__init__(parent)
         self.tool = tool
         self.data_manager = data_manager
         self.extra_inputs = {}
-        self.setWindowTitle("Werkzeug bearbeiten" if tool else "Neues Werkzeug")
+        self._extra_widgets = []  # labels + inputs of the extra columns
+        self._schema = None  # fieldnames the extra inputs were built for
         self.setMinimumWidth(900)  # Wider for 3 columns
         self.setMinimumHeight(600)
         
         main_layout = QVBoxLayout()
         
         # Scroll area for all fields
-        scroll = QScrollArea()
+        self.scroll = scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll_widget = QWidget()
         scroll_layout = QVBoxLayout(scroll_widget)
         
         # Grid layout for fields (3 columns)
-        grid_layout = QGridLayout()
+        self.grid_layout = grid_layout = QGridLayout()
         grid_layout.setColumnStretch(1, 1)  # Column 1 (first value column)
         grid_layout.setColumnStretch(3, 1)  # Column 3 (second value column)
         grid_layout.setColumnStretch(5, 1)  # Column 5 (third value column)
         
         # Core fields
         self.id_input = QLineEdit()
-        if tool:
-            self.id_input.setText(tool.id)
-            self.id_input.setReadOnly(True)
-        
         self.name_input = QLineEdit()
-        if tool:
-            self.name_input.setText(tool.name)
-            
         self.status_input = QComboBox()
         self.status_input.addItems(["gerüstet", "maschine", "Rüstwerkzeuge"])
-        if tool:
-            self.status_input.setCurrentText(tool.status)
-            
         self.lagerplatz_input = QLineEdit()
-        if tool:
-            self.lagerplatz_input.setText(tool.lagerplatz)
         
         # Add core fields to grid (first row)
         row = 0
@@ -58,29 +50,6 @@ class ToolDialog(QDialog):
         grid_layout.addWidget(QLabel("<b>Lagerplatz:</b>"), row, 0)
         grid_layout.addWidget(self.lagerplatz_input, row, 1)
         
-        # Dynamic Fields in 3 columns
-        if self.data_manager:
-            core_fields = ['WZ.Nr.', 'ID', 'Name', 'Status', 'Pos.', 'Lagerplatz']
-            
-            extra_fields = [f for f in self.data_manager.fieldnames if f not in core_fields]
-            
-            col = 0  # Track which column we're in (0, 2, 4)
-            for field in extra_fields:
-                line_edit = QLineEdit()
-                if tool and field in tool.extra_data:
-                    line_edit.setText(tool.extra_data[field])
-                
-                # Move to next row after 3 columns
-                if col >= 6:
-                    row += 1
-                    col = 0
-                
-                grid_layout.addWidget(QLabel(f"<b>{field}:</b>"), row, col)
-                grid_layout.addWidget(line_edit, row, col + 1)
-                self.extra_inputs[field] = line_edit
-                
-                col += 2  # Move to next column (0->2, 2->4, 4->6)
-        
         scroll_layout.addLayout(grid_layout)
         scroll_layout.addStretch()
         scroll.setWidget(scroll_widget)
@@ -89,11 +58,10 @@ class ToolDialog(QDialog):
         # Dynamic hint based on status
         self.hint_label = QLabel("")
         self.hint_label.setWordWrap(True)
-        self.hint_label.setStyleSheet("color: #888; font-style: italic; font-size: 12px;")
+        self.hint_label.setProperty("class", "hint")
         main_layout.addWidget(self.hint_label)
         
         self.status_input.currentTextChanged.connect(self.update_hint)
-        self.update_hint(self.status_input.currentText())
         
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         buttons.accepted.connect(self.accept)
@@ -101,6 +69,60 @@ class ToolDialog(QDialog):
         main_layout.addWidget(buttons)
         
         self.setLayout(main_layout)
+        self.bind(tool)
+        
+    def bind(self, tool: Tool = None, data_manager=None):
+        """Zeigt `tool` (None = neues Werkzeug) in den vorhandenen Feldern an."""
+        self.tool = tool
+        if data_manager is not None:
+            self.data_manager = data_manager
+        self.setWindowTitle("Werkzeug bearbeiten" if tool else "Neues Werkzeug")
+        self.build_extra_inputs()
+        
+        self.id_input.setText(tool.id if tool else "")
+        self.id_input.setReadOnly(bool(tool))
+        self.name_input.setText(tool.name if tool else "")
+        self.status_input.setCurrentIndex(0)
+        if tool:
+            self.status_input.setCurrentText(tool.status)
+        self.lagerplatz_input.setText(tool.lagerplatz if tool else "")
+        for field, line_edit in self.extra_inputs.items():
+            line_edit.setText(tool.extra_data.get(field, "") if tool else "")
+        
+        self.update_hint(self.status_input.currentText())
+        self.scroll.verticalScrollBar().setValue(0)
+        
+    def build_extra_inputs(self):
+        """Dynamic fields in 3 columns; only rebuilt when the CSV columns change."""
+        fieldnames = tuple(self.data_manager.fieldnames) if self.data_manager else ()
+        if fieldnames == self._schema:
+            return
+        self._schema = fieldnames
+        for widget in self._extra_widgets:
+            self.grid_layout.removeWidget(widget)
+            widget.hide()  # deleteLater only runs once back in the event loop
+            widget.deleteLater()
+        self._extra_widgets = []
+        self.extra_inputs = {}
+        
+        extra_fields = [f for f in dict.fromkeys(fieldnames) if f not in self.CORE_FIELDS]
+        
+        row = 1
+        col = 2  # Row 1 starts after Lagerplatz (0->2, 2->4, 4->6)
+        for field in extra_fields:
+            # Move to next row after 3 columns
+            if col >= 6:
+                row += 1
+                col = 0
+            
+            label = QLabel(f"<b>{field}:</b>")
+            line_edit = QLineEdit()
+            self.grid_layout.addWidget(label, row, col)
+            self.grid_layout.addWidget(line_edit, row, col + 1)
+            self.extra_inputs[field] = line_edit
+            self._extra_widgets += [label, line_edit]
+            
+            col += 2
         
     def update_hint(self, status):
         if status == "gerüstet":
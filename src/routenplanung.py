@@ -0,0 +1,82 @@
+"""
+Routenplanung für Picklisten im Rüstwerkzeug-Lager.
+
+Die Entnahmen werden nach Kasten und Lade gruppiert, damit jede Lade nur
+einmal geöffnet und jeder Kasten nur einmal angelaufen wird. Innerhalb
+eines Kastens läuft die Route schlangenförmig (Kasten 1 von oben nach
+unten, Kasten 2 von unten nach oben), innerhalb einer Lade nach Fach.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from .modelle import Ruestwerkzeug
+
+
+@dataclass
+class PickStep:
+    tool: Ruestwerkzeug
+    menge: int
+    rows: int = 0           # Fach-Raster der Lade (aus der Ladenkonfiguration)
+    cols: int = 0
+    opens_drawer: bool = True  # Erster Schritt in dieser Lade
+
+    @property
+    def drawer(self) -> Tuple[int, int]:
+        return self.tool.kasten, self.tool.lade
+
+
+def plan_route(picks: List[Tuple[Ruestwerkzeug, int]],
+               start_kasten: int = 1,
+               drawer_grid: Optional[Callable[[int, int], Tuple[int, int]]] = None) -> List[PickStep]:
+    """
+    Ordnet die Entnahmen (tool, menge) zu einer Route.
+
+    Args:
+        picks: Entnahmen in beliebiger Reihenfolge
+        start_kasten: Kasten, an dem der Bediener steht
+        drawer_grid: z.B. DataManager.get_drawer_grid, liefert (rows, cols)
+            je Lade; wird pro Lade einmal abgefragt
+
+    Returns:
+        Liste von PickStep; Werkzeuge ohne Lagerplatz (K0) kommen ans Ende.
+    """
+    # Kasten -> Lade -> [(tool, menge)]
+    by_drawer: Dict[int, Dict[int, List[Tuple[Ruestwerkzeug, int]]]] = {}
+    unassigned = []
+    for tool, menge in picks:
+        if tool.kasten <= 0 or tool.lade <= 0:
+            unassigned.append((tool, menge))
+            continue
+        by_drawer.setdefault(tool.kasten, {}).setdefault(tool.lade, []).append((tool, menge))
+
+    # Nächster Kasten zuerst, dann nach Entfernung vom Start
+    kasten_order = sorted(by_drawer, key=lambda k: (abs(k - start_kasten), k))
+
+    steps = []
+    for n, kasten in enumerate(kasten_order):
+        # Schlangenlinie: jeder zweite Kasten wird von unten nach oben abgearbeitet,
+        # damit der Weg am Ende des einen Kastens am Anfang des nächsten weitergeht
+        laden = sorted(by_drawer[kasten], reverse=bool(n % 2))
+        for lade in laden:
+            rows, cols = drawer_grid(kasten, lade) if drawer_grid else (0, 0)
+            items = sorted(by_drawer[kasten][lade], key=lambda p: (p[0].fach, p[0].id))
+            for i, (tool, menge) in enumerate(items):
+                steps.append(PickStep(tool, menge, rows, cols, opens_drawer=(i == 0)))
+
+    for tool, menge in unassigned:
+        steps.append(PickStep(tool, menge, opens_drawer=False))
+    return steps
+
+
+def route_summary(steps: List[PickStep]) -> Dict[str, int]:
+    """Kennzahlen einer Route: Laden-Öffnungen und Kastenwechsel."""
+    openings = sum(1 for s in steps if s.opens_drawer)
+    switches = 0
+    last_kasten = None
+    for s in steps:
+        if s.tool.kasten <= 0:
+            continue
+        if last_kasten is not None and s.tool.kasten != last_kasten:
+            switches += 1
+        last_kasten = s.tool.kasten
+    return {'steps': len(steps), 'openings': openings, 'cabinet_switches': switches}
@@ -0,0 +1,96 @@
+"""
+Rückgängig/Wiederholen für Änderungen an Werkzeugen und Rüstwerkzeugen.
+
+Jede erfolgreich gespeicherte Transaktion hinterlässt einen UndoEntry: je
+geänderter Zeile nur die geänderten Felder mit altem und neuem Wert, für
+angelegte/gelöschte Zeilen eine Kopie der Zeile. Zeilen werden über ihren
+Schlüssel (ID, n-tes Vorkommen) gefunden, nicht über Objekte, damit das
+auch nach einem Neuladen (z.B. Änderung an einem anderen Terminal) noch
+funktioniert. Rückgängig spielt die Umkehrung des Eintrags als neue
+Transaktion ab (DataManager.undo/redo), Aufwand = Größe der Änderung.
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+RowKey = Tuple[str, int]  # (ID, n-tes Vorkommen)
+
+
+class UndoConflict(ValueError):
+    """Die betroffenen Daten wurden inzwischen anders geändert."""
+
+
+@dataclass
+class RowChange:
+    """
+    Änderung einer Zeile von `key_before` nach `key_after`. Angelegte
+    Zeilen haben kein key_before, gelöschte kein key_after; `row` ist dann
+    die Zeile selbst und `index_*` ihre Position in der Liste.
+    """
+    dataset: str
+    name: str
+    key_before: Optional[RowKey]
+    key_after: Optional[RowKey]
+    fields: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)  # Feld -> (alt, neu)
+    row: Any = None
+    index_before: Optional[int] = None
+    index_after: Optional[int] = None
+
+    def inverse(self) -> 'RowChange':
+        return replace(self, key_before=self.key_after, key_after=self.key_before,
+                       fields={f: (new, old) for f, (old, new) in self.fields.items()},
+                       index_before=self.index_after, index_after=self.index_before)
+
+
+@dataclass
+class UndoEntry:
+    label: str
+    changes: List[RowChange]
+
+    def inverse(self) -> List[RowChange]:
+        return [change.inverse() for change in reversed(self.changes)]
+
+
+class UndoStack:
+    """Zwei Stapel (rückgängig / wiederholen) mit begrenzter Tiefe."""
+
+    def __init__(self, limit: int = 100):
+        self.limit = limit
+        self._undo: List[UndoEntry] = []
+        self._redo: List[UndoEntry] = []
+
+    def push(self, entry: UndoEntry):
+        """Neue Änderung: verwirft, was wiederholt werden könnte."""
+        self._undo.append(entry)
+        del self._undo[:-self.limit]
+        self._redo.clear()
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def next_undo(self) -> Optional[UndoEntry]:
+        return self._undo[-1] if self._undo else None
+
+    def next_redo(self) -> Optional[UndoEntry]:
+        return self._redo[-1] if self._redo else None
+
+    def is_top(self, entries: List[UndoEntry]) -> bool:
+        """True, wenn `entries` (älteste zuerst) genau die obersten Einträge sind."""
+        n = len(entries)
+        return 0 < n <= len(self._undo) and all(a is b for a, b in zip(self._undo[-n:], entries))
+
+    def undone(self):
+        """Der oberste Eintrag wurde rückgängig gemacht."""
+        self._redo.append(self._undo.pop())
+
+    def redone(self):
+        self._undo.append(self._redo.pop())
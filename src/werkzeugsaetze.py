@@ -0,0 +1,160 @@
+"""
+Gespeicherte Werkzeugsätze (Auftrags-Vorlagen) je Maschine und Werkzeugkasten.
+
+Ein Satz ist die Liste der Werkzeuge (ID, Name), die für einen
+wiederkehrenden Auftrag aus Kasten `box` in `machine` gehören. Beim Laden
+wird nur die Differenz zur aktuellen Belegung angewendet (ToolSetDiff):
+fehlende Werkzeuge laden, überzählige entladen, der Rest bleibt. Die Sätze
+aller Terminals stehen in `werkzeugsaetze.json` im Datenordner.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .atomares_schreiben import atomic_write
+from .dateisperre import FileLock
+from .modelle import Tool
+
+logger = logging.getLogger(__name__)
+
+TOOL_SETS_FILE = "werkzeugsaetze.json"
+
+ToolKey = Tuple[str, str]  # (ID, Name) - IDs sind in werkzeuge.csv nicht eindeutig
+
+
+@dataclass
+class ToolSet:
+    name: str
+    machine: str
+    box: int
+    tools: List[ToolKey] = field(default_factory=list)
+
+    @property
+    def key(self) -> Tuple[str, int, str]:
+        return self.machine, self.box, self.name
+
+
+@dataclass
+class ToolSetDiff:
+    """Was das Laden eines Satzes an der aktuellen Belegung ändert."""
+    tool_set: ToolSet
+    load: List[Tool] = field(default_factory=list)
+    unload: List[Tool] = field(default_factory=list)
+    keep: List[Tool] = field(default_factory=list)
+    missing: List[Tuple[str, str, str]] = field(default_factory=list)  # (ID, Name, Grund)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.load or self.unload)
+
+
+def loaded_tools(tools: List[Tool], machine: str, box: int) -> List[Tool]:
+    """Werkzeuge, die aus Kasten `box` in `machine` geladen sind."""
+    machine_key = f'Maschine_Box_{box}'
+    return [t for t in tools if t.extra_data.get(machine_key) == machine]
+
+
+def diff_tool_set(tool_set: ToolSet, tools: List[Tool]) -> ToolSetDiff:
+    """
+    Vergleicht den Satz mit der Belegung von `tool_set.machine` aus Kasten
+    `tool_set.box`. Geladen werden nur Werkzeuge, die auch im
+    Werkzeugkasten-Bildschirm verfügbar wären (gerüstet, nicht schon in
+    einer anderen Maschine); alle anderen landen mit Grund in `missing`.
+    """
+    diff = ToolSetDiff(tool_set)
+    current = {(t.id, t.name): t for t in loaded_tools(tools, tool_set.machine, tool_set.box)}
+    by_key: Dict[ToolKey, Tool] = {}
+    for t in tools:
+        by_key.setdefault((t.id, t.name), t)
+
+    status_key = f'Status_Box_{tool_set.box}'
+    machine_key = f'Maschine_Box_{tool_set.box}'
+    wanted = list(dict.fromkeys(tuple(k) for k in tool_set.tools))
+    for key in wanted:
+        if key in current:
+            diff.keep.append(current[key])
+            continue
+        tool = by_key.get(key)
+        if tool is None:
+            diff.missing.append((*key, "nicht mehr vorhanden"))
+        elif tool.extra_data.get(status_key, tool.status).lower() == 'maschine':
+            diff.missing.append((*key, f"bereits in {tool.extra_data.get(machine_key) or 'einer Maschine'}"))
+        elif tool.status.lower() != 'gerüstet':
+            diff.missing.append((*key, f"nicht gerüstet ({tool.status or 'ohne Status'})"))
+        else:
+            diff.load.append(tool)
+
+    wanted_keys = set(wanted)
+    diff.unload = [t for key, t in current.items() if key not in wanted_keys]
+    return diff
+
+
+class ToolSetStore:
+    """Werkzeugsätze aller Terminals in einer JSON-Datei, neu gelesen wenn sie sich ändert."""
+
+    def __init__(self, data_dir: str):
+        self.path = os.path.join(data_dir, TOOL_SETS_FILE)
+        self._lock = FileLock(self.path)
+        self._sets: Dict[Tuple[str, int, str], ToolSet] = {}
+        self._stamp: Optional[Tuple[int, int]] = None  # (mtime_ns, size) des gelesenen Stands
+
+    def sets(self, machine: Optional[str] = None, box: Optional[int] = None) -> List[ToolSet]:
+        """Alle Sätze, optional nur für `machine` / `box`, nach Name sortiert."""
+        self._refresh()
+        return sorted((s for s in self._sets.values()
+                       if (machine is None or s.machine == machine) and (box is None or s.box == box)),
+                      key=lambda s: s.name.lower())
+
+    def get(self, machine: str, box: int, name: str) -> Optional[ToolSet]:
+        self._refresh()
+        return self._sets.get((machine, box, name))
+
+    def save(self, tool_set: ToolSet):
+        """Legt den Satz an oder ersetzt den gleichnamigen für dieselbe Maschine und Box."""
+        tool_set.name = tool_set.name.strip()
+        if not tool_set.name:
+            raise ValueError("Der Werkzeugsatz braucht einen Namen.")
+        with self._lock:
+            self._refresh()
+            self._sets[tool_set.key] = tool_set
+            self._write()
+
+    def delete(self, machine: str, box: int, name: str) -> bool:
+        with self._lock:
+            self._refresh()
+            if self._sets.pop((machine, box, name), None) is None:
+                return False
+            self._write()
+            return True
+
+    def _refresh(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._sets, self._stamp = {}, None
+            return
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            sets = {}
+            for entry in data.get('sets', []):
+                s = ToolSet(entry['name'], entry['machine'], int(entry['box']),
+                            [(str(tool_id), name) for tool_id, name in entry.get('tools', [])])
+                sets[s.key] = s
+            self._sets, self._stamp = sets, stamp
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.error(f"Error loading tool sets: {e}")
+
+    def _write(self):
+        data = {'sets': [{'name': s.name, 'machine': s.machine, 'box': s.box,
+                          'tools': [list(k) for k in s.tools]}
+                         for s in sorted(self._sets.values(), key=lambda s: s.key)]}
+        atomic_write(self.path, lambda f: json.dump(data, f, indent=4, ensure_ascii=False))
+        st = os.stat(self.path)
+        self._stamp = (st.st_mtime_ns, st.st_size)
@@ -0,0 +1,114 @@
+"""
+Auslastung aus den Belegungsdateien mehrerer Terminals.
+
+Die Verlaufszeilen werden direkt in `belegungen/<terminal>.csv` geschrieben,
+damit die Zeitpunkte (und die Reihenfolge, in der sie ankommen) feststehen.
+
+    python -m pytest tests
+"""
+
+import csv
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.auslastung import UtilisationStats  # noqa: E402
+from src.belegungen import ASSIGNMENT_DIR, ASSIGNMENT_FIELDS  # noqa: E402
+
+NOW = datetime(2024, 3, 5, 18, 0)
+
+
+@pytest.fixture
+def log(tmp_path):
+    """log(terminal, zeitpunkt, von, nach) hängt eine Zeile für Werkzeug 42 aus Kasten 1 an."""
+    directory = tmp_path / ASSIGNMENT_DIR
+    directory.mkdir()
+
+    def append(terminal, zeitpunkt, old_machine, new_machine, tool_id='42'):
+        path = directory / f"{terminal}.csv"
+        new = not path.exists()
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, delimiter=';')
+            if new:
+                writer.writerow(ASSIGNMENT_FIELDS)
+            writer.writerow([zeitpunkt, tool_id, 'Fräser', 1, old_machine, new_machine, 'test', terminal])
+    return append
+
+
+def hours(stats, days=30):
+    report = stats.report(days, now=NOW)
+    return {machine: round(u.hours, 2) for machine, u in report.machines.items()}
+
+
+def test_late_unload_from_another_terminal_is_applied_in_order(tmp_path, log):
+    stats = UtilisationStats(str(tmp_path), "A")
+    log("A", "2024-03-05T08:00:00", "", "M1")
+    log("A", "2024-03-05T10:00:05", "", "M2")
+    stats.refresh()
+    # B's unload from M1 happened before the load into M2 but is read afterwards
+    log("B", "2024-03-05T10:00:00", "M1", "")
+    stats.refresh()
+    log("A", "2024-03-05T12:00:00", "M2", "")
+
+    assert hours(stats) == {'M1': 2.0, 'M2': 2.0}
+
+
+def test_interleaved_logs_give_the_same_hours_in_any_read_order(tmp_path, log):
+    lines = [
+        ("A", "2024-03-03T22:00:00", "", "M1"),
+        ("B", "2024-03-04T02:00:00", "M1", "M2"),  # over midnight, moved on by another terminal
+        ("A", "2024-03-04T06:00:00", "M2", ""),
+        ("B", "2024-03-04T07:00:00", "", "M1", '7'),
+        ("A", "2024-03-04T09:30:00", "M1", "", '7'),
+    ]
+    stats = UtilisationStats(str(tmp_path), "A")
+    # Arrival order: B's lines lag behind A's
+    for i in (0, 2, 4, 1, 3):
+        log(*lines[i])
+        stats.refresh()
+
+    assert hours(stats) == {'M1': 6.5, 'M2': 4.0}
+    report = stats.report(1, now=NOW.replace(day=4, hour=23))
+    assert round(report.machines['M1'].hours, 2) == 4.5  # 00:00-02:00 and 07:00-09:30
+    assert report.machines['M1'].loads == 1
+    assert hours(UtilisationStats(str(tmp_path), "C")) == hours(stats)  # read in one go
+
+
+def test_late_lines_survive_a_checkpoint(tmp_path, log):
+    stats = UtilisationStats(str(tmp_path), "A")
+    log("A", "2024-03-05T08:00:00", "", "M1")
+    log("A", "2024-03-05T10:00:05", "", "M2")
+    stats.refresh()
+    stats.checkpoint()
+
+    restarted = UtilisationStats(str(tmp_path), "A")
+    log("B", "2024-03-05T10:00:00", "M1", "")
+    log("A", "2024-03-05T12:00:00", "M2", "")
+    assert hours(restarted) == {'M1': 2.0, 'M2': 2.0}
+
+
+def test_lines_older_than_the_reorder_window_rebuild_everything(tmp_path, log):
+    stats = UtilisationStats(str(tmp_path), "A")
+    log("A", "2024-03-01T08:00:00", "", "M1")
+    log("A", "2024-03-05T08:00:00", "", "M2", '7')
+    stats.refresh()
+    log("B", "2024-03-01T09:00:00", "M1", "")  # days behind
+    log("A", "2024-03-05T09:00:00", "M2", "", '7')
+
+    assert hours(stats) == {'M1': 1.0, 'M2': 1.0}
+
+
+def test_rewind_keeps_stays_that_started_before_the_reorder_window(tmp_path, log):
+    stats = UtilisationStats(str(tmp_path), "A")
+    log("A", "2024-03-03T20:00:00", "", "M1")
+    log("A", "2024-03-05T08:00:00", "", "M2", '7')
+    log("A", "2024-03-05T09:00:00", "M1", "")  # closes a stay from before the window
+    stats.refresh()
+    log("B", "2024-03-05T08:30:00", "M2", "", '7')
+
+    assert hours(stats) == {'M1': 37.0, 'M2': 0.5}
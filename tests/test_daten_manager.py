@@ -0,0 +1,211 @@
+"""
+Datenintegrität des DataManagers über mehrere Terminals.
+
+Jeder Test arbeitet auf einer Kopie von data/; zwei DataManager mit
+verschiedenen Terminal-Namen spielen zwei Terminals am selben Datenordner.
+
+    python -m pytest tests
+"""
+
+import csv
+import dataclasses
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.daten_manager import DataManager, SaveConflict  # noqa: E402
+from src.modelle import Tool  # noqa: E402
+from src.rueckgaengig import UndoConflict  # noqa: E402
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    path = tmp_path / "data"
+    shutil.copytree(os.path.join(ROOT, "data"), path, ignore=shutil.ignore_patterns("*.lock", "*.version", "bestand"))
+    return str(path)
+
+
+@pytest.fixture
+def terminal(data_dir):
+    def make(name):
+        return DataManager(os.path.join(data_dir, "werkzeuge.csv"), os.path.join(data_dir, "users.csv"), name)
+    return make
+
+
+def spannmittel(dm, index):
+    return dm.load_tools()[index].extra_data.get('Spannmittel')
+
+
+def csv_bestand(data_dir, tool_id):
+    """Grundbestand, wie er in ruestwerkzeuge.csv steht."""
+    with open(os.path.join(data_dir, "ruestwerkzeuge.csv"), encoding='utf-8-sig') as f:
+        return next(int(row['Bestand']) for row in csv.DictReader(f, delimiter=';') if row['ID'] == tool_id)
+
+
+# --- Merge beim Speichern ---
+
+def test_disjoint_edits_of_two_terminals_are_merged(terminal):
+    a, b = terminal("A"), terminal("B")
+    tools_a, tools_b = a.load_tools(), b.load_tools()
+
+    a.update_tools([tools_a[0]], {'Spannmittel': 'HSK63'})
+    b.update_tools([tools_b[1]], {'Spannmittel': 'SK40'})  # B is stale and merges
+
+    assert (spannmittel(b, 0), spannmittel(b, 1)) == ('HSK63', 'SK40')
+    fresh = terminal("C")
+    assert (spannmittel(fresh, 0), spannmittel(fresh, 1)) == ('HSK63', 'SK40')
+
+
+def test_duplicate_ids_are_matched_by_occurrence(terminal):
+    a, b = terminal("A"), terminal("B")
+    tools = a.load_tools()
+    duplicate = next(t.id for t in tools if sum(u.id == t.id for u in tools) > 1)
+    first, second = [i for i, t in enumerate(tools) if t.id == duplicate][:2]
+    b.load_tools()
+
+    a.update_tools([a.load_tools()[second]], {'Spannmittel': 'zweites'})
+    b.update_tools([b.load_tools()[first]], {'Spannmittel': 'erstes'})
+
+    fresh = terminal("C")
+    assert (spannmittel(fresh, first), spannmittel(fresh, second)) == ('erstes', 'zweites')
+
+
+def test_same_field_changed_on_both_terminals_conflicts(terminal):
+    a, b = terminal("A"), terminal("B")
+    a.load_tools(), b.load_tools()
+
+    a.update_tools([a.load_tools()[0]], {'Spannmittel': 'A'})
+    with pytest.raises(SaveConflict):
+        b.update_tools([b.load_tools()[0]], {'Spannmittel': 'B'})
+
+    # B continues from A's state, nothing of B's attempt is saved or recorded
+    assert spannmittel(b, 0) == 'A'
+    assert spannmittel(terminal("C"), 0) == 'A'
+    assert b.history.next_undo() is None
+
+
+# --- Rollback ---
+
+def test_exception_in_transaction_restores_cache_and_objects(terminal):
+    dm = terminal("A")
+    tools = dm.load_tools()
+    before = list(tools)
+    tool, other = tools[0], tools[1]
+    name = tool.name
+
+    with pytest.raises(RuntimeError):
+        with dm.transaction() as tx:
+            tx.track(tool)
+            tool.name = "GEÄNDERT"
+            tool.extra_data['Spannmittel'] = 'X'
+            tx.remove(other)
+            tx.add(Tool(id='T-NEU', name='NEU', status='frei', lagerplatz='', extra_data={}))
+            raise RuntimeError
+
+    assert dm.load_tools() is tools
+    assert all(x is y for x, y in zip(tools, before)) and len(tools) == len(before)
+    assert tool.name == name and tool.extra_data.get('Spannmittel') != 'X'
+    assert dm.history.next_undo() is None
+
+
+def test_failed_commit_restores_files_counters_and_objects(terminal, monkeypatch):
+    dm = terminal("A")
+    tool = dm.load_tools()[0]
+    ruest = dm.load_ruestwerkzeuge()[0]
+    name, bestand, min_bestand = tool.name, ruest.bestand, ruest.min_bestand
+
+    def fail(*args, **kwargs):
+        raise OSError("Platte voll")
+    monkeypatch.setattr(dm, 'save_ruestwerkzeuge', fail)
+
+    # werkzeuge.csv and the stock counters are written before ruestwerkzeuge.csv fails
+    with pytest.raises(OSError):
+        with dm.transaction() as tx:
+            tx.track(tool)
+            tool.name = "GEÄNDERT"
+            tx.track(ruest)
+            ruest.bestand += 5
+            ruest.min_bestand += 1
+
+    assert (tool.name, ruest.bestand, ruest.min_bestand) == (name, bestand, min_bestand)
+    fresh = terminal("B")
+    assert fresh.load_tools()[0].name == name
+    assert (fresh.load_ruestwerkzeuge()[0].bestand, fresh.load_ruestwerkzeuge()[0].min_bestand) == (bestand, min_bestand)
+    assert dm.last_undo_entry is None
+
+
+# --- Rückgängig / Wiederholen ---
+
+def test_undo_and_redo_after_other_terminal_changed_another_row(terminal):
+    a, b = terminal("A"), terminal("B")
+    original = spannmittel(a, 0)
+    b.load_tools()
+
+    a.update_tools([a.load_tools()[0]], {'Spannmittel': 'A'})
+    b.update_tools([b.load_tools()[1]], {'Spannmittel': 'B'})
+
+    a.undo()
+    fresh = terminal("C")
+    assert (spannmittel(fresh, 0), spannmittel(fresh, 1)) == (original, 'B')
+
+    a.redo()
+    fresh = terminal("D")
+    assert (spannmittel(fresh, 0), spannmittel(fresh, 1)) == ('A', 'B')
+
+
+def test_undo_conflicts_when_other_terminal_changed_the_same_field(terminal):
+    a, b = terminal("A"), terminal("B")
+
+    a.update_tools([a.load_tools()[0]], {'Spannmittel': 'A'})
+    b.update_tools([b.load_tools()[0]], {'Spannmittel': 'B'})
+
+    entry = a.history.next_undo()
+    with pytest.raises(UndoConflict):
+        a.undo()
+    assert a.history.next_undo() is entry
+    assert spannmittel(terminal("C"), 0) == 'B'
+
+
+def test_undo_of_several_entries_is_all_or_nothing(terminal):
+    a, b = terminal("A"), terminal("B")
+    tool = a.load_ruestwerkzeuge()[0]
+    bestand = tool.bestand
+
+    entries = []
+    for _ in range(3):
+        a.change_stock(tool.id, 1)
+        entries.append(a.last_undo_entry)
+    # B takes so much that only two of the three returns could be undone
+    b.change_stock(tool.id, -(bestand + 1))
+
+    with pytest.raises(UndoConflict):
+        a.undo(entries)
+    assert tool.bestand == 2
+    assert a.history.is_top(entries)
+
+
+# --- Bestände (PN-Zähler) ---
+
+def test_takes_and_returns_add_up_across_terminals(terminal, data_dir):
+    a, b = terminal("A"), terminal("B")
+    tool_id = a.load_ruestwerkzeuge()[0].id
+    base = csv_bestand(data_dir, tool_id)
+    b.load_ruestwerkzeuge()
+
+    a.change_stock(tool_id, 3)
+    b.change_stock(tool_id, -1)  # sees A's returns through refresh_stock()
+    a.refresh_stock()
+
+    for dm in (a, b, terminal("C")):
+        assert next(t for t in dm.load_ruestwerkzeuge() if t.id == tool_id).bestand == base + 2
+
+    # Row saves keep Bestand in the CSV at the base: bestand - totals
+    tool = next(t for t in a.load_ruestwerkzeuge() if t.id == tool_id)
+    a.update_ruestwerkzeug(dataclasses.replace(tool, min_bestand=tool.min_bestand + 1))
+    assert csv_bestand(data_dir, tool_id) == base
+    assert next(t for t in terminal("D").load_ruestwerkzeuge() if t.id == tool_id).bestand == base + 2